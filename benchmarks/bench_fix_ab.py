@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fix_benchmark import FixBenchmark, SimulatedLink
+from utils.fix_state import FakeStateBackend, FixStateStore
+from utils.jitter_fixer import JitterFixer
+
+
+def run_case(fix_id, effect, rounds, samples, seed):
+    fixer = JitterFixer(backend=FakeStateBackend(), store=FixStateStore())
+    link = SimulatedLink(samples=samples, seed=seed, effects={fix_id: effect}, applied=fixer.get_applied_fixes)
+
+    start = time.perf_counter()
+    result = FixBenchmark(fixer, link, rounds=rounds, seed=seed).run([fix_id])
+    elapsed = (time.perf_counter() - start) * 1000
+    fixer.close()
+    return {
+        "effect": effect,
+        "helps": result.helps,
+        "elapsed_ms": round(elapsed, 2),
+        "metrics": result.rows()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A/B fix benchmark against a simulated link")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cases = {
+        "helps": {"jitter": 0.7},
+        "no_effect": {},
+        "hurts_loss": {"loss": 4.0}
+    }
+    print(json.dumps({
+        name: run_case("disable_nagle", effect, args.rounds, args.samples, args.seed)
+        for name, effect in cases.items()
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
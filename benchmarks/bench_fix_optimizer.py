@@ -0,0 +1,53 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fix_benchmark import SimulatedLink
+from utils.fix_optimizer import FixOptimizer
+from utils.fix_state import FakeStateBackend, FixStateStore
+from utils.jitter_fixer import JitterFixer
+
+
+EFFECTS = {
+    "disable_nagle": {"jitter": 0.7},
+    "network_throttling": {"jitter": 0.8},
+    "qos_priority": {"jitter": 1.3},
+    "disable_auto_tuning": {"loss": 3.0}
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fix subset optimizer against a simulated link")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--samples", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fixer = JitterFixer(backend=FakeStateBackend(), store=FixStateStore())
+    link = SimulatedLink(samples=args.samples, seed=args.seed, effects=EFFECTS, applied=fixer.get_applied_fixes)
+    optimizer = FixOptimizer(fixer, link, race_rounds=args.rounds)
+
+    start = time.perf_counter()
+    result = optimizer.optimize()
+    elapsed = (time.perf_counter() - start) * 1000
+    fixer.close()
+
+    exhaustive = (2 ** len(optimizer.candidates)) * args.rounds
+    print(json.dumps({
+        "candidates": optimizer.candidates,
+        "best": result.best,
+        "baseline_jitter": round(result.baseline_score, 3),
+        "best_jitter": round(result.score, 3),
+        "measurements": result.measurements,
+        "exhaustive_measurements": exhaustive,
+        "configurations_seen": len(result.evaluations),
+        "elapsed_ms": round(elapsed, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
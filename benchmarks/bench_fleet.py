@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fleet import FleetConfig, FleetScheduler
+from utils.jitter_checker import JitterChecker
+
+
+def loopback_targets(count):
+    return [f"127.0.{index // 250}.{index % 250 + 1}" for index in range(count)]
+
+
+def bench_check_many(targets, count, interval, mode):
+    checker = JitterChecker()
+    checker.set_ping_count(count)
+    checker.set_probe_mode(mode)
+    checker.interval = interval
+
+    start = time.perf_counter()
+    results = checker.check_many(targets, max_concurrency=len(targets))
+    elapsed = time.perf_counter() - start
+    probes = sum(result.sent for result in results.values())
+    return {"elapsed_s": round(elapsed, 3), "probes_per_second": round(probes / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet scheduler throughput against loopback targets")
+    parser.add_argument("--targets", type=int, default=500)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--mode", default="auto")
+    args = parser.parse_args()
+
+    targets = loopback_targets(args.targets)
+    config = FleetConfig(count=args.count, interval=args.interval, timeout=0.5, mode=args.mode)
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1))) or [1]
+
+    scaling = {}
+    for count in workers:
+        result = FleetScheduler(targets, config, count).run()
+        scaling[count] = result.summary()
+
+    print(json.dumps({
+        "targets": args.targets,
+        "intended_probes_per_second": round(args.targets / args.interval, 1),
+        "cpu_count": cores,
+        "check_many": bench_check_many(targets, args.count, args.interval, args.mode),
+        "fleet": scaling
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.jitter_checker import JitterChecker
+from utils.metrics_exporter import MetricsExporter, MetricsRegistry
+from utils.probe_engine import ProbeResult
+
+
+def pacing_row(records, interval):
+    sent = sorted(record.sent_ns for record in records)
+    gaps = [(b - a) / 1e6 for a, b in zip(sent, sent[1:])]
+    rtts = sorted(record.rtt_ms for record in records if record.rtt_ms is not None)
+    return {
+        "probes": len(records),
+        "gap_error_ms": round(statistics.mean(abs(gap - interval * 1000) for gap in gaps), 4),
+        "gap_stdev_ms": round(statistics.pstdev(gaps), 4),
+        "rtt_p50_ms": round(rtts[len(rtts) // 2], 4),
+        "rtt_p99_ms": round(rtts[int(len(rtts) * 0.99)], 4)
+    }
+
+
+def run_probes(target, interval, duration, exporter=None, scrape_hz=0.0):
+    checker = JitterChecker()
+    checker.set_target(target)
+    checker.interval = interval
+    if exporter is not None:
+        checker.metrics = exporter.registry
+
+    records = []
+    scrape_ms = []
+    stop = threading.Event()
+
+    def scrape():
+        while not stop.wait(1 / scrape_hz):
+            start = time.perf_counter()
+            with urllib.request.urlopen(exporter.url) as response:
+                response.read()
+            scrape_ms.append((time.perf_counter() - start) * 1000)
+
+    scraper = threading.Thread(target=scrape, daemon=True) if exporter and scrape_hz else None
+    if scraper:
+        scraper.start()
+    checker.monitor(on_sample=records.append, duration=duration)
+    stop.set()
+    if scraper:
+        scraper.join()
+
+    row = pacing_row(records, interval)
+    if scrape_ms:
+        row.update({"scrapes": len(scrape_ms), "scrape_p50_ms": round(statistics.median(scrape_ms), 3)})
+    return row
+
+
+def bench_render(targets, samples_per_target):
+    registry = MetricsRegistry()
+    for index in range(targets):
+        for seq in range(samples_per_target):
+            registry.observe(f"10.0.{index // 250}.{index % 250}", ProbeResult(seq, 0, (seq % 40 + 1) * 1_000_000))
+    start = time.perf_counter()
+    body = registry.render()
+    return {"targets": targets, "samples": targets * samples_per_target,
+            "render_ms": round((time.perf_counter() - start) * 1000, 3), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe timing with and without frequent metrics scrapes")
+    parser.add_argument("--target", default="127.0.0.1")
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--scrape-hz", type=float, default=20.0)
+    args = parser.parse_args()
+
+    baseline = run_probes(args.target, args.interval, args.duration)
+    with MetricsExporter(port=0) as exporter:
+        scraped = run_probes(args.target, args.interval, args.duration, exporter, args.scrape_hz)
+
+    print(json.dumps({
+        "interval_ms": args.interval * 1000,
+        "without_exporter": baseline,
+        "with_scrapes": scraped,
+        "render_cost": [bench_render(100, 1000), bench_render(100, 10000)]
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
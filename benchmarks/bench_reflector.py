@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import selectors
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.check_result import CheckResult
+from utils.probe_engine import ProbeEngine, build_udp_probe
+from utils.reflector import Reflector
+
+
+def serve(port, duration, queue):
+    reflector = Reflector("127.0.0.1", port, rate=0)
+    stats = asyncio.run(reflector.serve(duration))
+    queue.put(stats.snapshot())
+
+
+def load(port, clients, window, duration, queue):
+    selector = selectors.DefaultSelector()
+    packet = build_udp_probe(0, 0, 64)
+    sockets = []
+    for _ in range(clients):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect(("127.0.0.1", port))
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        sockets.append(sock)
+        for _ in range(window):
+            sock.send(packet)
+
+    replies = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        events = selector.select(0.05)
+        if not events:
+            for sock in sockets:
+                sock.send(packet)
+        for key, _ in events:
+            try:
+                key.fileobj.recv(2048)
+            except (BlockingIOError, ConnectionRefusedError):
+                continue
+            replies += 1
+            try:
+                key.fileobj.send(packet)
+            except OSError:
+                pass
+    for sock in sockets:
+        sock.close()
+    queue.put(replies)
+
+
+async def probe_latency(port, count, interval):
+    async with ProbeEngine("127.0.0.1", timeout=0.5, mode="udp", udp_port=port) as engine:
+        results = []
+        for seq in range(count):
+            results.append(await engine.probe(seq))
+            await asyncio.sleep(interval)
+    return CheckResult("127.0.0.1", results)
+
+
+def latency_row(result):
+    return {
+        "p50_ms": round(result.p50, 4),
+        "p99_ms": round(result.p99, 4),
+        "jitter_ms": round(result.jitter, 4),
+        "server_us": round(result.server_ms * 1000, 2),
+        "loss": round(result.loss_percent, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP reflector load test on loopback")
+    parser.add_argument("--port", type=int, default=17007)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=4, help="probes in flight per client")
+    parser.add_argument("--load-processes", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--probes", type=int, default=300)
+    args = parser.parse_args()
+
+    server_queue = multiprocessing.Queue()
+    load_queue = multiprocessing.Queue()
+    idle_seconds = args.probes * 0.005 + 1
+    server = multiprocessing.Process(target=serve, args=(args.port, idle_seconds + args.duration + 2, server_queue))
+    server.start()
+    time.sleep(0.5)
+
+    idle = asyncio.run(probe_latency(args.port, args.probes, 0.002))
+
+    per_process = max(1, args.clients // args.load_processes)
+    loaders = [multiprocessing.Process(target=load, args=(args.port, per_process, args.window, args.duration, load_queue))
+               for _ in range(args.load_processes)]
+    for loader in loaders:
+        loader.start()
+    time.sleep(0.5)
+    loaded = asyncio.run(probe_latency(args.port, args.probes, (args.duration - 1) / args.probes))
+    replies = sum(load_queue.get() for _ in loaders)
+    for loader in loaders:
+        loader.join()
+
+    server_stats = server_queue.get()
+    server.join()
+
+    print(json.dumps({
+        "clients": per_process * args.load_processes,
+        "window": args.window,
+        "packets_per_second": round(replies / args.duration),
+        "server": server_stats,
+        "idle": latency_row(idle),
+        "loaded": latency_row(loaded),
+        "added_p50_ms": round(loaded.p50 - idle.p50, 4)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fix_state import FixStateStore
+from utils.jitter_fixer import JitterFixer
+from utils.shell_session import ShellSession, ShellSessionPool
+
+
+STAND_IN_COMMANDS = "reg() { :; }; netsh() { :; }; ipconfig() { :; }; powershell() { :; }"
+
+
+class StandInFixer(JitterFixer):
+    def _is_admin(self) -> bool:
+        return True
+
+
+def bench_spawn_per_command(commands):
+    start = time.perf_counter()
+    for command in commands:
+        subprocess.run(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return (time.perf_counter() - start) * 1000, len(commands)
+
+
+def bench_session(commands):
+    start = time.perf_counter()
+    with ShellSession() as session:
+        for command in commands:
+            session.run(command)
+        spawns = session.spawn_count
+    return (time.perf_counter() - start) * 1000, spawns
+
+
+def bench_apply_all_fixes():
+    pool = ShellSessionPool()
+    pool.run(STAND_IN_COMMANDS)
+    fixer = StandInFixer(shell_pool=pool, store=FixStateStore())
+
+    start = time.perf_counter()
+    results = fixer.apply_all_fixes()
+    elapsed = (time.perf_counter() - start) * 1000
+    fixer.close()
+    return elapsed, pool.spawn_count, all(results.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spawn-per-command vs persistent shell session")
+    parser.add_argument("--commands", type=int, default=200)
+    args = parser.parse_args()
+
+    commands = [f"echo {i}" for i in range(args.commands)]
+    spawn_ms, spawn_count = bench_spawn_per_command(commands)
+    session_ms, session_spawns = bench_session(commands)
+    fixes_ms, fixes_spawns, fixes_ok = bench_apply_all_fixes()
+
+    print(json.dumps({
+        "commands": args.commands,
+        "spawn_per_command": {"total_ms": round(spawn_ms, 2), "per_command_us": round(spawn_ms / args.commands * 1000, 1), "spawns": spawn_count},
+        "session": {"total_ms": round(session_ms, 2), "per_command_us": round(session_ms / args.commands * 1000, 1), "spawns": session_spawns},
+        "apply_all_fixes": {"total_ms": round(fixes_ms, 2), "spawns": fixes_spawns, "all_succeeded": fixes_ok}
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = 100.0
+CHECKER_BUDGET_MS = 150.0
+FORBIDDEN_MODULES = ("PyQt6", "matplotlib", "gui", "asyncio", "statistics")
+LAZY_MODULES = ("statistics", "utils.convergence", "utils.pacing", "utils.metrics_exporter")
+
+IMPORT_PROBE = (
+    "import sys, {module};"
+    "print(','.join(sorted(set(sys.modules) & set(sys.argv[1:]))))"
+)
+
+
+def leaked_modules(module, names):
+    leaked = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE.format(module=module), *names],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return leaked.split(",") if leaked else []
+
+
+def time_command(cmd, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+        "max_ms": round(max(samples), 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark for the headless CLI")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=BUDGET_MS,
+                        help="median budget in milliseconds for importing the CLI and printing --help")
+    parser.add_argument("--checker-budget", type=float, default=CHECKER_BUDGET_MS,
+                        help="median budget in milliseconds for importing the jitter checker")
+    args = parser.parse_args()
+
+    results = {
+        "interpreter": time_command([sys.executable, "-c", "pass"], args.runs),
+        "import_cli": time_command([sys.executable, "-c", "import netjitterfix.cli"], args.runs),
+        "cli_help": time_command([sys.executable, "-m", "netjitterfix", "--help"], args.runs),
+        "import_checker": time_command([sys.executable, "-c", "import utils.jitter_checker"], args.runs),
+        "leaked_modules": leaked_modules("netjitterfix.cli", FORBIDDEN_MODULES)
+                          + leaked_modules("utils.jitter_checker", LAZY_MODULES),
+        "budget_ms": args.budget,
+        "checker_budget_ms": args.checker_budget
+    }
+    print(json.dumps(results, indent=2))
+
+    over_budget = (results["import_cli"]["median_ms"] > args.budget
+                   or results["cli_help"]["median_ms"] > args.budget
+                   or results["import_checker"]["median_ms"] > args.checker_budget)
+    if results["leaked_modules"] or over_budget:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "data", "ping")
+
+
+def best_of(func, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_parsing(lines_per_locale):
+    from utils.jitter_checker import parse_ping_bytes
+
+    results = {}
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.txt"))):
+        with open(path, "rb") as f:
+            recorded = f.read().splitlines(keepends=True)
+        corpus = (recorded * (lines_per_locale // len(recorded) + 1))[:lines_per_locale]
+        parsed = [parse_ping_bytes(line) for line in recorded]
+        seconds = best_of(lambda: [parse_ping_bytes(line) for line in corpus])
+        results[os.path.splitext(os.path.basename(path))[0]] = {
+            "lines": len(corpus),
+            "lines_per_second": round(len(corpus) / seconds),
+            "replies_parsed": sum(1 for value in parsed if isinstance(value, float)),
+            "timeouts_parsed": sum(1 for value in parsed if value == "timeout")
+        }
+    return results
+
+
+def bench_statistics(sizes):
+    from utils.check_result import CheckResult
+    from utils.jitter_stats import JitterStats
+    from utils.probe_engine import ProbeResult
+    from utils.trace_analysis import analyze_trace
+
+    rng = np.random.default_rng(0)
+    results = {}
+    for size in sizes:
+        rtts = rng.gamma(4.0, 5.0, size) + 10
+        rtts[rng.random(size) < 0.01] = np.nan
+        row = {}
+
+        row["analyze_trace_ms"] = round(best_of(lambda: analyze_trace(rtts, interval_s=0.01), 1) * 1000, 2)
+
+        if size <= 1_000_000:
+            values = [None if np.isnan(rtt) else float(rtt) for rtt in rtts]
+
+            def incremental():
+                stats = JitterStats()
+                for value in values:
+                    stats.add(value)
+                stats.snapshot()
+            row["jitter_stats_ms"] = round(best_of(incremental, 1) * 1000, 2)
+
+            records = [ProbeResult(seq, seq * 10_000_000, None if value is None else seq * 10_000_000 + int(value * 1e6))
+                       for seq, value in enumerate(values)]
+            row["check_result_ms"] = round(best_of(lambda: CheckResult("bench", records).snapshot(), 1) * 1000, 2)
+        results[str(size)] = row
+    return results
+
+
+def bench_rendering(lengths):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtWidgets import QApplication
+        from gui.chart import MatplotlibCanvas
+    except ImportError as e:
+        return {"skipped": str(e)}
+
+    app = QApplication.instance() or QApplication([])
+    canvas = MatplotlibCanvas(width=8, height=4, dpi=100)
+    canvas.resize(800, 400)
+    rng = np.random.default_rng(0)
+
+    results = {}
+    for length in lengths:
+        before = (list(rng.gamma(4.0, 5.0, length) + 10), list(np.arange(length, dtype=float)))
+        after = (list(rng.gamma(4.0, 3.0, length) + 10), list(np.arange(length, dtype=float)))
+
+        def redraw():
+            canvas.plot_comparison(before, after)
+            canvas.draw()
+            app.processEvents()
+
+        def live():
+            canvas.start_live("#FF00FF")
+            for index, rtt in enumerate(before[0][:1000]):
+                canvas.append_live(index, rtt)
+            canvas.refresh_live()
+            app.processEvents()
+
+        results[str(length)] = {
+            "redraw_ms": round(best_of(redraw) * 1000, 2),
+            "live_1000_appends_ms": round(best_of(live) * 1000, 2)
+        }
+    return results
+
+
+def bench_fix_execution(delay):
+    from utils.fix_state import FakeStateBackend, FixStateStore
+    from utils.jitter_fixer import JitterFixer
+
+    results = {}
+    for workers in (1, 4):
+        backend = FakeStateBackend(delay=delay)
+        fixer = JitterFixer(backend=backend, store=FixStateStore(), max_workers=workers)
+        fix_ids = list(fixer.get_available_fixes())
+
+        start = time.perf_counter()
+        plan = fixer.plan_fixes(fix_ids)
+        planned = time.perf_counter()
+        fixer.execute_plan(plan)
+        applied = time.perf_counter()
+        reapply = fixer.plan_fixes(fix_ids)
+        rolled_back = fixer.rollback_all()
+        done = time.perf_counter()
+        fixer.close()
+
+        results[f"workers_{workers}"] = {
+            "plan_ms": round((planned - start) * 1000, 2),
+            "apply_ms": round((applied - planned) * 1000, 2),
+            "replan_and_rollback_ms": round((done - applied) * 1000, 2),
+            "steps": len(plan.steps),
+            "steps_on_reapply": len(reapply.steps),
+            "commands": len(backend.commands),
+            "rollback_ok": bool(rolled_back) and all(rolled_back.values())
+        }
+    return results
+
+
+def unparsed_corpora(results):
+    return [name for name, row in results.get("parsing", {}).items() if not row["replies_parsed"]]
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current):
+    old = flatten(baseline["results"])
+    new = flatten(current["results"])
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        if old[name]:
+            rows.append(f"{name:<60} {old[name]:>14} {new[name]:>14} {new[name] / old[name]:>8.2f}x")
+    header = f"{'metric':<60} {baseline['revision']:>14} {current['revision']:>14} {'ratio':>9}"
+    return "\n".join([header] + rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite: parsing, statistics, rendering, fixes")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<revision>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="print ratios against an earlier result file")
+    parser.add_argument("--max-exponent", type=int, default=7, help="largest statistics array is 10^N samples")
+    parser.add_argument("--lines", type=int, default=100_000, help="parsed lines per locale")
+    parser.add_argument("--fix-delay", type=float, default=0.002, help="seconds per fake command")
+    parser.add_argument("--only", choices=["parsing", "statistics", "rendering", "fixes"], action="append")
+    args = parser.parse_args()
+
+    sections = {
+        "parsing": lambda: bench_parsing(args.lines),
+        "statistics": lambda: bench_statistics([10 ** exponent for exponent in range(3, args.max_exponent + 1)]),
+        "rendering": lambda: bench_rendering([100, 1_000, 10_000, 100_000]),
+        "fixes": lambda: bench_fix_execution(args.fix_delay)
+    }
+
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {}
+    }
+    for name, run in sections.items():
+        if args.only and name not in args.only:
+            continue
+        print(f"Running {name}...", file=sys.stderr)
+        report["results"][name] = run()
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+    print(f"Saved {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print(compare(json.load(f), report), file=sys.stderr)
+
+    failed = unparsed_corpora(report["results"])
+    if failed:
+        print(f"No replies parsed from: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
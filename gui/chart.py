@@ -0,0 +1,154 @@
+import time
+
+import matplotlib
+import matplotlib.style
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+import numpy as np
+
+from gui.theme import NeonTheme
+from utils.downsample import lttb
+
+
+MARKER_LIMIT = 200
+LIVE_REFRESH_INTERVAL = 0.05
+
+
+class MatplotlibCanvas(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        matplotlib.style.use('dark_background')
+
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.fig.patch.set_facecolor(NeonTheme.DARK_BG)
+
+        self.axes = self.fig.add_subplot(111)
+        self.axes.set_facecolor(NeonTheme.DARKER_BG)
+        self.axes.tick_params(colors=NeonTheme.TEXT_COLOR)
+        self.axes.spines['bottom'].set_color(NeonTheme.NEON_BLUE)
+        self.axes.spines['top'].set_color(NeonTheme.NEON_BLUE)
+        self.axes.spines['left'].set_color(NeonTheme.NEON_BLUE)
+        self.axes.spines['right'].set_color(NeonTheme.NEON_BLUE)
+
+        super(MatplotlibCanvas, self).__init__(self.fig)
+
+        self.axes.set_xlabel('Ping Number', color=NeonTheme.TEXT_COLOR)
+        self.axes.set_ylabel('Latency (ms)', color=NeonTheme.TEXT_COLOR)
+        self.axes.set_title('Network Latency Chart', color=NeonTheme.NEON_BLUE)
+        self.axes.grid(True, linestyle='--', alpha=0.3)
+        self.fig.subplots_adjust(left=0.12, bottom=0.12, right=0.95, top=0.92)
+
+        self.before_line, = self.axes.plot([], [], '-', color=NeonTheme.NEON_BLUE, alpha=0.7, markersize=3)
+        self.after_line, = self.axes.plot([], [], '-', color=NeonTheme.NEON_GREEN, alpha=0.7, markersize=3)
+        self.before_mean = self.axes.axhline(y=0, color=NeonTheme.NEON_BLUE, linestyle='--', alpha=0.7, visible=False)
+        self.after_mean = self.axes.axhline(y=0, color=NeonTheme.NEON_GREEN, linestyle='--', alpha=0.7, visible=False)
+        self.live_line, = self.axes.plot([], [], '-', color=NeonTheme.NEON_PINK, alpha=0.9, animated=True)
+
+        self._live_x = np.zeros(1024, dtype=np.float64)
+        self._live_y = np.zeros(1024, dtype=np.float64)
+        self._live_size = 0
+        self._live_limits = (0.0, 1.0, 0.0, 1.0)
+        self._last_live_refresh = 0.0
+        self._background = None
+        self._series_cache = {}
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def _pixel_width(self) -> int:
+        return max(100, int(self.axes.bbox.width))
+
+    def _on_draw(self, _event):
+        self._background = self.copy_from_bbox(self.axes.bbox)
+        if self._live_size:
+            self.axes.draw_artist(self.live_line)
+
+    def _set_series(self, line, mean_line, data, label, mean_label):
+        ping_times = data[0] if data else None
+        if not ping_times or len(ping_times) < 2:
+            line.set_data([], [])
+            line.set_label(f"_{label}")
+            mean_line.set_visible(False)
+            mean_line.set_label(f"_{mean_label}")
+            return False
+
+        width = self._pixel_width()
+        key = (id(ping_times), len(ping_times), width)
+        cached = self._series_cache.get(label)
+        if cached is None or cached[0] != key:
+            y = np.asarray(ping_times, dtype=np.float64)
+            x, y_plot = lttb(np.arange(len(y), dtype=np.float64), y, width)
+            cached = (key, x, y_plot, float(y.mean()))
+            self._series_cache[label] = cached
+        _, x, y_plot, mean = cached
+
+        line.set_data(x, y_plot)
+        line.set_marker('o' if len(x) <= MARKER_LIMIT else '')
+        line.set_label(label)
+
+        mean_line.set_ydata([mean, mean])
+        mean_line.set_visible(True)
+        mean_line.set_label(f"{mean_label}: {mean:.2f} ms")
+        return True
+
+    def plot_comparison(self, before_data, after_data):
+        self.clear_live()
+
+        has_before = self._set_series(self.before_line, self.before_mean, before_data, "Before Fixes", "Average before")
+        has_after = self._set_series(self.after_line, self.after_mean, after_data, "After Fixes", "Average after")
+
+        legend = self.axes.get_legend()
+        if has_before or has_after:
+            self.axes.relim(visible_only=True)
+            self.axes.set_autoscale_on(True)
+            self.axes.autoscale_view()
+            self.axes.legend()
+        elif legend is not None:
+            legend.remove()
+
+        self.draw_idle()
+
+    def clear_live(self):
+        self._live_size = 0
+        self.live_line.set_data([], [])
+
+    def start_live(self, color):
+        self.clear_live()
+        self.live_line.set_color(color)
+        self._live_limits = (0.0, 1.0, 0.0, 1.0)
+
+    def append_live(self, x: float, y: float):
+        if self._live_size == len(self._live_x):
+            self._live_x = np.resize(self._live_x, len(self._live_x) * 2)
+            self._live_y = np.resize(self._live_y, len(self._live_y) * 2)
+        self._live_x[self._live_size] = x
+        self._live_y[self._live_size] = y
+        self._live_size += 1
+
+        now = time.monotonic()
+        if now - self._last_live_refresh >= LIVE_REFRESH_INTERVAL:
+            self._last_live_refresh = now
+            self.refresh_live()
+
+    def refresh_live(self):
+        if not self._live_size:
+            return
+
+        x, y = lttb(self._live_x[:self._live_size], self._live_y[:self._live_size], self._pixel_width())
+        self.live_line.set_data(x, y)
+
+        x_min, x_max, y_min, y_max = self._live_limits
+        if x[-1] > x_max or y.max() > y_max or y.min() < y_min or self._background is None:
+            span = max(1.0, float(y.max() - y.min()))
+            self._live_limits = (
+                0.0,
+                max(x_max, float(x[-1])) * 1.5 + 1,
+                max(0.0, float(y.min()) - span * 0.5),
+                float(y.max()) + span * 0.5
+            )
+            self.axes.set_xlim(self._live_limits[0], self._live_limits[1])
+            self.axes.set_ylim(self._live_limits[2], self._live_limits[3])
+            self.draw()
+            return
+
+        self.restore_region(self._background)
+        self.axes.draw_artist(self.live_line)
+        self.blit(self.axes.bbox)
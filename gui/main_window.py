@@ -8,38 +8,25 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QIcon, QPixmap, QFont
 
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-
-import numpy as np
-
 from utils.jitter_checker import JitterChecker
 from utils.jitter_fixer import JitterFixer
+from utils.tracing import tracer
 from gui.theme import NeonTheme
+from gui.startup import StartupTimer
 
 
-class MatplotlibCanvas(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        plt.style.use('dark_background')
-        
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.fig.patch.set_facecolor(NeonTheme.DARK_BG)
-        
-        self.axes = self.fig.add_subplot(111)
-        self.axes.set_facecolor(NeonTheme.DARKER_BG)
-        self.axes.tick_params(colors=NeonTheme.TEXT_COLOR)
-        self.axes.spines['bottom'].set_color(NeonTheme.NEON_BLUE)
-        self.axes.spines['top'].set_color(NeonTheme.NEON_BLUE)
-        self.axes.spines['left'].set_color(NeonTheme.NEON_BLUE)
-        self.axes.spines['right'].set_color(NeonTheme.NEON_BLUE)
-        
-        super(MatplotlibCanvas, self).__init__(self.fig)
+class ChartLoaderThread(QThread):
+    def run(self):
+        try:
+            import gui.chart
+        except Exception as e:
+            print(f"Error loading chart backend: {e}")
 
 
 class JitterCheckThread(QThread):
     finished = pyqtSignal(float, list, list)
     progress_updated = pyqtSignal(int)
+    sample_received = pyqtSignal(object, object)
     
     def __init__(self, jitter_checker):
         super().__init__()
@@ -47,10 +34,22 @@ class JitterCheckThread(QThread):
         self.is_canceled = False
     
     def run(self):
-        jitter, ping_times, time_stamps = self.jitter_checker.check_jitter(
-            progress_callback=self.update_progress
-        )
-        self.finished.emit(jitter, ping_times, time_stamps)
+        samples = []
+        try:
+            for sample in self.jitter_checker.iter_samples():
+                samples.append(sample)
+                self.sample_received.emit(sample, time.perf_counter_ns())
+                self.update_progress(self.jitter_checker.progress(len(samples)))
+        except Exception as e:
+            print(f"Error in jitter check thread: {e}")
+        
+        if self.is_canceled or not samples:
+            self.finished.emit(0.0, [], [])
+            return
+        
+        result = self.jitter_checker.summarize(samples)
+        self.jitter_checker.last_result = result
+        self.finished.emit(result.jitter, result.ping_times, result.time_stamps)
     
     def update_progress(self, value):
         self.progress_updated.emit(value)
@@ -60,6 +59,24 @@ class JitterCheckThread(QThread):
         self.jitter_checker.cancel_check()
 
 
+class MonitorThread(QThread):
+    window_stats_updated = pyqtSignal(dict)
+    
+    def __init__(self, jitter_checker, buffer):
+        super().__init__()
+        self.jitter_checker = jitter_checker
+        self.buffer = buffer
+    
+    def run(self):
+        self.jitter_checker.monitor(self.buffer, on_sample=self.on_sample)
+    
+    def on_sample(self, _result):
+        self.window_stats_updated.emit(self.buffer.windowed_stats())
+    
+    def cancel(self):
+        self.jitter_checker.cancel_check()
+
+
 class FixThread(QThread):
     progress_updated = pyqtSignal(int, str)
     finished = pyqtSignal(dict)
@@ -70,30 +87,43 @@ class FixThread(QThread):
         self.selected_fixes = selected_fixes
     
     def run(self):
-        fix_results = {}
-        total = len(self.selected_fixes)
+        self.progress_updated.emit(0, "Reading current settings...")
+        plan = self.jitter_fixer.plan_fixes(self.selected_fixes)
         
-        for i, fix_id in enumerate(self.selected_fixes):
-            fix_name = self.jitter_fixer.fixes_available[fix_id]
-            self.progress_updated.emit(int((i / total) * 100), f"Applying: {fix_name}")
-            fix_results[fix_id] = self.jitter_fixer.apply_fix(fix_id)
-            time.sleep(0.5)
+        def on_step(step, success, done, total):
+            fix_names = ", ".join(self.jitter_fixer.fixes_available[fix_id] for fix_id in step.fixes)
+            self.progress_updated.emit(int((done / total) * 100), f"{'Applied' if success else 'Failed'}: {fix_names}")
+        
+        fix_results = self.jitter_fixer.execute_plan(plan, on_step)
         
         self.progress_updated.emit(100, "Fixes completed!")
         self.finished.emit(fix_results)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_timer=None, metrics_port=None):
         super().__init__()
         
+        self.startup_timer = startup_timer or StartupTimer()
+        self.plot_canvas = None
+        self.chart_loader = None
+        self._first_paint_done = False
+        
         self.jitter_checker = JitterChecker()
+        self.jitter_checker.session_dir = os.path.join(os.path.expanduser("~"), ".netjitterfix", "sessions")
         self.jitter_fixer = JitterFixer()
+        self.metrics_exporter = None
+        if metrics_port is not None:
+            from utils.metrics_exporter import MetricsExporter
+            
+            self.metrics_exporter = MetricsExporter(port=metrics_port).start()
+            self.jitter_checker.metrics = self.metrics_exporter.registry
         
         self.before_jitter = None
         self.after_jitter = None
         self.before_data = None
         self.after_data = None
+        self.monitor_buffer = None
         
         self.init_ui()
     
@@ -129,9 +159,20 @@ class MainWindow(QMainWindow):
         self.check_button.clicked.connect(self.on_check_jitter)
         check_button_layout.addWidget(self.check_button)
         
+        self.monitor_button = QPushButton("Start Monitoring")
+        self.monitor_button.clicked.connect(self.on_toggle_monitor)
+        check_button_layout.addWidget(self.monitor_button)
+        
         jitter_layout.addLayout(check_button_layout)
         
+        self.adaptive_checkbox = QCheckBox("Stop early once results are stable")
+        self.adaptive_checkbox.setToolTip("Leave unchecked to send the same number of probes on every check, "
+                                          "so before/after comparisons use equal sample sizes")
+        self.adaptive_checkbox.toggled.connect(self.on_adaptive_toggled)
+        jitter_layout.addWidget(self.adaptive_checkbox)
+        
         self.jitter_progress = QProgressBar()
+        self.jitter_progress.setFormat("%p%")
         self.jitter_progress.setVisible(False)
         jitter_layout.addWidget(self.jitter_progress)
         
@@ -145,8 +186,11 @@ class MainWindow(QMainWindow):
         graph_group = QGroupBox("Charts")
         graph_layout = QVBoxLayout(graph_group)
         
-        self.plot_canvas = MatplotlibCanvas(width=8, height=4, dpi=100)
-        graph_layout.addWidget(self.plot_canvas)
+        self.graph_layout = graph_layout
+        self.chart_placeholder = QLabel("Loading chart...")
+        self.chart_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.chart_placeholder.setMinimumHeight(400)
+        graph_layout.addWidget(self.chart_placeholder)
         
         main_tab_layout.addWidget(graph_group)
         
@@ -217,14 +261,72 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(tab_widget)
         
         self.setCentralWidget(central_widget)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            QTimer.singleShot(0, self.on_first_paint)
+    
+    def closeEvent(self, event):
+        self.jitter_fixer.close()
+        if tracer.enabled:
+            trace_dir = os.path.join(os.path.expanduser("~"), ".netjitterfix")
+            os.makedirs(trace_dir, exist_ok=True)
+            trace_path = os.path.join(trace_dir, f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            tracer.write_chrome_trace(trace_path)
+            print(tracer.format_summary())
+            print(f"Trace written to {trace_path}")
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        super().closeEvent(event)
+    
+    def on_first_paint(self):
+        self.startup_timer.mark("first_paint")
+        self.ensure_chart()
+        self.check_admin_rights()
+    
+    def check_admin_rights(self):
+        if self.jitter_fixer.check_admin_rights():
+            return
         
-        if not self.jitter_fixer.check_admin_rights():
-            QMessageBox.warning(
-                self,
-                "Insufficient Permissions",
-                "The application is running without administrator rights. Some features may not be available.\n\n"
-                "It is recommended to close the application and run it as administrator."
-            )
+        self.admin_warning = QMessageBox(
+            QMessageBox.Icon.Warning,
+            "Insufficient Permissions",
+            "The application is running without administrator rights. Some features may not be available.\n\n"
+            "It is recommended to close the application and run it as administrator.",
+            QMessageBox.StandardButton.Ok,
+            self
+        )
+        self.admin_warning.setWindowModality(Qt.WindowModality.NonModal)
+        self.admin_warning.show()
+    
+    def ensure_chart(self):
+        if self.plot_canvas is not None or self.chart_loader is not None:
+            return
+        
+        self.chart_loader = ChartLoaderThread()
+        self.chart_loader.finished.connect(self.on_chart_loaded)
+        self.chart_loader.start()
+    
+    def on_chart_loaded(self):
+        try:
+            from gui.chart import MatplotlibCanvas
+        except Exception:
+            self.chart_placeholder.setText("Chart unavailable")
+            return
+        
+        self.plot_canvas = MatplotlibCanvas(width=8, height=4, dpi=100)
+        self.graph_layout.replaceWidget(self.chart_placeholder, self.plot_canvas)
+        self.chart_placeholder.deleteLater()
+        self.startup_timer.mark("chart_ready")
+        self.startup_timer.print_report()
+        
+        self.update_plot()
+    
+    def on_adaptive_toggled(self, checked):
+        self.jitter_checker.set_adaptive(0.1 if checked else None)
+        self.jitter_progress.setFormat("Converging... %p%" if checked else "%p%")
     
     def on_check_jitter(self):
         self.check_button.setEnabled(False)
@@ -250,8 +352,12 @@ class MainWindow(QMainWindow):
         cancel_layout.addWidget(cancel_button)
         layout.insertLayout(layout.count()-1, cancel_layout)
         
+        if self.plot_canvas is not None:
+            self.plot_canvas.start_live(NeonTheme.NEON_BLUE if self.before_jitter is None else NeonTheme.NEON_GREEN)
+        
         self.jitter_thread = JitterCheckThread(self.jitter_checker)
         self.jitter_thread.progress_updated.connect(self.update_check_progress)
+        self.jitter_thread.sample_received.connect(self.on_jitter_sample)
         self.jitter_thread.finished.connect(self.on_jitter_check_complete)
         self.jitter_thread.start()
 
@@ -261,6 +367,7 @@ class MainWindow(QMainWindow):
             self.check_button.setEnabled(True)
             self.jitter_progress.setVisible(False)
             self.result_label.setText("Check canceled")
+            self.update_plot()
             
             layout = self.jitter_progress.parent().layout()
             for i in range(layout.count()):
@@ -272,9 +379,55 @@ class MainWindow(QMainWindow):
                             widget.deleteLater()
                     layout.removeItem(item)
 
+    def on_toggle_monitor(self):
+        if hasattr(self, "monitor_thread") and self.monitor_thread.isRunning():
+            self.monitor_thread.cancel()
+            return
+        
+        self.check_button.setEnabled(False)
+        self.monitor_button.setText("Stop Monitoring")
+        self.result_label.setText("Monitoring...")
+        
+        if self.monitor_buffer is None:
+            from utils.ring_buffer import SampleRingBuffer
+            self.monitor_buffer = SampleRingBuffer()
+        self.monitor_buffer.clear()
+        self.monitor_thread = MonitorThread(self.jitter_checker, self.monitor_buffer)
+        self.monitor_thread.window_stats_updated.connect(self.on_monitor_stats)
+        self.monitor_thread.finished.connect(self.on_monitor_stopped)
+        self.monitor_thread.start()
+    
+    def on_monitor_stats(self, windows):
+        parts = []
+        for name, stats in windows.items():
+            parts.append(f"{name}: {stats['jitter']:.2f} ms / {stats['packet_loss']:.1f}% loss")
+        self.result_label.setText("Jitter " + " | ".join(parts))
+    
+    def on_monitor_stopped(self):
+        self.check_button.setEnabled(True)
+        self.monitor_button.setText("Start Monitoring")
+    
     def update_check_progress(self, value):
         self.jitter_progress.setValue(value)
     
+    def on_jitter_sample(self, sample, emitted_ns=None):
+        if emitted_ns is not None:
+            tracer.complete("gui.signal_delivery", emitted_ns, time.perf_counter_ns(), "gui")
+        
+        with tracer.span("gui.on_jitter_sample", "gui"):
+            self._show_jitter_sample(sample)
+    
+    def _show_jitter_sample(self, sample):
+        if self.plot_canvas is not None and not sample.lost:
+            self.plot_canvas.append_live(sample.seq, sample.rtt_ms)
+        
+        stats = sample.stats
+        if stats.get("received"):
+            self.result_label.setText(
+                f"Measuring jitter... {stats['jitter']:.2f} ms "
+                f"(avg {stats['avg_ping']:.2f} ms, loss {stats['packet_loss']:.1f}%)"
+            )
+    
     def on_jitter_check_complete(self, jitter, ping_times, time_stamps):
         if self.before_jitter is None:
             self.before_jitter = jitter
@@ -290,6 +443,14 @@ class MainWindow(QMainWindow):
                 f"({max(0, 100 - (self.after_jitter / self.before_jitter * 100)):.1f}%)"
             )
         
+        result = self.jitter_checker.last_result
+        if result is not None and result.ping_times:
+            analysis = result.analysis
+            if analysis.periodic:
+                self.result_label.setText(
+                    f"{self.result_label.text()} | Periodic spikes every {analysis.periodicity.period_s:.1f} s"
+                )
+        
         self.update_plot()
         self.check_button.setEnabled(True)
         self.jitter_progress.setVisible(False)
@@ -305,67 +466,12 @@ class MainWindow(QMainWindow):
                 layout.removeItem(item)
     
     def update_plot(self):
-        self.plot_canvas.axes.clear()
-        
-        has_data = False
-        
-        if self.before_data:
-            ping_times, time_stamps = self.before_data
-            if ping_times and len(ping_times) > 1:
-                has_data = True
-                self.plot_canvas.axes.plot(
-                    list(range(len(ping_times))), 
-                    ping_times,
-                    '-o',
-                    color=NeonTheme.NEON_BLUE,
-                    alpha=0.7,
-                    markersize=3,
-                    label="Before Fixes"
-                )
-                
-                mean_before = np.mean(ping_times)
-                self.plot_canvas.axes.axhline(
-                    y=mean_before,
-                    color=NeonTheme.NEON_BLUE,
-                    linestyle='--',
-                    alpha=0.7,
-                    label=f"Average before: {mean_before:.2f} ms"
-                )
-        
-        if self.after_data:
-            ping_times, time_stamps = self.after_data
-            if ping_times and len(ping_times) > 1:
-                has_data = True
-                self.plot_canvas.axes.plot(
-                    list(range(len(ping_times))),
-                    ping_times,
-                    '-o',
-                    color=NeonTheme.NEON_GREEN,
-                    alpha=0.7,
-                    markersize=3,
-                    label="After Fixes"
-                )
-                
-                mean_after = np.mean(ping_times)
-                self.plot_canvas.axes.axhline(
-                    y=mean_after,
-                    color=NeonTheme.NEON_GREEN,
-                    linestyle='--',
-                    alpha=0.7,
-                    label=f"Average after: {mean_after:.2f} ms"
-                )
-        
-        self.plot_canvas.axes.set_xlabel('Ping Number', color=NeonTheme.TEXT_COLOR)
-        self.plot_canvas.axes.set_ylabel('Latency (ms)', color=NeonTheme.TEXT_COLOR)
-        self.plot_canvas.axes.set_title('Network Latency Chart', color=NeonTheme.NEON_BLUE)
-        self.plot_canvas.axes.grid(True, linestyle='--', alpha=0.3)
-        
-        if has_data:
-            self.plot_canvas.axes.legend()
-        
-        self.plot_canvas.fig.subplots_adjust(left=0.12, bottom=0.12, right=0.95, top=0.92)
+        if self.plot_canvas is None:
+            self.ensure_chart()
+            return
         
-        self.plot_canvas.draw()
+        with tracer.span("gui.update_plot", "gui"):
+            self.plot_canvas.plot_comparison(self.before_data, self.after_data)
     
     def on_fix_jitter(self):
         selected_fixes = [fix_id for fix_id, checkbox in self.fix_checkboxes.items() if checkbox.isChecked()]
@@ -0,0 +1,36 @@
+import sys
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupTimer:
+    def __init__(self, start: Optional[float] = None, verbose: bool = False):
+        self.start = start if start is not None else time.perf_counter()
+        self.verbose = verbose
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.start
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000
+        self.phases.append((phase, elapsed))
+        self._last = now
+        return elapsed
+
+    def has_phase(self, phase: str) -> bool:
+        return any(name == phase for name, _ in self.phases)
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.start) * 1000
+
+    def report(self) -> str:
+        lines = ["Startup phases:"]
+        for phase, elapsed in self.phases:
+            lines.append(f"  {phase:<16} {elapsed:8.1f} ms")
+        lines.append(f"  {'total':<16} {self.total_ms:8.1f} ms")
+        return "\n".join(lines)
+
+    def print_report(self) -> None:
+        if self.verbose:
+            print(self.report(), file=sys.stderr)
@@ -1,19 +1,54 @@
+import time
+
+STARTUP_BEGIN = time.perf_counter()
+
+import argparse
 import sys
 import os
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 
 from gui.main_window import MainWindow
+from gui.startup import StartupTimer
 from gui.theme import NeonTheme
 
 
+def _port(value: str) -> int:
+    try:
+        port = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid port: {value!r}")
+    if not 1 <= port <= 65535:
+        raise argparse.ArgumentTypeError(f"port must be between 1 and 65535: {port}")
+    return port
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="NetJitterFix GUI")
+    parser.add_argument("--startup-timing", action="store_true", help="print startup phase timings")
+    parser.add_argument("--profile", action="store_true", help="trace GUI signals and chart redraws")
+    parser.add_argument("--metrics-port", type=_port, help="serve Prometheus/OpenMetrics metrics on this port")
+    return parser.parse_known_args(argv)
+
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv[1:])
+    startup_timer = StartupTimer(STARTUP_BEGIN, verbose=args.startup_timing)
+    startup_timer.mark("imports")
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup_timer.mark("qapplication")
     
     NeonTheme.apply_theme(app)
     app.setStyleSheet(NeonTheme.get_stylesheet())
+    startup_timer.mark("theme")
+    
+    if args.profile:
+        from utils.tracing import tracer
+        tracer.enable()
     
-    window = MainWindow()
+    window = MainWindow(startup_timer=startup_timer, metrics_port=args.metrics_port)
+    startup_timer.mark("window")
     window.show()
     
     sys.exit(app.exec())
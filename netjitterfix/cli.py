@@ -0,0 +1,532 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from utils.jitter_checker import JitterChecker
+
+
+STAT_FIELDS = ["target", "jitter", "rfc3550_jitter", "ipdv_mean", "min_ping", "max_ping", "avg_ping",
+               "p50", "p95", "p99", "packet_loss", "sent", "received", "refused", "duplicates", "reordered", "late_replies",
+               "max_loss_burst", "send_lag_ms", "send_lag_p99_ms"]
+
+
+def _write_rows(rows: List[Dict], fields: List[str], output_format: str, out=None) -> None:
+    out = out or sys.stdout
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        json.dump(rows if len(rows) != 1 else rows[0], out, indent=2)
+        out.write("\n")
+    out.flush()
+
+
+def _create_checker(args) -> "JitterChecker":
+    from utils.jitter_checker import JitterChecker
+
+    checker = JitterChecker()
+    if getattr(args, "count", None):
+        checker.set_ping_count(args.count)
+    checker.set_probe_mode(args.mode)
+    checker.set_dscp(args.dscp)
+    checker.payload_size = args.size
+    if args.port is not None:
+        checker.udp_port = checker.tcp_port = args.port
+    checker.set_interval(args.interval, args.poisson, args.precise_pacing)
+    checker.timeout = args.timeout
+    checker.session_dir = args.session_dir
+    if args.metrics_port is not None:
+        from utils.metrics_exporter import MetricsExporter
+
+        exporter = MetricsExporter(host=args.metrics_bind, port=args.metrics_port).start()
+        checker.metrics = exporter.registry
+        print(f"Serving metrics on {exporter.url}", file=sys.stderr)
+    return checker
+
+
+ANALYSIS_FIELDS = ["spikes", "periodic", "period_s", "period_strength"]
+CONVERGENCE_FIELDS = ["converged", "jitter_ci_ms", "p95_ci_ms"]
+
+
+def _stats_row(result, analyze: bool = False, convergence=None) -> Dict:
+    row = {"target": result.target}
+    row.update(result.snapshot())
+    if not result.sent:
+        row["packet_loss"] = 100.0
+    if analyze:
+        row.update(result.analysis.summary())
+    if convergence is not None:
+        row.update(convergence.summary())
+    return row
+
+
+def _read_targets(args) -> List[str]:
+    targets = list(args.target or [])
+    if getattr(args, "targets_file", None):
+        with open(args.targets_file, encoding="utf-8") as f:
+            targets += [line.split("#", 1)[0].strip() for line in f]
+    return [target for target in targets if target]
+
+
+def run_check(args) -> int:
+    checker = _create_checker(args)
+    targets = _read_targets(args) or [checker.target]
+
+    if args.workers is not None and not args.samples:
+        fleet = checker.check_fleet(targets, args.workers or None)
+        fields = STAT_FIELDS + ["error"]
+        _write_rows(fleet.rows(), fields, args.format)
+        print(json.dumps(fleet.summary()), file=sys.stderr)
+        return 0 if any(result.ping_times for result in fleet.results.values()) else 1
+
+    if args.precision is not None:
+        checker.set_adaptive(args.precision, args.min_count, args.tolerance)
+    if len(targets) == 1:
+        checker.set_target(targets[0])
+        results = {targets[0]: checker.check_jitter()}
+        convergence = {targets[0]: checker.convergence}
+    else:
+        results = checker.check_many(targets, max_concurrency=args.concurrency)
+        convergence = checker.target_convergence
+    for target, reason in checker.probe_fallbacks.items():
+        print(f"{target}: native probe unavailable ({reason}), measured with ping", file=sys.stderr)
+
+    if args.samples:
+        rows = []
+        for target, result in results.items():
+            for offset, rtt in zip(result.time_stamps, result.ping_times):
+                rows.append({"target": target, "offset": offset, "rtt_ms": rtt})
+        _write_rows(rows, ["target", "offset", "rtt_ms"], args.format)
+    else:
+        fields = STAT_FIELDS + ANALYSIS_FIELDS if args.analyze else STAT_FIELDS
+        if args.precision is not None:
+            fields = fields + CONVERGENCE_FIELDS
+        _write_rows([_stats_row(result, args.analyze, convergence.get(target)) for target, result in results.items()],
+                    fields, args.format)
+
+    return 0 if any(result.ping_times for result in results.values()) else 1
+
+
+def run_analyze(args) -> int:
+    from utils.sample_log import SampleLog
+    from utils.trace_analysis import analyze_trace
+
+    rows = []
+    with SampleLog(args.session) as log:
+        for target in args.target or log.targets:
+            if target not in log.targets:
+                print(f"Target not in session: {target}", file=sys.stderr)
+                return 2
+            records = log.for_target(target)
+            analysis = analyze_trace(log.rtts_ms(target), timestamps=records["timestamp"],
+                                     window=args.window, threshold=args.threshold)
+            row = {"target": target}
+            row.update(analysis.summary())
+            rows.append(row)
+
+    _write_rows(rows, ["target", "samples", "baseline_ms", "mad_ms", "spikes", "spike_threshold_ms"] + ANALYSIS_FIELDS[1:],
+                args.format)
+    return 0
+
+
+def run_monitor(args) -> int:
+    from utils.ring_buffer import SampleRingBuffer
+
+    checker = _create_checker(args)
+    if args.target:
+        checker.set_target(args.target[0])
+
+    buffer = SampleRingBuffer(args.capacity)
+    fields = ["time", "window", "sent", "received", "packet_loss", "jitter", "ipdv_mean",
+              "min_ping", "max_ping", "avg_ping", "p95"]
+    last_report = time.monotonic()
+
+    if args.format == "csv":
+        csv.writer(sys.stdout, lineterminator="\n").writerow(fields)
+
+    def report():
+        now = time.time()
+        for window, stats in buffer.windowed_stats(now).items():
+            row = {"time": round(now, 3), "window": window}
+            row.update(stats)
+            if args.format == "csv":
+                csv.DictWriter(sys.stdout, fieldnames=fields, extrasaction="ignore", lineterminator="\n").writerow(row)
+            else:
+                sys.stdout.write(json.dumps(row) + "\n")
+        sys.stdout.flush()
+
+    def on_sample(_result):
+        nonlocal last_report
+        if time.monotonic() - last_report >= args.report_every:
+            last_report = time.monotonic()
+            report()
+
+    try:
+        checker.monitor(buffer, on_sample=on_sample, duration=args.duration)
+    except KeyboardInterrupt:
+        checker.cancel_check()
+    report()
+    return 0
+
+
+def run_fix(args) -> int:
+    from utils.jitter_fixer import JitterFixer
+
+    fixer = JitterFixer()
+    available = fixer.get_available_fixes()
+
+    if args.list:
+        rows = [{"fix": fix_id, "description": name} for fix_id, name in available.items()]
+        _write_rows(rows, ["fix", "description"], args.format)
+        return 0
+
+    if args.rollback and args.all:
+        selected = list(reversed(fixer.get_applied_fixes()))
+    else:
+        selected = list(available) if args.all else (args.fix or [])
+    unknown = [fix_id for fix_id in selected if fix_id not in available]
+    if unknown or not selected:
+        print(f"Unknown or missing fixes: {', '.join(unknown) or 'none selected'}", file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        plan = fixer.plan_fixes(selected)
+        for conflict in plan.conflicts:
+            print(f"Conflict: {conflict.ident} = {conflict.value} ({conflict.winner}) overrides "
+                  f"{conflict.overridden_value} ({', '.join(conflict.overridden)})", file=sys.stderr)
+        _print_skipped(plan)
+        _write_rows(plan.rows(), ["step", "stage", "fixes", "target", "before", "after", "depends_on"], args.format)
+        return 0
+
+    if not fixer.check_admin_rights():
+        print("Administrator rights required to apply fixes", file=sys.stderr)
+
+    if args.rollback:
+        rows = [{"fix": fix_id, "rolled_back": fixer.rollback_fix(fix_id)} for fix_id in selected]
+        _write_rows(rows, ["fix", "rolled_back"], args.format)
+        return 0 if all(row["rolled_back"] for row in rows) else 1
+
+    plan = fixer.plan_fixes(selected)
+    _print_skipped(plan)
+    results = fixer.execute_plan(plan)
+    rows = [{"fix": fix_id, "applied": results.get(fix_id, False)} for fix_id in selected]
+    _write_rows(rows, ["fix", "applied"], args.format)
+    return 0 if all(row["applied"] for row in rows) else 1
+
+
+def _print_skipped(plan) -> None:
+    for ident in plan.unsupported:
+        print(f"Skipped: {ident} (not available on this system)", file=sys.stderr)
+    for fix_id, idents in plan.blocked.items():
+        print(f"Not applied: {fix_id} (current value of {', '.join(idents)} unknown, so it could not be rolled back)",
+              file=sys.stderr)
+
+
+def run_bench(args) -> int:
+    from utils.fix_benchmark import FixBenchmark, checker_measurement
+    from utils.jitter_fixer import JitterFixer
+
+    checker = _create_checker(args)
+    if args.target:
+        checker.set_target(args.target[0])
+    fixer = JitterFixer()
+    unknown = [fix_id for fix_id in args.fix if fix_id not in fixer.get_available_fixes()]
+    if unknown:
+        print(f"Unknown fixes: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if not fixer.check_admin_rights():
+        print("Administrator rights required to apply fixes", file=sys.stderr)
+        return 2
+
+    def on_run(round_index, applied, metrics):
+        print(f"round {round_index + 1}/{args.rounds} {'with' if applied else 'without'} fix: "
+              f"jitter {metrics['jitter']:.2f} ms, p95 {metrics['p95']:.2f} ms, loss {metrics['packet_loss']:.1f}%",
+              file=sys.stderr)
+
+    benchmark = FixBenchmark(fixer, checker_measurement(checker), rounds=args.rounds, alpha=args.alpha)
+    try:
+        result = benchmark.run(args.fix, on_run)
+    except (ValueError, RuntimeError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    finally:
+        fixer.close()
+
+    _write_rows(result.rows(), ["metric", "baseline", "treatment", "delta", "relative", "ci_low", "ci_high",
+                                "p_value", "significant"], args.format)
+    print("Fix measurably helps" if result.helps else "No significant improvement", file=sys.stderr)
+    return 0 if result.helps else 1
+
+
+def run_optimize(args) -> int:
+    from utils.fix_benchmark import checker_measurement
+    from utils.fix_optimizer import FixOptimizer
+    from utils.jitter_fixer import JitterFixer
+
+    checker = _create_checker(args)
+    if args.target:
+        checker.set_target(args.target[0])
+    fixer = JitterFixer()
+    unknown = [fix_id for fix_id in args.fix if fix_id not in fixer.get_available_fixes()]
+    if unknown:
+        print(f"Unknown fixes: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if not fixer.check_admin_rights():
+        print("Administrator rights required to apply fixes", file=sys.stderr)
+        return 2
+
+    def on_step(fixes, score):
+        print(f"accepted {' '.join(fixes)}: {args.metric} {score:.2f}", file=sys.stderr)
+
+    optimizer = FixOptimizer(fixer, checker_measurement(checker), args.fix or None, metric=args.metric,
+                             race_rounds=args.rounds, alpha=args.alpha, max_measurements=args.max_measurements)
+    try:
+        result = optimizer.optimize(on_step)
+        if args.apply and result.best:
+            fixer.apply_fixes(result.best)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    finally:
+        fixer.close()
+
+    if result.excluded:
+        print(f"Not tested (current values unknown, cannot be reverted): {' '.join(result.excluded)}", file=sys.stderr)
+    _write_rows(result.rows(), ["fixes", "runs", args.metric, "best"], args.format)
+    print(f"Best fix set: {' '.join(result.best) or '(none)'} ({args.metric} {result.baseline_score:.2f} -> "
+          f"{result.score:.2f}, {result.measurements} runs, {result.measurement_seconds / 60:.1f} min)", file=sys.stderr)
+    return 0 if result.restored else 1
+
+
+def run_bufferbloat(args) -> int:
+    from utils.load_test import build_phases
+
+    checker = _create_checker(args)
+    if args.target:
+        checker.set_target(args.target[0])
+    try:
+        phases = build_phases(args.phases.split(","), args.streams, args.udp_mbps)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    try:
+        result = checker.check_under_load(phases, args.load_host, args.load_port, args.warmup)
+    except KeyboardInterrupt:
+        checker.cancel_check()
+        return 130
+
+    _write_rows(result.rows(), ["target", "phase", "p50", "p95", "jitter", "packet_loss", "added_ms", "grade",
+                                "upload_mbps", "download_mbps", "error"], args.format)
+    for phase, problem in result.invalid.items():
+        print(f"Phase {phase} not graded: {problem} (is a load sink listening on port {args.load_port}?)",
+              file=sys.stderr)
+    if result.baseline_ms is None:
+        print("Bufferbloat grade: N/A (no idle baseline; include the idle phase and make sure the target replies)",
+              file=sys.stderr)
+    else:
+        print(f"Bufferbloat grade: {result.grade} (+{result.worst_added_ms:.1f} ms under load)", file=sys.stderr)
+    return 1 if result.invalid else 0
+
+
+def run_sink(args) -> int:
+    import asyncio
+    from utils.load_test import LoadSink
+
+    print(f"Load sink listening on {args.bind}:{args.port} (tcp and udp)", file=sys.stderr)
+    try:
+        asyncio.run(LoadSink(args.bind, args.port).serve(args.duration))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Cannot start load sink: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_reflect(args) -> int:
+    import asyncio
+    from utils.reflector import Reflector
+
+    reflector = Reflector(args.bind, args.port, rate=args.rate, burst=args.burst, max_clients=args.max_clients)
+    fields = ["time", "received", "reflected", "rate_limited", "invalid", "send_errors", "clients", "mean_server_us"]
+
+    if args.format == "csv":
+        csv.writer(sys.stdout, lineterminator="\n").writerow(fields)
+
+    def report(stats):
+        row = {"time": round(time.time(), 3)}
+        row.update(stats.snapshot())
+        if args.format == "csv":
+            csv.DictWriter(sys.stdout, fieldnames=fields, extrasaction="ignore", lineterminator="\n").writerow(row)
+        else:
+            sys.stdout.write(json.dumps(row) + "\n")
+        sys.stdout.flush()
+
+    print(f"Reflecting UDP probes on {args.bind}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(reflector.serve(args.duration, args.report_every, report))
+    except KeyboardInterrupt:
+        report(reflector.stats)
+    except OSError as e:
+        print(f"Cannot start reflector: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _interval(value: str) -> float:
+    from utils.pacing import MIN_INTERVAL
+
+    interval = float(value)
+    if interval < MIN_INTERVAL:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_INTERVAL:g} seconds")
+    return interval
+
+
+def _port(value: str) -> int:
+    port = int(value)
+    if not 1 <= port <= 65535:
+        raise argparse.ArgumentTypeError("must be between 1 and 65535")
+    return port
+
+
+class _SingleTarget(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        if getattr(namespace, self.dest):
+            parser.error(f"{option_string} may be given once; this command probes a single target")
+        setattr(namespace, self.dest, [values])
+
+
+def _add_probe_arguments(parser: argparse.ArgumentParser, count: Optional[int] = 100, several_targets: bool = False) -> None:
+    if several_targets:
+        parser.add_argument("-t", "--target", action="append", help="host to probe (repeat for several targets)")
+    else:
+        parser.add_argument("-t", "--target", action=_SingleTarget, help="host to probe")
+    if count is not None:
+        parser.add_argument("-c", "--count", type=int, default=count, help="probes per target")
+    parser.add_argument("-i", "--interval", type=_interval, default=1.0, help="seconds between probes (down to 0.005)")
+    parser.add_argument("--poisson", action="store_true", help="randomize probe spacing around the interval (exponential gaps)")
+    parser.add_argument("--precise-pacing", action="store_true",
+                        help="busy-wait up to 2 ms before each probe for sub-millisecond send times (uses more CPU)")
+    parser.add_argument("--timeout", type=int, default=1000, help="reply timeout in milliseconds")
+    parser.add_argument("--mode", default="auto", choices=["auto", "icmp", "icmp_raw", "udp", "tcp"],
+                        help="probe transport; tcp times SYN to SYN-ACK or RST, so a refused port still counts as a "
+                             "reply (see the refused column)")
+    parser.add_argument("--port", type=int, help="destination port for udp (default 7) and tcp (default 443) probes")
+    parser.add_argument("--size", type=int, default=56, help="probe payload size in bytes (icmp and udp)")
+    parser.add_argument("--dscp", type=int, default=0, choices=range(64), metavar="0-63", help="DSCP class to mark probes with, e.g. 46 for EF")
+    parser.add_argument("--session-dir", help="directory to persist the session sample log")
+    parser.add_argument("--metrics-port", type=_port, help="serve Prometheus/OpenMetrics metrics on this port")
+    parser.add_argument("--metrics-bind", default="127.0.0.1", help="address for the metrics endpoint")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="netjitterfix", description="Headless network jitter checker and fixer")
+    profiling = argparse.ArgumentParser(add_help=False)
+    profiling.add_argument("--profile", action="store_true", help="print a per-stage timing summary to stderr")
+    profiling.add_argument("--trace", metavar="PATH", help="write timed spans as Chrome trace-event JSON")
+    output = argparse.ArgumentParser(add_help=False, parents=[profiling])
+    output.add_argument("-f", "--format", default="json", choices=["json", "csv"], help="output format")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", parents=[output], help="measure jitter once")
+    _add_probe_arguments(check, several_targets=True)
+    check.add_argument("--concurrency", type=int, default=32, help="targets probed at once")
+    check.add_argument("--targets-file", help="file with one target per line ('#' starts a comment)")
+    check.add_argument("--workers", type=int, help="spread targets over this many probe processes (0: one per CPU)")
+    check.add_argument("--samples", action="store_true", help="emit individual samples instead of a summary")
+    check.add_argument("--analyze", action="store_true", help="add spike and periodicity analysis to the summary")
+    check.add_argument("--precision", type=float, help="stop early once the jitter and p95 confidence intervals are "
+                                                       "within this fraction of their value (e.g. 0.1); -c is the maximum")
+    check.add_argument("--min-count", type=int, default=20, help="probes sent before an adaptive check may stop")
+    check.add_argument("--tolerance", type=float, default=0.25, help="confidence interval in ms that always counts as converged")
+    check.set_defaults(handler=run_check)
+
+    monitor = commands.add_parser("monitor", parents=[output], help="monitor jitter continuously")
+    _add_probe_arguments(monitor, count=None)
+    monitor.add_argument("-d", "--duration", type=float, help="seconds to run (default: until interrupted)")
+    monitor.add_argument("--capacity", type=int, default=86400, help="samples kept in the ring buffer")
+    monitor.add_argument("--report-every", type=float, default=10.0, help="seconds between window reports")
+    monitor.set_defaults(handler=run_monitor)
+
+    analyze = commands.add_parser("analyze", parents=[output], help="find spikes and periodic lag in a recorded session")
+    analyze.add_argument("session", help="session sample log (.njflog)")
+    analyze.add_argument("-t", "--target", action="append", help="target to analyze (default: all)")
+    analyze.add_argument("--window", type=int, default=31, help="rolling median window in samples")
+    analyze.add_argument("--threshold", type=float, default=3.5, help="spike threshold in robust standard deviations")
+    analyze.set_defaults(handler=run_analyze)
+
+    fix = commands.add_parser("fix", parents=[output], help="apply network fixes")
+    fix.add_argument("fix", nargs="*", help="fix ids to apply")
+    fix.add_argument("--all", action="store_true", help="apply every available fix")
+    fix.add_argument("--list", action="store_true", help="list available fixes")
+    fix.add_argument("--dry-run", action="store_true", help="print the compiled fix plan without applying it")
+    fix.add_argument("--rollback", action="store_true", help="restore the settings saved before the fixes were applied")
+    fix.set_defaults(handler=run_fix)
+
+    bench = commands.add_parser("bench", parents=[output], help="A/B benchmark fixes with significance tests")
+    _add_probe_arguments(bench, count=50)
+    bench.add_argument("fix", nargs="+", help="fix ids to benchmark together")
+    bench.add_argument("--rounds", type=int, default=5, help="measurement rounds with and without the fix")
+    bench.add_argument("--alpha", type=float, default=0.05, help="significance level")
+    bench.set_defaults(handler=run_bench)
+
+    optimize = commands.add_parser("optimize", parents=[output], help="search for the smallest fix set with the lowest jitter")
+    _add_probe_arguments(optimize, count=30)
+    optimize.add_argument("fix", nargs="*", help="candidate fix ids (default: every reversible fix)")
+    optimize.add_argument("--metric", default="jitter", choices=["jitter", "p95", "packet_loss"], help="metric to minimize")
+    optimize.add_argument("--rounds", type=int, default=3, help="runs per candidate before it is dropped or kept")
+    optimize.add_argument("--alpha", type=float, default=0.05, help="significance level")
+    optimize.add_argument("--max-measurements", type=int, help="stop after this many measurement runs")
+    optimize.add_argument("--apply", action="store_true", help="apply the best fix set when done")
+    optimize.set_defaults(handler=run_optimize)
+
+    bufferbloat = commands.add_parser("bufferbloat", parents=[output], help="compare latency on an idle and a loaded link")
+    _add_probe_arguments(bufferbloat, count=100)
+    bufferbloat.add_argument("--phases", default="idle,download,upload,bidirectional",
+                             help="comma separated phases: idle, download, upload, bidirectional")
+    bufferbloat.add_argument("--load-host", help="host running 'netjitterfix sink' (default: the target)")
+    bufferbloat.add_argument("--load-port", type=int, default=7070, help="load sink port")
+    bufferbloat.add_argument("--streams", type=int, default=4, help="parallel TCP streams per direction")
+    bufferbloat.add_argument("--udp-mbps", type=float, default=0.0, help="extra UDP upload load in Mbit/s")
+    bufferbloat.add_argument("--warmup", type=float, default=1.0, help="seconds of load before probing starts")
+    bufferbloat.set_defaults(handler=run_bufferbloat)
+
+    sink = commands.add_parser("sink", parents=[profiling], help="serve TCP and UDP load for bufferbloat tests")
+    sink.add_argument("--bind", default="0.0.0.0", help="address to listen on")
+    sink.add_argument("--port", type=int, default=7070, help="TCP and UDP port to listen on")
+    sink.add_argument("-d", "--duration", type=float, help="seconds to run (default: until interrupted)")
+    sink.set_defaults(handler=run_sink)
+
+    reflect = commands.add_parser("reflect", parents=[output], help="echo UDP probes with server timestamps")
+    reflect.add_argument("--bind", default="0.0.0.0", help="address to listen on")
+    reflect.add_argument("--port", type=int, default=7, help="UDP port to listen on")
+    reflect.add_argument("--rate", type=float, default=1000.0, help="probes per second allowed per client (0: unlimited)")
+    reflect.add_argument("--burst", type=int, default=200, help="probes a client may send back to back")
+    reflect.add_argument("--max-clients", type=int, default=65536, help="clients tracked by the rate limiter")
+    reflect.add_argument("-d", "--duration", type=float, help="seconds to run (default: until interrupted)")
+    reflect.add_argument("--report-every", type=float, default=60.0, help="seconds between statistics reports")
+    reflect.set_defaults(handler=run_reflect)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.profile or args.trace:
+        tracer.enable()
+    try:
+        return args.handler(args)
+    finally:
+        if tracer.enabled:
+            if args.profile:
+                print(tracer.format_summary(), file=sys.stderr)
+            if args.trace:
+                tracer.write_chrome_trace(args.trace)
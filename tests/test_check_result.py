@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+from utils.check_result import CheckResult
+from utils.probe_engine import ProbeResult
+
+INTERVAL_NS = 10_000_000
+
+
+def _records(rtts, duplicates=None, late=()):
+    records = []
+    for seq, rtt in enumerate(rtts):
+        sent_ns = seq * INTERVAL_NS
+        record = ProbeResult(seq, sent_ns, None if rtt is None else sent_ns + int(rtt * 1_000_000))
+        record.duplicates = (duplicates or {}).get(seq, 0)
+        if seq in late:
+            record.late_recv_ns = sent_ns + 5 * INTERVAL_NS
+        records.append(record)
+    return records
+
+
+CASES = [
+    ("in order", _records([10, 12, 11, 13]),
+     dict(sent=4, received=4, lost=0, reordered=0, duplicates=0, late_replies=0, loss_bursts=[])),
+    ("loss bursts", _records([10, None, None, 12, None, 11]),
+     dict(sent=6, received=3, lost=3, reordered=0, duplicates=0, late_replies=0, loss_bursts=[2, 1])),
+    ("trailing loss", _records([10, 11, None, None, None]),
+     dict(sent=5, received=2, lost=3, reordered=0, duplicates=0, late_replies=0, loss_bursts=[3])),
+    ("overtaken by later probes", _records([50, 5, 5, 5]),
+     dict(sent=4, received=4, lost=0, reordered=1, duplicates=0, late_replies=0, loss_bursts=[])),
+    ("two overtaken", _records([35, 35, 5, 5]),
+     dict(sent=4, received=4, lost=0, reordered=2, duplicates=0, late_replies=0, loss_bursts=[])),
+    ("duplicates and a late reply", _records([10, 10, None, 10], duplicates={1: 2}, late={2}),
+     dict(sent=4, received=3, lost=1, reordered=0, duplicates=2, late_replies=1, loss_bursts=[1])),
+    ("nothing answered", _records([None, None]),
+     dict(sent=2, received=0, lost=2, reordered=0, duplicates=0, late_replies=0, loss_bursts=[2])),
+    ("empty", [],
+     dict(sent=0, received=0, lost=0, reordered=0, duplicates=0, late_replies=0, loss_bursts=[])),
+]
+
+
+@pytest.mark.parametrize("name, records, expected", CASES, ids=[case[0] for case in CASES])
+def test_counters(name, records, expected):
+    result = CheckResult("target", records)
+    assert {key: getattr(result, key) for key in expected} == expected
+    assert result.max_loss_burst == max(expected["loss_bursts"], default=0)
+    assert result.loss_percent == (expected["lost"] / expected["sent"] * 100 if expected["sent"] else 0.0)
+
+
+def test_records_are_ordered_by_sequence():
+    records = _records([10, 20, 30])
+    result = CheckResult("target", list(reversed(records)))
+    assert [record.seq for record in result.records] == [0, 1, 2]
+    assert result.ping_times == [10, 20, 30]
+    assert result.time_stamps == [0.0, 0.01, 0.02]
+
+
+def test_statistics_are_computed_lazily_and_cached():
+    result = CheckResult("target", _records([10, None, 14, 12, 20]))
+    assert "jitter" not in result.__dict__
+    assert "ipdv" not in result.__dict__
+
+    assert result.ping_times == [10, 14, 12, 20]
+    assert result.jitter == pytest.approx(math.sqrt(((10 - 14) ** 2 + 0 + (12 - 14) ** 2 + (20 - 14) ** 2) / 4))
+    assert result.ipdv == [4, 2, 8]
+    assert result.ipdv_mean == pytest.approx(14 / 3)
+    assert result.rfc3550_jitter == pytest.approx(((0 + 4 / 16) * 15 / 16 + 2 / 16) * 15 / 16 + 8 / 16)
+    assert (result.min_ping, result.max_ping, result.avg_ping) == (10, 20, 14)
+    assert result.p50 == 13
+    assert result.p95 == pytest.approx(19.1)
+    assert "jitter" in result.__dict__
+
+
+def test_snapshot_of_empty_result_is_zeroed():
+    snapshot = CheckResult("target", []).snapshot()
+    assert snapshot["sent"] == 0
+    assert snapshot["packet_loss"] == 0.0
+    assert snapshot["jitter"] == 0.0
+    assert snapshot["p95"] == 0.0
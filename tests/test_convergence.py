@@ -0,0 +1,62 @@
+import math
+
+import numpy as np
+import pytest
+
+from utils.convergence import ConvergenceTracker
+
+
+def _feed(tracker, rtts):
+    for rtt in rtts:
+        if tracker.done:
+            break
+        tracker.add(rtt)
+    return tracker
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_steady_link_stops_early(seed):
+    rtts = 20 + np.random.default_rng(seed).normal(0, 0.2, 1000)
+    tracker = _feed(ConvergenceTracker(precision=0.1, min_samples=20, max_samples=1000), rtts)
+    assert tracker.converged
+    assert tracker.min_samples <= tracker.sent < 100
+    assert tracker.progress == 100
+    assert tracker.summary()["p95_ci_ms"] <= tracker.tolerance_ms
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_heavy_tailed_link_runs_to_the_maximum(seed):
+    rng = np.random.default_rng(seed)
+    rtts = 20 + rng.pareto(1.5, 1000) * 10
+    tracker = _feed(ConvergenceTracker(precision=0.05, tolerance_ms=0.0, max_samples=200), rtts)
+    assert not tracker.converged
+    assert tracker.done
+    assert tracker.sent == 200
+
+
+def test_never_stops_before_min_samples():
+    tracker = ConvergenceTracker(min_samples=30, max_samples=100)
+    for _ in range(29):
+        tracker.add(20.0)
+        assert not tracker.done
+        assert tracker.progress < 100
+    tracker.add(20.0)
+    assert tracker.converged
+
+
+def test_losses_count_towards_the_budget():
+    tracker = _feed(ConvergenceTracker(min_samples=5, max_samples=10), [None] * 20)
+    assert tracker.sent == 10
+    assert tracker.received == 0
+    assert not tracker.converged
+    assert tracker.jitter_interval() == (0.0, math.inf)
+
+
+def test_jitter_interval_matches_population_stdev():
+    rtts = 20 + np.random.default_rng(0).gamma(2.0, 2.0, 500)
+    tracker = ConvergenceTracker(max_samples=1000)
+    for rtt in rtts:
+        tracker.add(float(rtt))
+    jitter, half_width = tracker.jitter_interval()
+    assert jitter == pytest.approx(np.std(rtts), rel=1e-9)
+    assert 0 < half_width < jitter
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from utils.fix_benchmark import FixBenchmark, SimulatedLink, metric_samples
+from utils.fix_state import FakeStateBackend, FixStateStore
+from utils.jitter_fixer import JitterFixer
+
+
+def _benchmark(effect, seed=0):
+    fixer = JitterFixer(backend=FakeStateBackend(), store=FixStateStore())
+    link = SimulatedLink(samples=100, seed=seed, effects={"disable_nagle": effect}, applied=fixer.get_applied_fixes)
+    try:
+        return FixBenchmark(fixer, link, rounds=5, seed=seed).run(["disable_nagle"]), fixer.get_applied_fixes()
+    finally:
+        fixer.close()
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_jitter_reduction_helps(seed):
+    result, applied = _benchmark({"jitter": 0.7}, seed)
+    assert result.helps
+    assert result.effects["jitter"].improved()
+    assert applied == []
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_no_effect_does_not_help(seed):
+    result, _ = _benchmark({}, seed)
+    assert not result.helps
+    assert not any(effect.improved() or effect.worsened() for effect in result.effects.values())
+
+
+def test_loss_regression_is_flagged():
+    result, _ = _benchmark({"jitter": 0.7, "loss": 4.0})
+    assert result.effects["packet_loss"].worsened()
+    assert not result.helps
+
+
+def test_jitter_samples_are_differenced_within_runs():
+    runs = [[10.0, 11.0, None, 13.0], [100.0, 101.0]]
+    np.testing.assert_array_equal(metric_samples(runs, "jitter"), [1.0, 2.0, 1.0])
+    np.testing.assert_array_equal(metric_samples(runs, "packet_loss"), [0, 0, 1, 0, 0, 0])
+    np.testing.assert_array_equal(metric_samples(runs, "p95"), [10.0, 11.0, 13.0, 100.0, 101.0])
+    assert len(metric_samples([], "jitter")) == 0
@@ -0,0 +1,110 @@
+import threading
+
+from utils.fix_plan import compile_plan, execute_plan
+from utils.fix_state import FakeStateBackend, FixAction, RegistrySetting
+from utils.jitter_fixer import FIX_PROFILES
+
+AUTOTUNING = "netsh:global:autotuninglevel"
+
+
+def _current(fix_ids, **overrides):
+    current = {}
+    for fix_id in fix_ids:
+        for item in FIX_PROFILES[fix_id]:
+            if isinstance(item, FixAction):
+                continue
+            current[item.ident] = None if isinstance(item.value, (int, list)) else "unset"
+    current.update(overrides)
+    return current
+
+
+def _compile(fix_ids, **overrides):
+    return compile_plan(fix_ids, FIX_PROFILES, _current(fix_ids, **overrides))
+
+
+def _step(plan, label):
+    return next(step for step in plan.steps if step.label == label)
+
+
+def test_later_fix_wins_a_conflicting_setting():
+    plan = _compile(["optimize_tcp", "disable_auto_tuning"])
+
+    assert len(plan.conflicts) == 1
+    conflict = plan.conflicts[0]
+    assert (conflict.ident, conflict.winner, conflict.value) == (AUTOTUNING, "disable_auto_tuning", "disabled")
+    assert (conflict.overridden, conflict.overridden_value) == (["optimize_tcp"], "normal")
+
+    step = _step(plan, AUTOTUNING)
+    assert step.fixes == ["disable_auto_tuning"]
+    assert step.value == "disabled"
+    assert AUTOTUNING not in plan.snapshot("optimize_tcp")
+
+
+def test_conflicts_are_resolved_in_profile_order_not_request_order():
+    plan = _compile(["disable_auto_tuning", "optimize_tcp"])
+    assert plan.fixes == ["optimize_tcp", "disable_auto_tuning"]
+    assert _step(plan, AUTOTUNING).value == "disabled"
+
+
+def test_identical_values_are_shared_without_a_conflict():
+    setting = RegistrySetting("HKEY_LOCAL_MACHINE\\Test", "Value", 1)
+    profiles = {"first": [setting], "second": [setting]}
+    plan = compile_plan(["first", "second"], profiles, {setting.ident: 0})
+
+    assert plan.conflicts == []
+    assert len(plan.steps) == 1
+    assert plan.steps[0].fixes == ["first", "second"]
+
+
+def test_actions_run_in_stage_order_after_setting_writes():
+    plan = _compile(["reset_tcp_ip", "reset_winsock", "dns_optimize", "qos_priority"])
+    writes = [step.index for step in plan.steps if step.setting is not None]
+    flush = _step(plan, "ipconfig /flushdns")
+    winsock = _step(plan, "netsh winsock reset")
+    tcp_ip = _step(plan, "netsh int ip reset")
+
+    assert set(writes) <= set(flush.depends_on)
+    assert flush.stage < winsock.stage < tcp_ip.stage
+    assert flush.index in winsock.depends_on
+    assert winsock.index in tcp_ip.depends_on
+
+
+def test_only_if_changed_action_is_dropped_when_nothing_changes():
+    servers = ["1.1.1.1", "8.8.8.8"]
+    plan = _compile(["dns_optimize"], **{"dns:Ethernet": servers, "dns:Wi-Fi": servers})
+    assert plan.steps == []
+    assert sorted(plan.unchanged) == ["dns:Ethernet", "dns:Wi-Fi"]
+
+
+def test_steps_on_the_same_resource_are_chained():
+    plan = _compile(["optimize_tcp"])
+    netsh = [step for step in plan.steps if step.resource == "netsh:tcp"]
+    for previous, step in zip(netsh, netsh[1:]):
+        assert previous.index in step.depends_on
+
+
+def test_execute_plan_honours_dependencies_in_parallel():
+    fix_ids = ["optimize_tcp", "qos_priority", "dns_optimize", "reset_winsock", "reset_tcp_ip"]
+    plan = _compile(fix_ids)
+    backend = FakeStateBackend(delay=0.001)
+    finished = []
+    lock = threading.Lock()
+
+    def on_step(step, success, done, total):
+        with lock:
+            assert all(index in finished for index in step.depends_on)
+            finished.append(step.index)
+
+    results = execute_plan(plan, backend, max_workers=4, on_step=on_step)
+
+    assert sorted(finished) == [step.index for step in plan.steps]
+    assert all(results.values())
+    assert backend.commands.index("netsh int ip reset") == len(backend.commands) - 1
+    assert plan.fix_results(results) == {fix_id: True for fix_id in plan.fixes}
+
+
+def test_failed_step_fails_only_its_fixes():
+    plan = _compile(["disable_nagle", "qos_priority"])
+    failing = FIX_PROFILES["qos_priority"][0].ident
+    results = plan.fix_results(execute_plan(plan, FakeStateBackend(failing=[failing])))
+    assert results == {"disable_nagle": True, "qos_priority": False}
@@ -0,0 +1,162 @@
+import subprocess
+
+from utils.fix_state import (UNKNOWN, UNSUPPORTED, DnsSetting, FakeStateBackend, FixAction, FixStateStore,
+                             RegistrySetting)
+from utils.jitter_fixer import FIX_PROFILES, TCPIP_PARAMETERS, JitterFixer
+
+NAGLE = [setting.ident for setting in FIX_PROFILES["disable_nagle"]]
+AUTOTUNING = FIX_PROFILES["disable_auto_tuning"][0]
+OPTIMIZE_TCP = {setting.name: setting for setting in FIX_PROFILES["optimize_tcp"] if hasattr(setting, "labels")}
+
+
+def _completed(returncode: int, stdout: str = "") -> subprocess.CompletedProcess:
+    return subprocess.CompletedProcess(args="", returncode=returncode, stdout=stdout, stderr="")
+
+
+def _fixer(values=None, path=None, failing=()):
+    backend = FakeStateBackend(values, failing)
+    return JitterFixer(backend=backend, store=FixStateStore(path)), backend
+
+
+def test_registry_parse_distinguishes_missing_from_unreadable():
+    setting = RegistrySetting(TCPIP_PARAMETERS, "DefaultTTL", 64)
+    output = f"\n{TCPIP_PARAMETERS}\n    DefaultTTL    REG_DWORD    0x80\n    SackOpts    REG_DWORD    0x1\n"
+    assert setting.parse(_completed(0, output)) == 128
+    assert setting.parse(_completed(0, output.replace("DefaultTTL", "Other"))) is None
+    assert setting.parse(_completed(1, "ERROR: The system was unable to find the specified registry key")) is None
+    assert setting.parse(_completed(-1)) is UNKNOWN
+
+
+def test_tcp_settings_are_read_from_powershell_property_names():
+    output = "SettingName          : Internet\nAutoTuningLevelLocal : Normal\nCongestionProvider   : CUBIC\n"
+    assert AUTOTUNING.query_command().startswith("powershell")
+    assert AUTOTUNING.parse(_completed(0, output)) == "normal"
+    assert OPTIMIZE_TCP["congestionprovider"].parse(_completed(0, output)) == "cubic"
+    assert OPTIMIZE_TCP["timestamps"].parse(_completed(0, output)) is UNSUPPORTED
+    assert AUTOTUNING.parse(_completed(1, output)) is UNKNOWN
+
+
+def test_legacy_netsh_setting_without_matching_label_is_unknown():
+    output = "Параметры TCP\n----------------\nСостояние быстрого открытия : enabled\n"
+    fastopen = OPTIMIZE_TCP["fastopen"]
+    assert fastopen.optional
+    assert fastopen.parse(_completed(0, output)) is UNKNOWN
+    assert fastopen.parse(_completed(0, "Fast Open                           : disabled\n")) == "disabled"
+
+
+def test_dns_parse_reads_static_servers_from_the_registry_value():
+    setting = DnsSetting("Ethernet", ("1.1.1.1", "8.8.8.8"))
+    assert "'Ethernet'" in setting.query_command()
+    assert setting.parse(_completed(0, "9.9.9.9,149.112.112.112\r\n")) == ["9.9.9.9", "149.112.112.112"]
+    assert setting.parse(_completed(0, "\r\n")) is None
+    assert setting.parse(_completed(0, "absent\r\n")) is UNSUPPORTED
+    assert setting.parse(_completed(1, "")) is UNKNOWN
+    assert "'It''s'" in DnsSetting("It's", ()).query_command()
+
+
+def test_apply_then_rollback_restores_previous_values():
+    original = {NAGLE[0]: 0, NAGLE[1]: 0}
+    fixer, backend = _fixer(original)
+
+    assert fixer.apply_fix("disable_nagle")
+    assert backend.values == {NAGLE[0]: 1, NAGLE[1]: 1}
+    assert fixer.get_applied_fixes() == ["disable_nagle"]
+
+    assert fixer.rollback_fix("disable_nagle")
+    assert backend.values == original
+    assert fixer.get_applied_fixes() == []
+
+
+def test_rollback_deletes_values_that_did_not_exist():
+    fixer, backend = _fixer()
+
+    assert fixer.apply_fix("disable_nagle")
+    assert fixer.store.snapshots["disable_nagle"] == {NAGLE[0]: None, NAGLE[1]: None}
+
+    assert fixer.rollback_fix("disable_nagle")
+    assert backend.values == {}
+    assert sum(command.startswith("reg delete") for command in backend.commands) == 2
+
+
+def test_missing_values_survive_a_reload_of_the_state_file(tmp_path):
+    path = str(tmp_path / "fix_state.json")
+    fixer, backend = _fixer(path=path)
+    assert fixer.apply_fix("disable_nagle")
+
+    reloaded = JitterFixer(backend=backend, store=FixStateStore(path))
+    assert reloaded.get_applied_fixes() == ["disable_nagle"]
+    assert reloaded.rollback_fix("disable_nagle")
+    assert backend.values == {}
+
+
+def test_unreadable_setting_is_never_written():
+    fixer, backend = _fixer({AUTOTUNING.ident: UNKNOWN})
+
+    plan = fixer.plan_fixes(["disable_auto_tuning"])
+    assert plan.skipped == [AUTOTUNING.ident]
+    assert plan.steps == []
+    assert fixer.unreadable_settings(["disable_auto_tuning"]) == [AUTOTUNING.ident]
+
+    assert fixer.apply_fixes(["disable_auto_tuning"]) == {"disable_auto_tuning": False}
+    assert backend.commands == []
+    assert backend.values[AUTOTUNING.ident] is UNKNOWN
+    assert fixer.get_applied_fixes() == []
+    assert fixer.store.snapshots == {}
+
+
+def _optimize_tcp_values(**overrides):
+    values = {}
+    for item in FIX_PROFILES["optimize_tcp"]:
+        if not isinstance(item, FixAction):
+            values[item.ident] = 0 if isinstance(item, RegistrySetting) else "unset"
+    values.update(overrides)
+    return values
+
+
+def test_fix_with_an_unreadable_setting_writes_none_of_its_settings():
+    fixer, backend = _fixer(_optimize_tcp_values(**{AUTOTUNING.ident: UNKNOWN}))
+
+    plan = fixer.plan_fixes(["optimize_tcp"])
+    assert plan.blocked == {"optimize_tcp": [AUTOTUNING.ident]}
+    assert plan.steps == []
+    assert fixer.apply_fixes(["optimize_tcp"]) == {"optimize_tcp": False}
+    assert backend.commands == []
+    assert fixer.get_applied_fixes() == []
+
+
+def test_unreadable_legacy_and_unsupported_settings_do_not_block_a_fix():
+    legacy = OPTIMIZE_TCP["dca"].ident
+    unsupported = OPTIMIZE_TCP["chimney"].ident
+    fixer, backend = _fixer(_optimize_tcp_values(**{legacy: UNKNOWN, unsupported: UNSUPPORTED}))
+
+    plan = fixer.plan_fixes(["optimize_tcp"])
+    assert plan.blocked == {}
+    assert sorted(plan.unsupported) == sorted([legacy, unsupported])
+    assert fixer.apply_fixes(["optimize_tcp"]) == {"optimize_tcp": True}
+    assert legacy not in fixer.store.snapshots["optimize_tcp"]
+    assert backend.values[unsupported] is UNSUPPORTED
+
+    assert fixer.rollback_fix("optimize_tcp")
+    assert backend.values[AUTOTUNING.ident] == "unset"
+
+
+def test_reapplying_a_tuned_setting_writes_nothing():
+    fixer, backend = _fixer({NAGLE[0]: 1, NAGLE[1]: 1})
+
+    plan = fixer.plan_fixes(["disable_nagle"])
+    assert plan.steps == []
+    assert sorted(plan.unchanged) == sorted(NAGLE)
+
+
+def test_failed_rollback_keeps_the_snapshot():
+    fixer, backend = _fixer({NAGLE[0]: 0, NAGLE[1]: 0})
+    assert fixer.apply_fix("disable_nagle")
+
+    backend.failing.add(NAGLE[0])
+    assert not fixer.rollback_fix("disable_nagle")
+    assert fixer.get_applied_fixes() == ["disable_nagle"]
+    assert fixer.store.snapshots["disable_nagle"][NAGLE[0]] == 0
+
+    backend.failing.clear()
+    assert fixer.rollback_fix("disable_nagle")
+    assert backend.values == {NAGLE[0]: 0, NAGLE[1]: 0}
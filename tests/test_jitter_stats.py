@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from utils.check_result import CheckResult
+from utils.jitter_stats import JitterStats, P2Quantile
+from utils.probe_engine import ProbeResult
+
+
+def _rtts(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.gamma(4.0, 5.0, size) + 10
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_moments_match_numpy(seed):
+    rtts = _rtts(10_000, seed)
+    stats = JitterStats()
+    for rtt in rtts:
+        stats.add(float(rtt))
+
+    assert stats.mean == pytest.approx(np.mean(rtts), rel=1e-12)
+    assert stats.variance == pytest.approx(np.var(rtts), rel=1e-9)
+    assert stats.stdev == pytest.approx(np.std(rtts), rel=1e-9)
+    assert (stats.min, stats.max) == (rtts.min(), rtts.max())
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("quantile, tolerance", [(0.50, 0.01), (0.95, 0.02), (0.99, 0.03)])
+def test_p2_quantiles_track_numpy_percentile(seed, quantile, tolerance):
+    rtts = _rtts(10_000, seed)
+    estimator = P2Quantile(quantile)
+    for rtt in rtts:
+        estimator.add(float(rtt))
+
+    assert estimator.value == pytest.approx(np.percentile(rtts, quantile * 100), rel=tolerance)
+
+
+def test_quantiles_before_five_samples_are_exact_ranks():
+    stats = JitterStats()
+    for rtt in [30.0, 10.0, 20.0]:
+        stats.add(rtt)
+    assert (stats.p50, stats.p95, stats.p99) == (20.0, 30.0, 30.0)
+    assert JitterStats().p95 == 0.0
+
+
+def test_losses_and_delay_variation_match_check_result():
+    rtts = [float(rtt) for rtt in _rtts(500)]
+    values = [None if seq % 7 == 3 else rtt for seq, rtt in enumerate(rtts)]
+    stats = JitterStats()
+    for value in values:
+        stats.add(value)
+
+    records = [ProbeResult(seq, seq * 10_000_000, None if value is None else seq * 10_000_000 + int(value * 1e6))
+               for seq, value in enumerate(values)]
+    result = CheckResult("target", records)
+    assert (stats.sent, stats.received, stats.lost) == (result.sent, result.received, result.lost)
+    assert stats.loss_percent == pytest.approx(result.loss_percent)
+    assert stats.rfc3550_jitter == pytest.approx(result.rfc3550_jitter, abs=1e-5)
+    assert stats.ipdv_mean == pytest.approx(result.ipdv_mean, abs=1e-5)
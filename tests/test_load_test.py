@@ -0,0 +1,50 @@
+import pytest
+
+from utils.check_result import CheckResult
+from utils.load_test import BufferbloatResult, build_phases, bufferbloat_grade
+from utils.probe_engine import ProbeResult
+
+
+def _result(rtts):
+    return CheckResult("target", [ProbeResult(seq, seq * 10_000_000, None if rtt is None else seq * 10_000_000 + int(rtt * 1e6))
+                                  for seq, rtt in enumerate(rtts)])
+
+
+@pytest.mark.parametrize("added, grade", [(0, "A+"), (4.9, "A+"), (5, "A"), (59, "B"), (199, "C"), (399, "D"), (400, "F")])
+def test_grades(added, grade):
+    assert bufferbloat_grade(added) == grade
+
+
+def test_loaded_phases_are_graded_against_the_idle_median():
+    result = BufferbloatResult("target", {"idle": _result([20, 21, 22]), "download": _result([60, 61, 62]),
+                                          "upload": _result([22, 23, 24])})
+    assert result.baseline_ms == 21
+    assert (result.added_ms("download"), result.added_ms("upload")) == (40, 2)
+    assert (result.phase_grade("download"), result.phase_grade("upload")) == ("B", "A+")
+    assert result.grade == "B"
+
+
+def test_invalid_phases_are_not_graded():
+    result = BufferbloatResult("target", {"idle": _result([20]), "upload": _result([500])},
+                               invalid={"upload": "no upload throughput"})
+    assert result.phase_grade("upload") == "N/A"
+    assert result.grade == "N/A"
+
+
+@pytest.mark.parametrize("phases", [
+    {"download": _result([300])},
+    {"idle": _result([None, None]), "download": _result([300])},
+], ids=["idle skipped", "idle unanswered"])
+def test_grade_is_unavailable_without_a_baseline(phases):
+    result = BufferbloatResult("target", phases)
+    assert result.baseline_ms is None
+    assert result.added_ms("download") is None
+    assert result.worst_added_ms is None
+    assert result.phase_grade("download") == "N/A"
+    assert result.grade == "N/A"
+    assert [row["grade"] for row in result.rows() if row["phase"] == "download"] == ["N/A"]
+
+
+def test_unknown_phase_is_rejected():
+    with pytest.raises(ValueError):
+        build_phases(["idle", "sideways"])
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from utils.console_encoding import decode_console
+from utils.jitter_checker import parse_ping_bytes
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "data", "ping")
+
+EXPECTED = {
+    "linux_iputils.txt": [14.2, 15.8, 0.412, 103.0],
+    "linux_ru.txt": [14.2, 15.8, 0.412],
+    "macos.txt": [14.215, 15.802, "timeout", 21.377],
+    "windows_de.txt": [14.0, 15.0, "timeout", 1.0, 19.0],
+    "windows_en.txt": [14.0, 15.0, "timeout", 1.0, 103.0],
+    "windows_ru.txt": [14.0, 16.0, "timeout", 1.0, 21.0],
+}
+
+
+def _read_lines(name):
+    with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+        return f.read().splitlines(keepends=True)
+
+
+def test_corpus_is_covered():
+    assert sorted(name for name in os.listdir(CORPUS_DIR) if name.endswith(".txt")) == sorted(EXPECTED)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_parse_ping_corpus(name):
+    parsed = [parse_ping_bytes(line) for line in _read_lines(name)]
+    assert [value for value in parsed if value is not None] == EXPECTED[name]
+
+
+def test_parse_ignores_headers_and_statistics():
+    assert parse_ping_bytes(b"PING 8.8.8.8 (8.8.8.8) 56(84) bytes of data.\n") is None
+    assert parse_ping_bytes(b"rtt min/avg/max/mdev = 0.412/33.353/103.000/40.512 ms\n") is None
+
+
+def test_utf8_output_is_not_decoded_as_oem():
+    line = "64 байт от 8.8.8.8: icmp_seq=1 ttl=117 время=14,2 мс".encode("utf-8")
+    assert decode_console(line).startswith("64 байт")
+    assert parse_ping_bytes(line) == 14.2
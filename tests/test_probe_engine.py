@@ -0,0 +1,127 @@
+import asyncio
+import socket
+
+import pytest
+
+from utils.check_result import CheckResult
+from utils.jitter_checker import JitterChecker
+from utils.metrics_exporter import MetricsRegistry
+from utils.probe_engine import ProbeEngine
+from utils.reflector import Reflector
+
+
+def _closed_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+async def _probe_all(engine: ProbeEngine, count: int):
+    return [await engine.probe(seq) for seq in range(count)]
+
+
+def test_udp_probes_against_reflector():
+    async def run():
+        async with Reflector("127.0.0.1", 0, rate=0) as reflector:
+            port = reflector.address[1]
+            async with ProbeEngine("127.0.0.1", timeout=1.0, mode="udp", udp_port=port) as engine:
+                assert engine.mode == "udp"
+                return await _probe_all(engine, 5), reflector.stats
+
+    records, stats = asyncio.run(run())
+    assert [record.seq for record in records] == list(range(5))
+    assert all(not record.lost and record.reflected for record in records)
+    assert all(record.rtt_ms >= 0 and record.server_ms >= 0 for record in records)
+    assert stats.reflected == 5
+    assert CheckResult("127.0.0.1", records).snapshot()["packet_loss"] == 0.0
+
+
+def test_udp_probe_without_reflector_is_lost():
+    async def run():
+        async with ProbeEngine("127.0.0.1", timeout=0.2, mode="udp", udp_port=_closed_port()) as engine:
+            return await engine.probe(0)
+
+    assert asyncio.run(run()).lost
+
+
+def test_tcp_probe_times_handshake():
+    async def run():
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            async with ProbeEngine("127.0.0.1", timeout=1.0, mode="tcp", tcp_port=port) as engine:
+                return await _probe_all(engine, 3)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    records = asyncio.run(run())
+    assert all(not record.lost and not record.refused for record in records)
+    assert CheckResult("127.0.0.1", records).refused == 0
+
+
+def test_tcp_probe_to_closed_port_counts_as_refused():
+    async def run():
+        async with ProbeEngine("127.0.0.1", timeout=1.0, mode="tcp", tcp_port=_closed_port()) as engine:
+            return await _probe_all(engine, 3)
+
+    records = asyncio.run(run())
+    result = CheckResult("127.0.0.1", records)
+    assert result.received == 3
+    assert result.refused == 3
+
+
+def test_icmp_datagram_probes_loopback():
+    async def run():
+        engine = ProbeEngine("127.0.0.1", timeout=1.0, mode="icmp")
+        try:
+            await engine.open()
+        except OSError as e:
+            pytest.skip(f"unprivileged ICMP sockets are not permitted: {e}")
+        try:
+            return await _probe_all(engine, 3)
+        finally:
+            engine.close()
+
+    records = asyncio.run(run())
+    assert all(not record.lost for record in records)
+
+
+def test_checker_counts_a_raising_probe_as_lost(monkeypatch):
+    original = ProbeEngine.probe
+
+    async def probe(self, seq):
+        if seq == 1:
+            raise OSError("too many open files")
+        return await original(self, seq)
+
+    monkeypatch.setattr(ProbeEngine, "probe", probe)
+    checker = JitterChecker()
+    checker.set_target("127.0.0.1")
+    checker.set_ping_count(4)
+    checker.set_interval(0.01)
+    checker.set_probe_mode("tcp")
+    checker.tcp_port = _closed_port()
+    checker.metrics = MetricsRegistry()
+
+    result = checker.check_jitter()
+    assert [record.seq for record in result.records] == [0, 1, 2, 3]
+    assert result.sent == 4
+    assert result.lost == 1
+    assert checker.metrics._target("127.0.0.1").errors == {"probe": 1}
+
+
+def test_socket_error_does_not_spin_the_reader():
+    class FailingSocket:
+        calls = 0
+
+        def recv(self, size):
+            FailingSocket.calls += 1
+            raise OSError(100, "Network is down")
+
+    engine = ProbeEngine("127.0.0.1", mode="udp")
+    engine._sock = FailingSocket()
+    engine._on_readable()
+    assert FailingSocket.calls == 1
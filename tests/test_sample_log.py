@@ -0,0 +1,52 @@
+import numpy as np
+
+from utils.sample_log import FLAG_LOST, HEADER_SIZE, RECORD_DTYPE, SampleLog, SampleLogWriter
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "session.njflog")
+    with SampleLogWriter(path, targets=["8.8.8.8"], buffer_size=2) as writer:
+        writer.append(1.0, "8.8.8.8", 14.25)
+        writer.append(2.0, "1.1.1.1", None)
+        writer.append(3.0, "8.8.8.8", 15.5)
+
+    with SampleLog(path) as log:
+        assert log.targets == ["8.8.8.8", "1.1.1.1"]
+        assert len(log) == 3
+        assert list(log.records["timestamp"]) == [1.0, 2.0, 3.0]
+        assert list(log.for_target("1.1.1.1")["flags"]) == [FLAG_LOST]
+        np.testing.assert_array_equal(log.rtts_ms("8.8.8.8"), [14.25, 15.5])
+        assert np.isnan(log.rtts_ms("1.1.1.1")).all()
+
+
+def test_reopen_appends_and_adds_targets(tmp_path):
+    path = str(tmp_path / "session.njflog")
+    with SampleLogWriter(path) as writer:
+        writer.append(1.0, "a", 10.0)
+        created = writer.created
+    with SampleLogWriter(path, targets=["b"]) as writer:
+        assert writer.created == created
+        assert writer.targets == ["a", "b"]
+        writer.append(2.0, "a", 11.0)
+        writer.append(3.0, "b", 12.0)
+
+    with SampleLog(path) as log:
+        assert log.created == created
+        np.testing.assert_array_equal(log.rtts_ms("a"), [10.0, 11.0])
+        np.testing.assert_array_equal(log.rtts_ms("b"), [12.0])
+
+
+def test_reopen_drops_partial_trailing_record(tmp_path):
+    path = str(tmp_path / "session.njflog")
+    with SampleLogWriter(path) as writer:
+        writer.append(1.0, "a", 10.0)
+        writer.append(2.0, "a", 11.0)
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_SIZE + RECORD_DTYPE.itemsize + 5)
+
+    with SampleLogWriter(path) as writer:
+        writer.append(3.0, "a", 12.0)
+
+    with SampleLog(path) as log:
+        assert list(log.records["timestamp"]) == [1.0, 3.0]
+        np.testing.assert_array_equal(log.rtts_ms("a"), [10.0, 12.0])
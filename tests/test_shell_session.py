@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import console_encoding
+from utils.console_encoding import decode_console
+from utils.shell_session import ShellSession, ShellSessionPool
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="exercises the /bin/sh framing")
+
+
+@pytest.fixture
+def session():
+    with ShellSession(default_timeout=5.0) as session:
+        yield session
+
+
+def test_output_and_exit_codes_are_framed(session):
+    result = session.run("echo hello")
+    assert (result.returncode, result.stdout, result.stderr) == (0, "hello\n", "")
+    assert session.run("false").returncode == 1
+    assert session.run("status() { return 3; }; status").returncode == 3
+    assert session.spawn_count == 1
+    assert session.commands_run == 3
+
+
+def test_stderr_is_collected_separately(session):
+    result = session.run("echo out; echo err >&2")
+    assert result.stdout == "out\n"
+    assert result.stderr == "err\n"
+
+
+def test_output_without_trailing_newline(session):
+    assert session.run("printf abc").stdout == "abc"
+    assert session.run("printf 'one\\ntwo'").stdout == "one\ntwo"
+    assert session.run("true").stdout == ""
+
+
+def test_commands_do_not_read_the_session_stdin(session):
+    assert session.run("cat").stdout == ""
+    assert session.run("echo still alive").stdout == "still alive\n"
+
+
+def test_timeout_kills_and_respawns_the_shell(session):
+    result = session.run("sleep 5", timeout=0.2)
+    assert result.returncode == -1
+    assert "timed out" in result.stderr
+    assert not session.running
+
+    assert session.run("echo back").stdout == "back\n"
+    assert session.spawn_count == 2
+
+
+def test_exiting_shell_is_reported_and_respawned(session):
+    result = session.run("exit 4")
+    assert result.returncode == -1
+    assert session.run("echo again").stdout == "again\n"
+    assert session.spawn_count == 2
+
+
+def test_pool_runs_commands_concurrently():
+    pool = ShellSessionPool(size=3, default_timeout=5.0)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            outputs = list(executor.map(lambda index: pool.run(f"echo {index}").stdout, range(9)))
+        assert outputs == [f"{index}\n" for index in range(9)]
+        assert 1 <= pool.spawn_count <= 3
+    finally:
+        pool.close()
+
+
+def test_decode_prefers_strict_utf8_then_oem(monkeypatch):
+    monkeypatch.setattr(console_encoding, "_console_encodings", ["utf-8", "cp866"])
+    assert decode_console("Превышен интервал".encode("utf-8")) == "Превышен интервал"
+    assert decode_console("Превышен интервал".encode("cp866")) == "Превышен интервал"
+
+
+def test_decode_replaces_bytes_no_encoding_accepts(monkeypatch):
+    monkeypatch.setattr(console_encoding, "_console_encodings", ["utf-8"])
+    assert decode_console(b"ok\xff") == "ok�"
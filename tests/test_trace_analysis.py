@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from utils.trace_analysis import analyze_trace, rolling_median
+
+
+def _noise(size, seed=0):
+    return 20 + np.random.default_rng(seed).normal(0, 0.5, size)
+
+
+def test_rolling_median_follows_a_level_shift():
+    values = np.r_[np.full(50, 10.0), np.full(50, 30.0)]
+    values[[10, 70]] = 100.0
+    medians = rolling_median(values, 7)
+    assert medians[10] == 10.0 and medians[70] == 30.0
+    np.testing.assert_array_equal(medians[:45], 10.0)
+    np.testing.assert_array_equal(medians[55:], 30.0)
+    np.testing.assert_array_equal(rolling_median(np.array([3.0, 1.0, 2.0]), 31), [2.0, 2.0, 2.0])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_spikes_are_found_against_the_rolling_baseline(seed):
+    rtts = _noise(2000, seed)
+    rtts[1000:] += 15
+    spikes = np.sort(np.random.default_rng(seed).choice(2000, 12, replace=False))
+    rtts[spikes] += 30
+
+    analysis = analyze_trace(rtts, interval_s=0.01, threshold=5.0)
+    np.testing.assert_array_equal(analysis.spike_indices, spikes)
+    assert analysis.mad_ms == pytest.approx(0.5, rel=0.25)
+
+
+def test_lost_samples_are_never_spikes():
+    rtts = list(_noise(300))
+    rtts[100] = None
+    rtts[200] += 40
+    analysis = analyze_trace(rtts, interval_s=1.0)
+    assert list(analysis.spike_indices) == [200]
+    assert analysis.samples == 300
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_periodic_lag_is_detected(seed):
+    rtts = _noise(3000, seed)
+    for start in range(0, 3000, 50):
+        rtts[start:start + 3] += 25
+
+    analysis = analyze_trace(rtts, interval_s=0.1)
+    assert analysis.periodic
+    assert analysis.periodicity.period_s == pytest.approx(5.0)
+    harmonic = analysis.periodicity.spectral_peak_hz * analysis.periodicity.period_s
+    assert harmonic == pytest.approx(round(harmonic)) and harmonic >= 1
+    assert analysis.periodicity.repetitions == 60
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_noise_is_not_periodic(seed):
+    assert not analyze_trace(_noise(3000, seed), interval_s=0.1).periodic
+
+
+def test_trace_without_replies():
+    analysis = analyze_trace([None, None, None])
+    assert analysis.spike_count == 0
+    assert analysis.periodicity is None
+    assert analysis.summary()["samples"] == 3
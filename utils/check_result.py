@@ -0,0 +1,229 @@
+import math
+from functools import cached_property
+from typing import Dict, Iterator, List, Sequence, Union, TYPE_CHECKING
+
+from utils.probe_engine import ProbeResult
+
+if TYPE_CHECKING:
+    from utils.trace_analysis import TraceAnalysis
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def stdev(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+
+
+class CheckResult:
+    def __init__(self, target: str, records: Sequence[ProbeResult], cancelled: bool = False):
+        self.target = target
+        self.records: List[ProbeResult] = sorted(records, key=lambda record: record.seq)
+        self.cancelled = cancelled
+
+    def __iter__(self) -> Iterator[Union[float, List[float]]]:
+        return iter((self.jitter, self.ping_times, self.time_stamps))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def sent(self) -> int:
+        return len(self.records)
+
+    @cached_property
+    def received_records(self) -> List[ProbeResult]:
+        return [record for record in self.records if not record.lost]
+
+    @property
+    def received(self) -> int:
+        return len(self.received_records)
+
+    @property
+    def lost(self) -> int:
+        return self.sent - self.received
+
+    @property
+    def loss_percent(self) -> float:
+        return self.lost / self.sent * 100 if self.sent else 0.0
+
+    @cached_property
+    def refused(self) -> int:
+        return sum(1 for record in self.records if record.refused)
+
+    @cached_property
+    def duplicates(self) -> int:
+        return sum(record.duplicates for record in self.records)
+
+    @cached_property
+    def late_replies(self) -> int:
+        return sum(1 for record in self.records if record.late_recv_ns is not None)
+
+    @cached_property
+    def reordered(self) -> int:
+        count = 0
+        highest = -1
+        for record in sorted(self.received_records, key=lambda record: record.recv_ns):
+            if record.seq < highest:
+                count += 1
+            else:
+                highest = record.seq
+        return count
+
+    @cached_property
+    def loss_bursts(self) -> List[int]:
+        bursts = []
+        run = 0
+        for record in self.records:
+            if record.lost:
+                run += 1
+            elif run:
+                bursts.append(run)
+                run = 0
+        if run:
+            bursts.append(run)
+        return bursts
+
+    @property
+    def max_loss_burst(self) -> int:
+        return max(self.loss_bursts, default=0)
+
+    @cached_property
+    def ping_times(self) -> List[float]:
+        return [record.rtt_ms for record in self.received_records]
+
+    @cached_property
+    def time_stamps(self) -> List[float]:
+        if not self.records:
+            return []
+        start_ns = min(record.sent_ns for record in self.records)
+        return [(record.sent_ns - start_ns) / 1e9 for record in self.received_records]
+
+    @cached_property
+    def sorted_ping_times(self) -> List[float]:
+        return sorted(self.ping_times)
+
+    @cached_property
+    def ipdv(self) -> List[float]:
+        ping_times = self.ping_times
+        return [abs(ping_times[i] - ping_times[i - 1]) for i in range(1, len(ping_times))]
+
+    @cached_property
+    def avg_ping(self) -> float:
+        return sum(self.ping_times) / len(self.ping_times) if self.ping_times else 0.0
+
+    @cached_property
+    def jitter(self) -> float:
+        return stdev(self.ping_times)
+
+    @cached_property
+    def rfc3550_jitter(self) -> float:
+        jitter = 0.0
+        for ipdv in self.ipdv:
+            jitter += (ipdv - jitter) / 16
+        return jitter
+
+    @property
+    def ipdv_mean(self) -> float:
+        return sum(self.ipdv) / len(self.ipdv) if self.ipdv else 0.0
+
+    @cached_property
+    def reflected_records(self) -> List[ProbeResult]:
+        return [record for record in self.received_records if record.reflected]
+
+    @cached_property
+    def forward_jitter(self) -> float:
+        return stdev([record.forward_ms for record in self.reflected_records])
+
+    @cached_property
+    def reverse_jitter(self) -> float:
+        return stdev([record.reverse_ms for record in self.reflected_records])
+
+    @cached_property
+    def server_ms(self) -> float:
+        records = self.reflected_records
+        return sum(record.server_ms for record in records) / len(records) if records else 0.0
+
+    @cached_property
+    def send_lags(self) -> List[float]:
+        return sorted(record.send_lag_ms for record in self.records if record.scheduled_ns is not None)
+
+    @property
+    def send_lag_ms(self) -> float:
+        return sum(self.send_lags) / len(self.send_lags) if self.send_lags else 0.0
+
+    @property
+    def send_lag_p99_ms(self) -> float:
+        return percentile(self.send_lags, 99)
+
+    @property
+    def send_lag_max_ms(self) -> float:
+        return self.send_lags[-1] if self.send_lags else 0.0
+
+    @property
+    def min_ping(self) -> float:
+        return self.sorted_ping_times[0] if self.ping_times else 0.0
+
+    @property
+    def max_ping(self) -> float:
+        return self.sorted_ping_times[-1] if self.ping_times else 0.0
+
+    def percentile(self, q: float) -> float:
+        return percentile(self.sorted_ping_times, q)
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    @cached_property
+    def analysis(self) -> "TraceAnalysis":
+        from utils.trace_analysis import analyze_trace
+
+        return analyze_trace([record.rtt_ms for record in self.records],
+                             timestamps=[record.sent_ns / 1e9 for record in self.records])
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.lost,
+            "refused": self.refused,
+            "packet_loss": self.loss_percent,
+            "jitter": self.jitter,
+            "rfc3550_jitter": self.rfc3550_jitter,
+            "ipdv_mean": self.ipdv_mean,
+            "min_ping": self.min_ping,
+            "max_ping": self.max_ping,
+            "avg_ping": self.avg_ping,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99,
+            "duplicates": self.duplicates,
+            "late_replies": self.late_replies,
+            "reordered": self.reordered,
+            "loss_bursts": len(self.loss_bursts),
+            "max_loss_burst": self.max_loss_burst,
+            "forward_jitter": self.forward_jitter,
+            "reverse_jitter": self.reverse_jitter,
+            "server_ms": self.server_ms,
+            "send_lag_ms": self.send_lag_ms,
+            "send_lag_p99_ms": self.send_lag_p99_ms,
+            "send_lag_max_ms": self.send_lag_max_ms
+        }
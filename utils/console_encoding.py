@@ -0,0 +1,40 @@
+import codecs
+import locale
+import os
+from typing import List
+
+
+FALLBACK_ENCODINGS = ['cp866', 'cp850', 'cp1251', 'cp1252']
+_console_encodings: List[str] = []
+
+
+def oem_encoding() -> str:
+    if os.name == "nt":
+        try:
+            import ctypes
+            return f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+        except (AttributeError, OSError):
+            pass
+    return locale.getpreferredencoding(False)
+
+
+def console_encodings() -> List[str]:
+    if not _console_encodings:
+        names = ['utf-8', oem_encoding()] + FALLBACK_ENCODINGS
+        for name in names:
+            try:
+                name = codecs.lookup(name).name
+            except LookupError:
+                continue
+            if name != 'ascii' and name not in _console_encodings:
+                _console_encodings.append(name)
+    return _console_encodings
+
+
+def decode_console(data: bytes) -> str:
+    for encoding in console_encodings():
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('utf-8', errors='replace')
@@ -0,0 +1,103 @@
+import math
+from bisect import insort
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from utils.check_result import percentile
+
+
+class ConvergenceTracker:
+    def __init__(self, precision: float = 0.1, tolerance_ms: float = 0.25, min_samples: int = 20,
+                 max_samples: int = 100, confidence: float = 0.95, quantile: float = 0.95):
+        self.precision = precision
+        self.tolerance_ms = tolerance_ms
+        self.min_samples = min_samples
+        self.max_samples = max(min_samples, max_samples)
+        self.quantile = quantile
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.sent = 0
+        self._sorted: List[float] = []
+        self._shift: Optional[float] = None
+        self._sums = [0.0, 0.0, 0.0, 0.0]
+        self._streak = 0
+
+    def add(self, rtt_ms: Optional[float]) -> None:
+        self.sent += 1
+        if rtt_ms is not None:
+            self._record(rtt_ms)
+        self._streak = self._streak + 1 if self._within_precision() else 0
+
+    def _record(self, rtt_ms: float) -> None:
+        insort(self._sorted, rtt_ms)
+        if self._shift is None:
+            self._shift = rtt_ms
+        d = rtt_ms - self._shift
+        self._sums[0] += d
+        self._sums[1] += d * d
+        self._sums[2] += d * d * d
+        self._sums[3] += d * d * d * d
+
+    @property
+    def received(self) -> int:
+        return len(self._sorted)
+
+    def jitter_interval(self) -> Tuple[float, float]:
+        n = self.received
+        if n < 2:
+            return 0.0, math.inf
+        s1, s2, s3, s4 = (total / n for total in self._sums)
+        m2 = max(0.0, s2 - s1 * s1)
+        m4 = max(0.0, s4 - 4 * s1 * s3 + 6 * s1 * s1 * s2 - 3 * s1 ** 4)
+        jitter = math.sqrt(m2)
+        if jitter == 0:
+            return 0.0, 0.0
+        variance_error = math.sqrt(max(0.0, m4 - m2 * m2) / n)
+        return jitter, self.z * variance_error / (2 * jitter)
+
+    def p95_interval(self) -> Tuple[float, float]:
+        ordered = self._sorted
+        n = len(ordered)
+        if n < 2:
+            return 0.0, math.inf
+        q = self.quantile
+        position = (n - 1) * q
+        spread = max(1, int(math.sqrt(n)))
+        lower = max(0, math.floor(position) - spread)
+        upper = min(n - 1, math.ceil(position) + spread)
+        slope = (ordered[upper] - ordered[lower]) * (n - 1) / (upper - lower)
+        return percentile(ordered, q * 100), self.z * math.sqrt(q * (1 - q) / n) * slope
+
+    def _allowed(self, estimate: float) -> float:
+        return max(self.precision * estimate, self.tolerance_ms)
+
+    def _within_precision(self) -> bool:
+        if self.received < 2:
+            return False
+        return all(half_width <= self._allowed(estimate)
+                   for estimate, half_width in (self.jitter_interval(), self.p95_interval()))
+
+    @property
+    def converged(self) -> bool:
+        return self.sent >= self.min_samples and self._streak >= self.min_samples // 2
+
+    @property
+    def done(self) -> bool:
+        return self.sent >= self.max_samples or self.converged
+
+    @property
+    def progress(self) -> int:
+        if self.done:
+            return 100
+        closeness = 1.0
+        for estimate, half_width in (self.jitter_interval(), self.p95_interval()):
+            if half_width > 0:
+                closeness = min(closeness, (self._allowed(estimate) / half_width) ** 2)
+        fraction = max(self.sent / self.max_samples, min(self.sent / self.min_samples, closeness))
+        return min(99, int(fraction * 100))
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "converged": self.converged,
+            "jitter_ci_ms": self.jitter_interval()[1],
+            "p95_ci_ms": self.p95_interval()[1]
+        }
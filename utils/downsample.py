@@ -0,0 +1,41 @@
+import numpy as np
+from typing import Tuple
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    length = len(x)
+
+    if threshold >= length or threshold < 3:
+        return x, y
+
+    bucket_size = (length - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * bucket_size).astype(np.int64) + 1
+    edges[-1] = length - 1
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+
+    selected = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else length
+        next_start = end
+
+        if next_start < next_end:
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        point_x, point_y = x[selected], y[selected]
+        areas = np.abs(
+            (point_x - avg_x) * (y[start:end] - point_y)
+            - (point_x - x[start:end]) * (avg_y - point_y)
+        )
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+
+    return x[indices], y[indices]
@@ -0,0 +1,241 @@
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.fix_state import FixAction
+from utils.jitter_fixer import FIX_PROFILES, JitterFixer
+
+
+METRICS = ("jitter", "p95", "packet_loss")
+
+Measurement = Callable[[], List[Optional[float]]]
+
+
+def checker_measurement(checker, target: Optional[str] = None) -> Measurement:
+    def measure() -> List[Optional[float]]:
+        return [sample.rtt_ms for sample in checker.iter_samples(target)]
+    return measure
+
+
+class SimulatedLink:
+    def __init__(self, base_rtt: float = 20.0, jitter: float = 4.0, loss: float = 0.01, samples: int = 100,
+                 seed: int = 0, effects: Optional[Dict[str, Dict[str, float]]] = None,
+                 applied: Optional[Callable[[], List[str]]] = None):
+        self.base_rtt = base_rtt
+        self.jitter = jitter
+        self.loss = loss
+        self.samples = samples
+        self.effects = effects or {}
+        self.applied = applied or (lambda: [])
+        self.runs = 0
+        self._rng = np.random.default_rng(seed)
+
+    def __call__(self) -> List[Optional[float]]:
+        rtt_scale = jitter_scale = loss_scale = 1.0
+        for fix_id in self.applied():
+            effect = self.effects.get(fix_id, {})
+            rtt_scale *= effect.get("rtt", 1.0)
+            jitter_scale *= effect.get("jitter", 1.0)
+            loss_scale *= effect.get("loss", 1.0)
+
+        self.runs += 1
+        rtts = self.base_rtt * rtt_scale + self._rng.gamma(2.0, self.jitter * jitter_scale / math.sqrt(2), self.samples)
+        lost = self._rng.random(self.samples) < min(1.0, self.loss * loss_scale)
+        return [None if is_lost else float(rtt) for rtt, is_lost in zip(rtts, lost)]
+
+
+def _split(samples: Sequence[Optional[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    lost = np.array([rtt is None for rtt in samples], dtype=bool)
+    rtts = np.array([rtt for rtt in samples if rtt is not None], dtype=np.float64)
+    return rtts, lost
+
+
+def run_metrics(samples: Sequence[Optional[float]]) -> Dict[str, float]:
+    rtts, lost = _split(samples)
+    return {
+        "jitter": float(np.std(rtts)) if len(rtts) > 1 else 0.0,
+        "p95": float(np.percentile(rtts, 95)) if len(rtts) else 0.0,
+        "packet_loss": float(lost.mean() * 100) if len(lost) else 0.0
+    }
+
+
+def _rankdata(values: np.ndarray) -> np.ndarray:
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return (sums / counts)[inverse]
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 0.0, 1.0
+
+    ranks = _rankdata(np.concatenate([a, b]))
+    u1 = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    _, counts = np.unique(np.concatenate([a, b]), return_counts=True)
+    tie_term = (counts ** 3 - counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return float(u1), 1.0
+
+    z = (abs(u1 - n1 * n2 / 2) - 0.5) / sigma
+    return float(u1), float(min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2))))
+
+
+def bootstrap_ci(baseline: Sequence[Optional[float]], treatment: Sequence[Optional[float]], metric: str,
+                 iterations: int = 2000, confidence: float = 0.95, seed: int = 0) -> Tuple[float, float]:
+    rng = np.random.default_rng(seed)
+
+    def resampled(rtts: np.ndarray, lost: np.ndarray) -> np.ndarray:
+        if metric == "packet_loss":
+            if not len(lost):
+                return np.zeros(iterations)
+            return lost[rng.integers(0, len(lost), (iterations, len(lost)))].mean(axis=1) * 100
+        if len(rtts) < 2:
+            return np.zeros(iterations)
+        draws = rtts[rng.integers(0, len(rtts), (iterations, len(rtts)))]
+        if metric == "jitter":
+            return draws.std(axis=1)
+        return np.percentile(draws, 95, axis=1)
+
+    deltas = resampled(*_split(treatment)) - resampled(*_split(baseline))
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(deltas, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def _pooled(runs: Sequence[Sequence[Optional[float]]]) -> List[Optional[float]]:
+    return [rtt for run in runs for rtt in run]
+
+
+def metric_samples(runs: Sequence[Sequence[Optional[float]]], metric: str) -> np.ndarray:
+    if metric == "jitter":
+        # Differences are taken within each run so that the jump between the last
+        # sample of one run and the first of the next never counts as delay variation.
+        diffs = [np.abs(np.diff(_split(run)[0])) for run in runs]
+        return np.concatenate(diffs) if diffs else np.empty(0)
+    rtts, lost = _split(_pooled(runs))
+    if metric == "packet_loss":
+        return lost.astype(np.float64)
+    return rtts
+
+
+@dataclass
+class MetricEffect:
+    baseline: float
+    treatment: float
+    delta: float
+    ci_low: float
+    ci_high: float
+    p_value: float
+
+    @property
+    def relative(self) -> float:
+        return self.delta / self.baseline * 100 if self.baseline else 0.0
+
+    def improved(self, alpha: float = 0.05) -> bool:
+        return self.ci_high < 0 and self.p_value < alpha
+
+    def worsened(self, alpha: float = 0.05) -> bool:
+        return self.ci_low > 0 and self.p_value < alpha
+
+
+@dataclass
+class FixBenchmarkResult:
+    fixes: List[str]
+    rounds: int
+    alpha: float
+    effects: Dict[str, MetricEffect] = field(default_factory=dict)
+    baseline_runs: List[Dict[str, float]] = field(default_factory=list)
+    treatment_runs: List[Dict[str, float]] = field(default_factory=list)
+
+    @property
+    def helps(self) -> bool:
+        return self.effects["jitter"].improved(self.alpha) and \
+            not any(effect.worsened(self.alpha) for effect in self.effects.values())
+
+    def rows(self) -> List[Dict]:
+        return [{
+            "metric": metric,
+            "baseline": round(effect.baseline, 3),
+            "treatment": round(effect.treatment, 3),
+            "delta": round(effect.delta, 3),
+            "relative": round(effect.relative, 2),
+            "ci_low": round(effect.ci_low, 3),
+            "ci_high": round(effect.ci_high, 3),
+            "p_value": round(effect.p_value, 5),
+            "significant": effect.improved(self.alpha) or effect.worsened(self.alpha)
+        } for metric, effect in self.effects.items()]
+
+
+class FixBenchmark:
+    def __init__(self, fixer: JitterFixer, measure: Measurement, rounds: int = 5, alpha: float = 0.05,
+                 bootstrap_iterations: int = 2000, seed: int = 0):
+        self.fixer = fixer
+        self.measure = measure
+        self.rounds = max(1, rounds)
+        self.alpha = alpha
+        self.bootstrap_iterations = bootstrap_iterations
+        self.seed = seed
+
+    @staticmethod
+    def is_reversible(fix_id: str) -> bool:
+        items = FIX_PROFILES.get(fix_id, [])
+        settings = [item for item in items if not isinstance(item, FixAction)]
+        return bool(settings) and all(item.only_if_changed for item in items if isinstance(item, FixAction))
+
+    def _set_applied(self, fix_ids: List[str], applied: bool) -> None:
+        if applied:
+            results = self.fixer.apply_fixes(fix_ids)
+        else:
+            results = {fix_id: self.fixer.rollback_fix(fix_id) if fix_id in self.fixer.get_applied_fixes() else True
+                       for fix_id in reversed(fix_ids)}
+        failed = [fix_id for fix_id, success in results.items() if not success]
+        if failed:
+            raise RuntimeError(f"Could not {'apply' if applied else 'revert'} fixes: {', '.join(failed)}")
+
+    def run(self, fix_ids: List[str], on_run: Optional[Callable[[int, bool, Dict[str, float]], None]] = None) -> FixBenchmarkResult:
+        irreversible = [fix_id for fix_id in fix_ids if not self.is_reversible(fix_id)]
+        if irreversible:
+            raise ValueError(f"Fixes cannot be reverted for A/B runs: {', '.join(irreversible)}")
+        unreadable = self.fixer.unreadable_settings(fix_ids)
+        if unreadable:
+            raise ValueError(f"Current values unknown, so the baseline arm could not be restored: {', '.join(unreadable)}")
+
+        initially_applied = [fix_id for fix_id in fix_ids if fix_id in self.fixer.get_applied_fixes()]
+        samples = {False: [], True: []}
+        runs = {False: [], True: []}
+
+        try:
+            for round_index in range(self.rounds):
+                order = (False, True) if round_index % 2 == 0 else (True, False)
+                for applied in order:
+                    self._set_applied(fix_ids, applied)
+                    run = self.measure()
+                    metrics = run_metrics(run)
+                    samples[applied].append(run)
+                    runs[applied].append(metrics)
+                    if on_run:
+                        on_run(round_index, applied, metrics)
+        finally:
+            self._set_applied([fix_id for fix_id in fix_ids if fix_id not in initially_applied], False)
+            if initially_applied:
+                self._set_applied(initially_applied, True)
+
+        result = FixBenchmarkResult(list(fix_ids), self.rounds, self.alpha,
+                                    baseline_runs=runs[False], treatment_runs=runs[True])
+        for metric in METRICS:
+            baseline = float(np.mean([run[metric] for run in runs[False]]))
+            treatment = float(np.mean([run[metric] for run in runs[True]]))
+            low, high = bootstrap_ci(_pooled(samples[False]), _pooled(samples[True]), metric, self.bootstrap_iterations,
+                                     1 - self.alpha, self.seed)
+            _, p_value = mann_whitney_u(metric_samples(samples[False], metric), metric_samples(samples[True], metric))
+            result.effects[metric] = MetricEffect(baseline, treatment, treatment - baseline, low, high, p_value)
+        return result
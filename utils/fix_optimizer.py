@@ -0,0 +1,148 @@
+import sys
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional
+
+from utils.fix_benchmark import FixBenchmark, Measurement, mann_whitney_u, metric_samples, run_metrics
+from utils.jitter_fixer import JitterFixer
+
+
+class MeasurementBudgetExceeded(Exception):
+    pass
+
+
+@dataclass
+class Evaluation:
+    fixes: FrozenSet[str]
+    runs: List[Dict[str, float]] = field(default_factory=list)
+    samples: List[List[Optional[float]]] = field(default_factory=list)
+
+    def score(self, metric: str = "jitter") -> float:
+        return float(np.mean([run[metric] for run in self.runs])) if self.runs else float("inf")
+
+
+@dataclass
+class OptimizerResult:
+    best: List[str]
+    score: float
+    baseline_score: float
+    metric: str
+    measurements: int
+    measurement_seconds: float
+    evaluations: List[Evaluation] = field(default_factory=list)
+    budget_exhausted: bool = False
+    excluded: List[str] = field(default_factory=list)
+    restored: bool = True
+
+    def rows(self) -> List[Dict]:
+        return [{
+            "fixes": " ".join(sorted(evaluation.fixes)) or "(none)",
+            "runs": len(evaluation.runs),
+            self.metric: round(evaluation.score(self.metric), 3),
+            "best": evaluation.fixes == frozenset(self.best)
+        } for evaluation in sorted(self.evaluations, key=lambda evaluation: evaluation.score(self.metric))]
+
+
+class FixOptimizer:
+    def __init__(self, fixer: JitterFixer, measure: Measurement, candidates: Optional[List[str]] = None,
+                 metric: str = "jitter", race_rounds: int = 3, alpha: float = 0.05,
+                 max_measurements: Optional[int] = None):
+        available = candidates if candidates is not None else list(fixer.get_available_fixes())
+        self.fixer = fixer
+        self.measure = measure
+        self.candidates = [fix_id for fix_id in available if FixBenchmark.is_reversible(fix_id)]
+        self.metric = metric
+        self.race_rounds = max(1, race_rounds)
+        self.alpha = alpha
+        self.max_measurements = max_measurements
+        self.measurements = 0
+        self.measurement_seconds = 0.0
+        self.cache: Dict[FrozenSet[str], Evaluation] = {}
+
+    def _set_configuration(self, fixes: FrozenSet[str]) -> None:
+        applied = set(self.fixer.get_applied_fixes())
+        for fix_id in self.candidates:
+            if fix_id in applied and fix_id not in fixes and not self.fixer.rollback_fix(fix_id):
+                raise RuntimeError(f"Could not revert fix: {fix_id}")
+        missing = [fix_id for fix_id in self.candidates if fix_id in fixes and fix_id not in applied]
+        if missing:
+            failed = [fix_id for fix_id, success in self.fixer.apply_fixes(missing).items() if not success]
+            if failed:
+                raise RuntimeError(f"Could not apply fixes: {', '.join(failed)}")
+
+    def evaluate(self, fixes: FrozenSet[str], runs: int = 1) -> Evaluation:
+        evaluation = self.cache.setdefault(fixes, Evaluation(fixes))
+        while len(evaluation.runs) < runs:
+            if self.max_measurements is not None and self.measurements >= self.max_measurements:
+                raise MeasurementBudgetExceeded()
+            self._set_configuration(fixes)
+            start = time.monotonic()
+            samples = self.measure()
+            self.measurement_seconds += time.monotonic() - start
+            self.measurements += 1
+            evaluation.runs.append(run_metrics(samples))
+            evaluation.samples.append(samples)
+        return evaluation
+
+    def clearly_better(self, a: Evaluation, b: Evaluation) -> bool:
+        if a.score(self.metric) >= b.score(self.metric):
+            return False
+        _, p_value = mann_whitney_u(metric_samples(a.samples, self.metric), metric_samples(b.samples, self.metric))
+        return p_value < self.alpha
+
+    def race(self, configurations: List[FrozenSet[str]]) -> Evaluation:
+        alive = list(dict.fromkeys(configurations))
+        leader = None
+        for round_index in range(1, self.race_rounds + 1):
+            evaluations = [self.evaluate(fixes, round_index) for fixes in alive]
+            leader = min(evaluations, key=lambda evaluation: evaluation.score(self.metric))
+            alive = [evaluation.fixes for evaluation in evaluations
+                     if evaluation is leader or not self.clearly_better(leader, evaluation)]
+            if len(alive) == 1:
+                break
+        return leader
+
+    def optimize(self, on_step: Optional[Callable[[List[str], float], None]] = None) -> OptimizerResult:
+        excluded = [fix_id for fix_id in self.candidates if self.fixer.unreadable_settings([fix_id])]
+        self.candidates = [fix_id for fix_id in self.candidates if fix_id not in excluded]
+        initial = frozenset(fix_id for fix_id in self.fixer.get_applied_fixes() if fix_id in self.candidates)
+        current = frozenset()
+        exhausted = False
+        restored = True
+
+        try:
+            self.evaluate(current, self.race_rounds)
+            remaining = set(self.candidates)
+            while remaining:
+                options = [current | {fix_id} for fix_id in sorted(remaining)]
+                leader = self.race([current] + options)
+                if leader.fixes == current or not self.clearly_better(leader, self.evaluate(current, self.race_rounds)):
+                    break
+                self.evaluate(leader.fixes, self.race_rounds)
+                remaining -= leader.fixes
+                current = leader.fixes
+                if on_step:
+                    on_step(sorted(current), self.cache[current].score(self.metric))
+        except MeasurementBudgetExceeded:
+            exhausted = True
+        finally:
+            try:
+                self._set_configuration(initial)
+            except RuntimeError as e:
+                restored = False
+                print(f"Error restoring the initial fixes: {e}", file=sys.stderr)
+
+        baseline = self.cache.get(frozenset(), Evaluation(frozenset()))
+        return OptimizerResult(
+            best=sorted(current),
+            score=self.cache[current].score(self.metric),
+            baseline_score=baseline.score(self.metric),
+            metric=self.metric,
+            measurements=self.measurements,
+            measurement_seconds=self.measurement_seconds,
+            evaluations=list(self.cache.values()),
+            budget_exhausted=exhausted,
+            excluded=excluded,
+            restored=restored
+        )
@@ -0,0 +1,201 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.fix_state import UNKNOWN, UNSUPPORTED, FixAction
+
+
+@dataclass
+class PlanStep:
+    index: int
+    fixes: List[str]
+    resource: str
+    stage: int = 0
+    setting: Any = None
+    value: Any = None
+    before: Any = UNKNOWN
+    command: Optional[str] = None
+    depends_on: List[int] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return self.setting.ident if self.setting is not None else self.command
+
+    @property
+    def commands(self) -> List[str]:
+        return self.setting.apply_commands(self.value) if self.setting is not None else [self.command]
+
+
+@dataclass
+class PlanConflict:
+    ident: str
+    winner: str
+    value: Any
+    overridden: List[str]
+    overridden_value: Any
+
+
+@dataclass
+class CompiledPlan:
+    fixes: List[str]
+    steps: List[PlanStep] = field(default_factory=list)
+    conflicts: List[PlanConflict] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    unsupported: List[str] = field(default_factory=list)
+    blocked: Dict[str, List[str]] = field(default_factory=dict)
+
+    def steps_for(self, fix_id: str) -> List[PlanStep]:
+        return [step for step in self.steps if fix_id in step.fixes]
+
+    def snapshot(self, fix_id: str) -> Dict[str, Any]:
+        return {step.setting.ident: step.before for step in self.steps_for(fix_id) if step.setting is not None}
+
+    def fix_results(self, step_results: Dict[int, bool]) -> Dict[str, bool]:
+        return {fix_id: fix_id not in self.blocked
+                and all(step_results.get(step.index, False) for step in self.steps_for(fix_id))
+                for fix_id in self.fixes}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [{
+            "step": step.index,
+            "stage": step.stage,
+            "fixes": " ".join(step.fixes),
+            "target": step.label,
+            "before": _format_value(step.before) if step.setting is not None else "",
+            "after": _format_value(step.value) if step.setting is not None else "run",
+            "depends_on": " ".join(str(index) for index in step.depends_on)
+        } for step in self.steps]
+
+
+def _format_value(value: Any) -> str:
+    if value is UNKNOWN:
+        return "unknown"
+    if value is None:
+        return "unset"
+    if isinstance(value, list):
+        return " ".join(value)
+    return str(value)
+
+
+def compile_plan(fix_ids: List[str], profiles: Dict[str, List[Any]], current: Dict[str, Any]) -> CompiledPlan:
+    order = list(profiles)
+    fix_ids = sorted({fix_id for fix_id in fix_ids if fix_id in profiles}, key=order.index)
+    plan = CompiledPlan(fix_ids)
+
+    desired: Dict[str, Any] = {}
+    owners: Dict[str, List[str]] = {}
+    for fix_id in fix_ids:
+        for item in profiles[fix_id]:
+            if isinstance(item, FixAction):
+                continue
+            ident = item.ident
+            if ident not in desired:
+                desired[ident] = item
+                owners[ident] = [fix_id]
+            elif desired[ident].value == item.value:
+                if fix_id not in owners[ident]:
+                    owners[ident].append(fix_id)
+            else:
+                plan.conflicts.append(PlanConflict(ident, fix_id, item.value, owners[ident], desired[ident].value))
+                desired[ident] = item
+                owners[ident] = [fix_id]
+
+    last_by_resource: Dict[str, int] = {}
+
+    def add_step(**kwargs) -> PlanStep:
+        step = PlanStep(index=len(plan.steps), **kwargs)
+        if step.resource in last_by_resource:
+            step.depends_on.append(last_by_resource[step.resource])
+        last_by_resource[step.resource] = step.index
+        plan.steps.append(step)
+        return step
+
+    readable: Dict[str, Any] = {}
+    for ident, setting in desired.items():
+        before = current.get(ident, UNKNOWN)
+        if before is UNSUPPORTED or (before is UNKNOWN and getattr(setting, "optional", False)):
+            plan.unsupported.append(ident)
+        elif before is UNKNOWN:
+            plan.skipped.append(ident)
+            for fix_id in owners[ident]:
+                plan.blocked.setdefault(fix_id, []).append(ident)
+        else:
+            readable[ident] = before
+
+    for ident, before in readable.items():
+        setting = desired[ident]
+        fixes = [fix_id for fix_id in owners[ident] if fix_id not in plan.blocked]
+        if not fixes:
+            continue
+        if setting.matches(before):
+            plan.unchanged.append(ident)
+            continue
+        add_step(fixes=fixes, resource=setting.resource, setting=setting, value=setting.value, before=before)
+
+    changed = {fix_id for step in plan.steps for fix_id in step.fixes}
+    actions: Dict[str, FixAction] = {}
+    action_owners: Dict[str, List[str]] = {}
+    for fix_id in fix_ids:
+        for item in profiles[fix_id]:
+            if not isinstance(item, FixAction) or fix_id in plan.blocked:
+                continue
+            if item.only_if_changed and fix_id not in changed:
+                continue
+            actions.setdefault(item.command, item)
+            action_owners.setdefault(item.command, []).append(fix_id)
+
+    barrier: List[int] = []
+    group = [step.index for step in plan.steps]
+    stage = 0
+    for action in sorted(actions.values(), key=lambda action: action.stage):
+        if action.stage != stage:
+            barrier = group or barrier
+            group = []
+            stage = action.stage
+        step = add_step(fixes=action_owners[action.command], resource=action.resource, stage=action.stage,
+                        command=action.command)
+        step.depends_on = sorted(set(step.depends_on) | set(barrier))
+        group.append(step.index)
+
+    return plan
+
+
+def _run_step(backend, step: PlanStep) -> bool:
+    try:
+        if step.setting is not None:
+            return backend.write(step.setting, step.value)
+        return backend.run(step.command)
+    except Exception:
+        return False
+
+
+def execute_plan(plan: CompiledPlan, backend, max_workers: int = 4,
+                 on_step: Optional[Callable[[PlanStep, bool, int, int], None]] = None) -> Dict[int, bool]:
+    results: Dict[int, bool] = {}
+    total = len(plan.steps)
+    if not total:
+        return results
+
+    waiting = {step.index: set(step.depends_on) for step in plan.steps}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        running = {}
+
+        def submit_ready():
+            for index in [index for index, deps in waiting.items() if not deps]:
+                del waiting[index]
+                running[pool.submit(_run_step, backend, plan.steps[index])] = index
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                results[index] = future.result()
+                for deps in waiting.values():
+                    deps.discard(index)
+                if on_step:
+                    on_step(plan.steps[index], results[index], len(results), total)
+            submit_ready()
+
+    return results
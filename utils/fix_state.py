@@ -0,0 +1,281 @@
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class _Sentinel:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+UNKNOWN = _Sentinel("UNKNOWN")
+UNSUPPORTED = _Sentinel("UNSUPPORTED")
+
+REG_NOT_FOUND = 1
+REG_VALUE_PATTERN = re.compile(r"^\s+(\S.*?)\s{2,}(REG_\w+)\s{2,}(.*?)\s*$")
+NETSH_LINE_PATTERN = re.compile(r"^\s*(\S.*?)\s*:\s*(.*?)\s*$")
+IPV4_PATTERN = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
+
+TCP_SETTING_QUERY = 'powershell -NoProfile -Command "Get-NetTCPSetting -SettingName Internet | Format-List"'
+OFFLOAD_SETTING_QUERY = 'powershell -NoProfile -Command "Get-NetOffloadGlobalSetting | Format-List"'
+DNS_SERVER_QUERY = ("powershell -NoProfile -Command \"$a = Get-NetAdapter -Name '{name}' "
+                    "-ErrorAction SilentlyContinue; if (-not $a) {{ 'absent' }} else {{ (Get-ItemProperty ('HKLM:\\SYSTEM\\CurrentControlSet\\Services"
+                    "\\Tcpip\\Parameters\\Interfaces\\' + $a.InterfaceGuid)).NameServer }}\"")
+
+
+Runner = Callable[[str], subprocess.CompletedProcess]
+
+
+def default_state_path() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, "NetJitterFix", "fix_state.json")
+
+
+def _format_dword(value: int) -> str:
+    return str(value) if value <= 0x7FFFFFFF else f"0x{value:x}"
+
+
+@dataclass(frozen=True)
+class RegistrySetting:
+    key: str
+    name: str
+    value: int
+    value_type: str = "REG_DWORD"
+
+    @property
+    def ident(self) -> str:
+        return f"reg:{self.key}\\{self.name}"
+
+    @property
+    def resource(self) -> str:
+        return f"reg:{self.key}"
+
+    def query_command(self) -> str:
+        return f'reg query "{self.key}"'
+
+    def parse(self, result: subprocess.CompletedProcess) -> Any:
+        if result.returncode == REG_NOT_FOUND:
+            return None
+        if result.returncode != 0:
+            return UNKNOWN
+        for line in result.stdout.splitlines():
+            match = REG_VALUE_PATTERN.match(line)
+            if match and match.group(1).lower() == self.name.lower():
+                text = match.group(3)
+                if match.group(2) == "REG_DWORD":
+                    try:
+                        return int(text, 0)
+                    except ValueError:
+                        return UNKNOWN
+                return text
+        return None
+
+    def matches(self, current: Any) -> bool:
+        return current == self.value
+
+    def apply_commands(self, value: Any) -> List[str]:
+        if value is None:
+            return [f'reg delete "{self.key}" /v {self.name} /f']
+        data = _format_dword(value) if self.value_type == "REG_DWORD" else value
+        return [f'reg add "{self.key}" /v {self.name} /t {self.value_type} /d {data} /f']
+
+
+@dataclass(frozen=True)
+class NetshTcpSetting:
+    name: str
+    value: str
+    labels: Tuple[str, ...]
+    scope: str = "global"
+    query: str = ""
+    optional: bool = False
+
+    @property
+    def ident(self) -> str:
+        return f"netsh:{self.scope}:{self.name}"
+
+    @property
+    def resource(self) -> str:
+        return "netsh:tcp"
+
+    def query_command(self) -> str:
+        return self.query or f"netsh int tcp show {self.scope}"
+
+    def parse(self, result: subprocess.CompletedProcess) -> Any:
+        if result.returncode != 0:
+            return UNKNOWN
+        labels = {label.lower() for label in self.labels}
+        for line in result.stdout.splitlines():
+            match = NETSH_LINE_PATTERN.match(line)
+            if match and match.group(1).lower() in labels:
+                return match.group(2).lower()
+        return UNSUPPORTED if self.query else UNKNOWN
+
+    def matches(self, current: Any) -> bool:
+        return isinstance(current, str) and current.lower() == str(self.value).lower()
+
+    def apply_commands(self, value: Any) -> List[str]:
+        if self.scope == "global":
+            return [f"netsh int tcp set global {self.name}={value}"]
+        return [f"netsh int tcp set {self.scope} {value}"]
+
+
+@dataclass(frozen=True)
+class DnsSetting:
+    interface: str
+    servers: Tuple[str, ...]
+
+    @property
+    def ident(self) -> str:
+        return f"dns:{self.interface}"
+
+    @property
+    def resource(self) -> str:
+        return self.ident
+
+    @property
+    def value(self) -> List[str]:
+        return list(self.servers)
+
+    def query_command(self) -> str:
+        return DNS_SERVER_QUERY.format(name=self.interface.replace("'", "''"))
+
+    def parse(self, result: subprocess.CompletedProcess) -> Any:
+        if result.returncode != 0:
+            return UNKNOWN
+        text = result.stdout.strip()
+        if text == "absent":
+            return UNSUPPORTED
+        return IPV4_PATTERN.findall(text) or None
+
+    def matches(self, current: Any) -> bool:
+        return isinstance(current, list) and current == self.value
+
+    def apply_commands(self, value: Any) -> List[str]:
+        name = f'name="{self.interface}"'
+        if value is None:
+            return [f"netsh interface ip set dns {name} dhcp"]
+        if not value:
+            return [f"netsh interface ip set dns {name} static none"]
+        commands = [f"netsh interface ip set dns {name} static {value[0]} primary"]
+        for index, server in enumerate(value[1:], start=2):
+            commands.append(f"netsh interface ip add dns {name} {server} index={index}")
+        return commands
+
+
+@dataclass(frozen=True)
+class FixAction:
+    command: str
+    only_if_changed: bool = False
+    stage: int = 0
+
+    @property
+    def resource(self) -> str:
+        return f"action:{self.command}"
+
+
+class SystemStateBackend:
+    def __init__(self, query: Runner, execute: Runner):
+        self.query = query
+        self.execute = execute
+
+    def read(self, settings: Iterable[Any]) -> Dict[str, Any]:
+        outputs: Dict[str, subprocess.CompletedProcess] = {}
+        values = {}
+        for setting in settings:
+            command = setting.query_command()
+            if command not in outputs:
+                outputs[command] = self.query(command)
+            values[setting.ident] = setting.parse(outputs[command])
+        return values
+
+    def write(self, setting: Any, value: Any) -> bool:
+        return all(self.run(command) for command in setting.apply_commands(value))
+
+    def run(self, command: str) -> bool:
+        return self.execute(command).returncode == 0
+
+
+class FakeStateBackend:
+    def __init__(self, values: Optional[Dict[str, Any]] = None, failing: Iterable[str] = (), delay: float = 0.0):
+        self.values: Dict[str, Any] = dict(values or {})
+        self.failing = set(failing)
+        self.delay = delay
+        self.reads = 0
+        self.commands: List[str] = []
+        self._lock = threading.Lock()
+
+    def read(self, settings: Iterable[Any]) -> Dict[str, Any]:
+        self.reads += 1
+        return {setting.ident: self.values.get(setting.ident) for setting in settings}
+
+    def write(self, setting: Any, value: Any) -> bool:
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.commands.extend(setting.apply_commands(value))
+            if setting.ident in self.failing:
+                return False
+            if value is None:
+                self.values.pop(setting.ident, None)
+            else:
+                self.values[setting.ident] = value
+        return True
+
+    def run(self, command: str) -> bool:
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.commands.append(command)
+        return command not in self.failing
+
+
+class FixStateStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.applied: List[str] = []
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.applied = [fix_id for fix_id in data.get("applied", []) if isinstance(fix_id, str)]
+        self.snapshots = {fix_id: dict(values) for fix_id, values in data.get("snapshots", {}).items()}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"applied": self.applied, "snapshots": self.snapshots}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def record(self, fix_id: str, snapshot: Dict[str, Any]) -> None:
+        if fix_id not in self.applied:
+            self.applied.append(fix_id)
+        before = self.snapshots.setdefault(fix_id, {})
+        for ident, value in snapshot.items():
+            before.setdefault(ident, value)
+        self.save()
+
+    def forget(self, fix_id: str) -> None:
+        if fix_id in self.applied:
+            self.applied.remove(fix_id)
+        self.snapshots.pop(fix_id, None)
+        self.save()
@@ -0,0 +1,210 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.check_result import CheckResult
+from utils.pacing import ProbeSchedule
+from utils.probe_engine import ProbeEngine, ProbeResult
+
+
+CANCEL_POLL = 0.1
+
+
+@dataclass(frozen=True)
+class FleetConfig:
+    count: int = 100
+    interval: float = 1.0
+    timeout: float = 1.0
+    mode: str = "auto"
+    payload_size: int = 56
+    udp_port: int = 7
+    tcp_port: int = 443
+    dscp: int = 0
+    poisson: bool = False
+
+    def engine(self, target: str) -> ProbeEngine:
+        return ProbeEngine(target, timeout=self.timeout, payload_size=self.payload_size, mode=self.mode,
+                           udp_port=self.udp_port, tcp_port=self.tcp_port, dscp=self.dscp)
+
+
+@dataclass
+class ShardResult:
+    records: Dict[str, List[ProbeResult]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    probes: int = 0
+    failed: int = 0
+    lag_ns: int = 0
+    max_lag_ns: int = 0
+
+
+_cancel_event = None
+
+
+def _init_worker(event) -> None:
+    global _cancel_event
+    _cancel_event = event
+
+
+async def _run_shard(shard: List[Tuple[int, str]], total: int, config: FleetConfig,
+                     cancelled: Optional[Callable[[], bool]] = None) -> ShardResult:
+    result = ShardResult()
+    engines = {}
+
+    async def open_target(target: str) -> None:
+        engine = config.engine(target)
+        try:
+            await engine.open()
+            engines[target] = engine
+        except OSError as e:
+            result.errors[target] = str(e)
+            result.records[target] = []
+
+    await asyncio.gather(*(open_target(target) for _, target in shard))
+    start_ns = time.perf_counter_ns()
+    interval_ns = int(config.interval * 1e9)
+
+    async def send(engine: ProbeEngine, seq: int, scheduled_ns: int) -> ProbeResult:
+        try:
+            record = await engine.probe(seq)
+        except Exception:
+            result.failed += 1
+            record = ProbeResult(seq, time.perf_counter_ns())
+        record.scheduled_ns = scheduled_ns
+        return record
+
+    async def run_target(index: int, target: str, engine: ProbeEngine) -> None:
+        schedule = ProbeSchedule(config.interval, config.poisson, start_ns=start_ns + index * interval_ns // total)
+        probes = []
+        for seq in range(config.count):
+            deadline_ns = await schedule.wait()
+            if cancelled is not None and cancelled():
+                break
+            lag_ns = max(0, time.perf_counter_ns() - deadline_ns)
+            result.probes += 1
+            result.lag_ns += lag_ns
+            result.max_lag_ns = max(result.max_lag_ns, lag_ns)
+            probes.append(asyncio.ensure_future(send(engine, seq, deadline_ns)))
+        result.records[target] = list(await asyncio.gather(*probes))
+
+    try:
+        await asyncio.gather(*(run_target(index, target, engines[target])
+                               for index, target in shard if target in engines))
+    finally:
+        for engine in engines.values():
+            engine.close()
+    return result
+
+
+def probe_shard(shard: List[Tuple[int, str]], total: int, config: FleetConfig,
+                cancelled: Optional[Callable[[], bool]] = None) -> ShardResult:
+    if cancelled is None and _cancel_event is not None:
+        cancelled = _cancel_event.is_set
+    return asyncio.run(_run_shard(shard, total, config, cancelled))
+
+
+@dataclass
+class FleetResult:
+    results: Dict[str, CheckResult]
+    errors: Dict[str, str]
+    workers: int
+    elapsed: float
+    probes: int
+    failed: int
+    lag_ns: int
+    max_lag_ns: int
+    cancelled: bool = False
+
+    @property
+    def probes_per_second(self) -> float:
+        return self.probes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mean_lag_ms(self) -> float:
+        return self.lag_ns / self.probes / 1e6 if self.probes else 0.0
+
+    def rows(self) -> List[Dict]:
+        rows = []
+        for target, result in self.results.items():
+            row = {"target": target}
+            row.update(result.snapshot())
+            if not result.sent:
+                row["packet_loss"] = 100.0
+            row["error"] = self.errors.get(target, "")
+            rows.append(row)
+        return rows
+
+    def summary(self) -> Dict[str, float]:
+        answered = [result for result in self.results.values() if result.received]
+        return {
+            "targets": len(self.results),
+            "answering": len(answered),
+            "errors": len(self.errors),
+            "workers": self.workers,
+            "elapsed_s": round(self.elapsed, 3),
+            "probes": self.probes,
+            "failed_probes": self.failed,
+            "probes_per_second": round(self.probes_per_second, 1),
+            "mean_lag_ms": round(self.mean_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ns / 1e6, 3),
+            "cancelled": self.cancelled
+        }
+
+
+class FleetScheduler:
+    def __init__(self, targets: List[str], config: FleetConfig = FleetConfig(), workers: Optional[int] = None):
+        self.targets = list(dict.fromkeys(targets))
+        self.config = config
+        self.workers = max(1, min(workers or os.cpu_count() or 1, len(self.targets) or 1))
+
+    def shards(self) -> List[List[Tuple[int, str]]]:
+        indexed = list(enumerate(self.targets))
+        return [indexed[worker::self.workers] for worker in range(self.workers)]
+
+    def run(self, on_shard: Optional[Callable[[int, int], None]] = None,
+            cancelled: Optional[Callable[[], bool]] = None) -> FleetResult:
+        total = len(self.targets)
+        shards = self.shards()
+        start = time.perf_counter()
+
+        if self.workers == 1:
+            outcomes = [probe_shard(shards[0], total, self.config, cancelled)]
+            if on_shard:
+                on_shard(1, 1)
+        else:
+            outcomes = []
+            context = multiprocessing.get_context()
+            stop = context.Event()
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(stop,)) as pool:
+                pending = {pool.submit(probe_shard, shard, total, self.config) for shard in shards}
+                while pending:
+                    done, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        outcomes.append(future.result())
+                        if on_shard:
+                            on_shard(len(outcomes), len(shards))
+                    if cancelled is not None and cancelled():
+                        stop.set()
+
+        records: Dict[str, List[ProbeResult]] = {}
+        errors: Dict[str, str] = {}
+        for outcome in outcomes:
+            records.update(outcome.records)
+            errors.update(outcome.errors)
+
+        stopped = cancelled is not None and cancelled()
+        return FleetResult(
+            results={target: CheckResult(target, records.get(target, []), stopped) for target in self.targets},
+            errors=errors,
+            workers=self.workers,
+            elapsed=time.perf_counter() - start,
+            probes=sum(outcome.probes for outcome in outcomes),
+            failed=sum(outcome.failed for outcome in outcomes),
+            lag_ns=sum(outcome.lag_ns for outcome in outcomes),
+            max_lag_ns=max((outcome.max_lag_ns for outcome in outcomes), default=0),
+            cancelled=stopped
+        )
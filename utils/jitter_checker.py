@@ -1,11 +1,64 @@
 import asyncio
+import math
+import os
 import re
-import numpy as np
 import time
-import statistics
 import platform
-import subprocess
-from typing import Tuple, List, Dict, Callable, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Callable, Optional, Union, AsyncIterator, Iterator, TYPE_CHECKING
+
+from utils.check_result import CheckResult
+from utils.console_encoding import console_encodings
+from utils.jitter_stats import JitterStats
+from utils.probe_engine import ProbeEngine, ProbeResult
+from utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from utils.convergence import ConvergenceTracker
+    from utils.fleet import FleetResult
+    from utils.load_test import BufferbloatResult, LoadProfile
+    from utils.metrics_exporter import MetricsRegistry
+    from utils.ring_buffer import SampleRingBuffer
+    from utils.sample_log import SampleLogWriter
+
+
+PING_PATTERN = re.compile(r"(time|zeit|время)[=<:]\s*(\d+(?:[.,]\d+)?)\s*(ms|мс)", re.IGNORECASE)
+TIMEOUT_PATTERN = re.compile(r"(timeout|timed out|zeitüberschreitung|превышен|истекло)", re.IGNORECASE)
+
+
+def parse_ping_line(line: str) -> Union[float, str, None]:
+    match = PING_PATTERN.search(line)
+    if match:
+        return float(match.group(2).replace(',', '.'))
+    if TIMEOUT_PATTERN.search(line):
+        return "timeout"
+    return None
+
+
+@tracer.traced("checker.decode_line", "checker")
+def parse_ping_bytes(line_bytes: bytes) -> Union[float, str, None]:
+    for encoding in console_encodings():
+        try:
+            parsed = parse_ping_line(line_bytes.decode(encoding))
+        except UnicodeDecodeError:
+            continue
+        if parsed is not None:
+            return parsed
+    return None
+
+
+@dataclass
+class JitterSample:
+    seq: int
+    sent_ns: int
+    rtt_ms: Optional[float]
+    lost: bool
+    stats: Dict[str, float] = field(default_factory=dict)
+    result: Optional[ProbeResult] = field(default=None, repr=False)
+    
+    @classmethod
+    def from_result(cls, result: ProbeResult, stats: Dict[str, float]) -> "JitterSample":
+        return cls(result.seq, result.sent_ns, result.rtt_ms, result.lost, stats, result)
 
 
 class JitterChecker:
@@ -13,7 +66,28 @@ class JitterChecker:
         self.target = "8.8.8.8"
         self.ping_count = 100
         self.timeout = 1000
-        self._process = None
+        self.interval = 1.0
+        self.poisson = False
+        self.precise_pacing = False
+        self.precision: Optional[float] = None
+        self.min_samples = 20
+        self.tolerance_ms = 0.25
+        self.convergence: Optional["ConvergenceTracker"] = None
+        self.target_convergence: Dict[str, "ConvergenceTracker"] = {}
+        self.probe_mode = "auto"
+        self.udp_port = 7
+        self.tcp_port = 443
+        self.payload_size = 56
+        self.dscp = 0
+        self.metrics: Optional["MetricsRegistry"] = None
+        self._processes = set()
+        self.probe_fallbacks: Dict[str, str] = {}
+        self._engines = set()
+        self.stats = JitterStats()
+        self.target_stats: Dict[str, JitterStats] = {}
+        self.session_dir: Optional[str] = None
+        self.last_result: Optional[CheckResult] = None
+        self.last_session_path: Optional[str] = None
         self._cancel_requested = False
         self.os_type = platform.system()
     
@@ -23,152 +97,497 @@ class JitterChecker:
     def set_ping_count(self, count: int) -> None:
         self.ping_count = count
     
-    async def _run_ping(self, count=100):
+    def set_interval(self, interval: float, poisson: bool = False, precise: bool = False) -> None:
+        from utils.pacing import MIN_INTERVAL
+        
+        if interval < MIN_INTERVAL:
+            raise ValueError(f"Probe interval must be at least {MIN_INTERVAL * 1000:g} ms: {interval}")
+        self.interval = interval
+        self.poisson = poisson
+        self.precise_pacing = precise
+    
+    def set_adaptive(self, precision: Optional[float], min_samples: int = 20, tolerance_ms: float = 0.25) -> None:
+        if precision is not None and precision <= 0:
+            raise ValueError(f"Precision must be positive: {precision}")
+        if min_samples < 2:
+            raise ValueError(f"Adaptive checks need at least 2 samples: {min_samples}")
+        self.precision = precision
+        self.min_samples = min_samples
+        self.tolerance_ms = tolerance_ms
+    
+    def set_probe_mode(self, mode: str) -> None:
+        if mode not in ProbeEngine.MODES:
+            raise ValueError(f"Unknown probe mode: {mode}")
+        self.probe_mode = mode
+    
+    def set_dscp(self, dscp: int) -> None:
+        if not 0 <= dscp <= 63:
+            raise ValueError(f"DSCP must be between 0 and 63: {dscp}")
+        self.dscp = dscp
+    
+    def _open_session_log(self, kind: str, targets: List[str]) -> Optional["SampleLogWriter"]:
+        if not self.session_dir:
+            return None
+        
+        from utils.sample_log import SampleLogWriter
+        
+        now = time.time()
+        name = f"{kind}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}.njflog"
+        path = os.path.join(self.session_dir, name)
         try:
-            if self.os_type == "Windows":
-                cmd = ["ping", "-n", str(count), self.target]
-            else:
-                cmd = ["ping", "-c", str(count), self.target]
-            
-            self._process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout_data, stderr_data = await self._process.communicate()
-            
-            for encoding in ['cp866', 'cp1251', 'cp1252', 'utf-8']:
-                try:
-                    stdout = stdout_data.decode(encoding, errors='ignore')
-                    stderr = stderr_data.decode(encoding, errors='ignore')
-                    return stdout, stderr
-                except UnicodeDecodeError:
-                    continue
+            writer = SampleLogWriter(path, targets)
+        except OSError as e:
+            print(f"Error opening session log: {e}")
+            return None
+        
+        self.last_session_path = path
+        return writer
+    
+    def _epoch_offset(self) -> float:
+        return time.time() - time.perf_counter_ns() / 1e9
+    
+    def _create_convergence(self) -> Optional["ConvergenceTracker"]:
+        if self.precision is None:
+            return None
+        from utils.convergence import ConvergenceTracker
+        return ConvergenceTracker(self.precision, self.tolerance_ms, self.min_samples, self.ping_count)
+    
+    def progress(self, completed: int) -> int:
+        if self.convergence is not None:
+            return self.convergence.progress
+        return min(100, int((completed / self.ping_count) * 100))
+    
+    def _create_engine(self, target: str) -> ProbeEngine:
+        return ProbeEngine(
+            target,
+            timeout=self.timeout / 1000,
+            payload_size=self.payload_size,
+            mode=self.probe_mode,
+            udp_port=self.udp_port,
+            tcp_port=self.tcp_port,
+            dscp=self.dscp
+        )
+    
+    def summarize(self, samples: List[Union[ProbeResult, JitterSample]], target: Optional[str] = None,
+                  cancelled: bool = False) -> CheckResult:
+        records = []
+        for sample in samples:
+            if isinstance(sample, JitterSample):
+                sample = sample.result or ProbeResult(
+                    sample.seq, sample.sent_ns, None if sample.lost else sample.sent_ns + int(sample.rtt_ms * 1_000_000))
+            records.append(sample)
+        return CheckResult(target or self.target, records, cancelled)
+    
+    async def _async_probe(self, target: str, count: Optional[int], on_probe: Callable[[ProbeResult], None],
+                           until: Optional[Callable[[], bool]] = None) -> bool:
+        if self.metrics is not None:
+            on_probe = self.metrics.wrap(target, on_probe)
+        
+        engine = self._create_engine(target)
+        try:
+            with tracer.span("probe.open", "probe", target=target):
+                await engine.open()
+        except OSError as e:
+            if self.metrics is not None:
+                self.metrics.record_error(target, "open")
+            self.probe_fallbacks[target] = str(e)
+            return await self._async_probe_ping(target, count, on_probe, until)
+        
+        from utils.pacing import PRECISE_SPIN_NS, SPIN_NS, ProbeSchedule
+        
+        pending = set()
+        schedule = ProbeSchedule(self.interval, self.poisson, spin_ns=PRECISE_SPIN_NS if self.precise_pacing else SPIN_NS)
+        
+        async def send(seq, scheduled_ns):
+            try:
+                result = await engine.probe(seq)
+            except Exception:
+                if self.metrics is not None:
+                    self.metrics.record_error(target, "probe")
+                result = ProbeResult(seq, time.perf_counter_ns())
+            result.scheduled_ns = scheduled_ns
+            return result
+        
+        def on_done(task):
+            pending.discard(task)
+            if task.cancelled():
+                return
+            with tracer.span("checker.on_probe", "checker"):
+                on_probe(task.result())
+        
+        self._engines.add(engine)
+        try:
+            seq = 0
+            while count is None or seq < count:
+                scheduled_ns = await schedule.wait()
+                if self._cancel_requested:
+                    return False
+                if until is not None and until():
+                    break
                 
-            stdout = stdout_data.decode('utf-8', errors='ignore')
-            stderr = stderr_data.decode('utf-8', errors='ignore')
-            return stdout, stderr
+                task = asyncio.ensure_future(send(seq, scheduled_ns))
+                task.add_done_callback(on_done)
+                pending.add(task)
+                seq += 1
             
+            if pending:
+                await asyncio.wait(list(pending))
         except Exception as e:
-            print(f"Error running ping: {e}")
-            return None, None
-    
-    async def _async_check_jitter(self, progress_callback: Optional[Callable[[int], None]] = None) -> Tuple[float, List[int], List[float]]:
-        self._cancel_requested = False
-        ping_times = []
+            if self.metrics is not None:
+                self.metrics.record_error(target, "probe")
+            print(f"Error during probe execution: {e}")
+            return False
+        finally:
+            for task in list(pending):
+                task.cancel()
+            engine.close()
+            self._engines.discard(engine)
         
-        if self.ping_count <= 0:
-            self.ping_count = 1
+        return not self._cancel_requested
+    
+    async def _async_probe_ping(self, target: str, count: Optional[int], on_probe: Callable[[ProbeResult], None],
+                                until: Optional[Callable[[], bool]] = None) -> bool:
+        process = None
+        seq = 0
         
         try:
             if self.os_type == "Windows":
-                cmd = ["ping", "-n", str(self.ping_count), self.target]
+                cmd = ["ping", "-n", str(count), target] if count else ["ping", "-t", target]
             else:
-                cmd = ["ping", "-c", str(self.ping_count), self.target]
-            
-            self._process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+                cmd = ["ping", "-c", str(count), target] if count else ["ping", target]
+                if self.interval != 1.0:
+                    cmd[1:1] = ["-i", f"{self.interval:g}"]
             
-            line_count = 0
-            ping_pattern = re.compile(r"(time|время)[=<:]\s*(\d+)\s*(ms|мс)", re.IGNORECASE)
-            timeout_pattern = re.compile(r"(timeout|timed out|превышен|истекло)", re.IGNORECASE)
+            with tracer.span("checker.spawn_ping", "checker"):
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            self._processes.add(process)
             
             while True:
                 if self._cancel_requested:
-                    self._process.terminate()
-                    return 0.0, [], []
+                    process.terminate()
+                    return False
                     
-                line_bytes = await self._process.stdout.readline()
+                line_bytes = await process.stdout.readline()
                 if not line_bytes:
                     break
                 
-                for encoding in ['cp866', 'cp1251', 'cp1252', 'utf-8']:
-                    try:
-                        line = line_bytes.decode(encoding)
-                        break
-                    except UnicodeDecodeError:
-                        continue
-                else:
+                parsed = parse_ping_bytes(line_bytes)
+                if parsed is None:
                     continue
                 
-                match = ping_pattern.search(line)
-                if match:
-                    ping_time = int(match.group(2))
-                    ping_times.append(ping_time)
-                    line_count += 1
-                    
-                    if progress_callback:
-                        progress = min(100, int((line_count / self.ping_count) * 100))
-                        progress_callback(progress)
+                recv_ns = time.perf_counter_ns()
+                if isinstance(parsed, float):
+                    on_probe(ProbeResult(seq, recv_ns - int(parsed * 1_000_000), recv_ns))
+                else:
+                    on_probe(ProbeResult(seq, recv_ns - int(self.timeout * 1_000_000)))
+                seq += 1
                 
-                elif timeout_pattern.search(line):
-                    line_count += 1
-                    if progress_callback:
-                        progress = min(100, int((line_count / self.ping_count) * 100))
-                        progress_callback(progress)
+                if until is not None and until():
+                    process.terminate()
+                    break
             
-            await self._process.wait()
+            await process.wait()
             
         except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error(target, "ping")
             print(f"Error during ping execution: {e}")
-            if self._process:
-                self._process.terminate()
-            return 0.0, [], []
+            if process and process.returncode is None:
+                process.terminate()
+            return False
+        finally:
+            self._processes.discard(process)
         
-        if not ping_times:
-            return 0.0, [], []
+        return True
+    
+    async def _async_measure(self, target: str, on_probe: Optional[Callable[[ProbeResult], None]] = None,
+                             stats: Optional[JitterStats] = None,
+                             convergence: Optional["ConvergenceTracker"] = None) -> Optional[List[ProbeResult]]:
+        results = []
         
-        time_stamps = np.linspace(0, len(ping_times) - 1, len(ping_times))
+        def collect(result):
+            results.append(result)
+            if stats is not None:
+                stats.add(result.rtt_ms)
+            if convergence is not None:
+                convergence.add(result.rtt_ms)
+            if on_probe:
+                on_probe(result)
         
-        jitter = np.std(ping_times) if len(ping_times) > 1 else 0.0
+        until = (lambda: convergence.done) if convergence is not None else None
+        if not await self._async_probe(target, self.ping_count, collect, until):
+            return None
+        return results
+    
+    async def _async_monitor(self, buffer: "SampleRingBuffer", on_sample: Optional[Callable[[ProbeResult], None]] = None,
+                             duration: Optional[float] = None) -> "SampleRingBuffer":
+        self._cancel_requested = False
+        self.stats = JitterStats()
+        count = max(1, int(math.ceil(duration / self.interval))) if duration else None
+        epoch_offset = self._epoch_offset()
+        log = self._open_session_log("monitor", [self.target])
+        
+        def record(result):
+            timestamp = epoch_offset + result.sent_ns / 1e9
+            buffer.append(timestamp, result.rtt_ms)
+            self.stats.add(result.rtt_ms)
+            if log:
+                log.append(timestamp, self.target, result.rtt_ms)
+            if on_sample:
+                on_sample(result)
         
-        return jitter, ping_times, time_stamps
+        try:
+            await self._async_probe(self.target, count, record)
+        finally:
+            if log:
+                log.close()
+        return buffer
     
-    def check_jitter(self, progress_callback: Optional[Callable[[int], None]] = None) -> Tuple[float, List[int], List[float]]:
+    async def _async_check_jitter(self, progress_callback: Optional[Callable[[int], None]] = None) -> CheckResult:
+        samples = []
+        with tracer.span("checker.check", "checker", target=self.target, count=self.ping_count):
+            async for sample in self.stream():
+                samples.append(sample)
+                if progress_callback:
+                    progress_callback(self.progress(len(samples)))
+        
+        with tracer.span("checker.summarize", "checker"):
+            return self.summarize(samples, cancelled=self._cancel_requested)
+    
+    async def stream(self, target: Optional[str] = None) -> AsyncIterator[JitterSample]:
+        self._cancel_requested = False
+        
+        if self.ping_count <= 0:
+            self.ping_count = 1
+        
+        target = target or self.target
+        self.stats = JitterStats()
+        self.convergence = self._create_convergence()
+        queue = asyncio.Queue()
+        epoch_offset = self._epoch_offset()
+        log = self._open_session_log("check", [target])
+        
+        def on_probe(result):
+            if log:
+                log.append(epoch_offset + result.sent_ns / 1e9, target, result.rtt_ms)
+            queue.put_nowait(JitterSample.from_result(result, self.stats.snapshot()))
+        
+        task = asyncio.ensure_future(self._async_measure(target, on_probe, self.stats, self.convergence))
+        task.add_done_callback(lambda _task: queue.put_nowait(None))
+        
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            result = loop.run_until_complete(self._async_check_jitter(progress_callback))
-            
+            while True:
+                sample = await queue.get()
+                if sample is None:
+                    break
+                yield sample
+        finally:
+            if not task.done():
+                self._cancel_requested = True
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            if log:
+                log.close()
+    
+    def iter_samples(self, target: Optional[str] = None) -> Iterator[JitterSample]:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        samples = self.stream(target)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(samples.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(samples.aclose())
             loop.close()
-            
-            return result
+    
+    async def _async_check_many(self, targets: List[str], progress_callback: Optional[Callable[[int], None]] = None,
+                                max_concurrency: int = 32) -> Dict[str, CheckResult]:
+        self._cancel_requested = False
+        
+        if self.ping_count <= 0:
+            self.ping_count = 1
+        
+        targets = list(dict.fromkeys(targets))
+        total = len(targets) * self.ping_count
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        completed = 0
+        epoch_offset = self._epoch_offset()
+        log = self._open_session_log("check", targets)
+        
+        def on_probe(target, result):
+            nonlocal completed
+            completed += 1
+            if log:
+                log.append(epoch_offset + result.sent_ns / 1e9, target, result.rtt_ms)
+            if progress_callback:
+                if self.target_convergence:
+                    progress_callback(sum(tracker.progress for tracker in self.target_convergence.values()) // len(targets))
+                else:
+                    progress_callback(min(100, int((completed / total) * 100)))
+        
+        self.target_stats = {target: JitterStats() for target in targets}
+        self.target_convergence = {}
+        if self.precision is not None:
+            self.target_convergence = {target: self._create_convergence() for target in targets}
+        
+        async def measure(target):
+            async with semaphore:
+                if self._cancel_requested:
+                    return None
+                return await self._async_measure(target, lambda result: on_probe(target, result), self.target_stats[target],
+                                                 self.target_convergence.get(target))
+        
+        try:
+            measurements = await asyncio.gather(*(measure(target) for target in targets))
+        finally:
+            if log:
+                log.close()
+        
+        return {
+            target: self.summarize(results or [], target, self._cancel_requested)
+            for target, results in zip(targets, measurements)
+        }
+    
+    def _run_loop(self, coro):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+    
+    def check_jitter(self, progress_callback: Optional[Callable[[int], None]] = None) -> CheckResult:
+        try:
+            self.last_result = self._run_loop(self._async_check_jitter(progress_callback))
         except Exception as e:
             print(f"Error in check_jitter: {e}")
-            return 0.0, [], []
+            self.last_result = CheckResult(self.target, [])
+        return self.last_result
+    
+    def check_many(self, targets: List[str], progress_callback: Optional[Callable[[int], None]] = None,
+                   max_concurrency: int = 32) -> Dict[str, CheckResult]:
+        try:
+            return self._run_loop(self._async_check_many(targets, progress_callback, max_concurrency))
+        except Exception as e:
+            print(f"Error in check_many: {e}")
+            return {target: CheckResult(target, []) for target in targets}
+    
+    def check_fleet(self, targets: List[str], workers: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None) -> "FleetResult":
+        from utils.fleet import FleetConfig, FleetScheduler
+        
+        self._cancel_requested = False
+        config = FleetConfig(
+            count=max(1, self.ping_count),
+            interval=self.interval,
+            timeout=self.timeout / 1000,
+            mode=self.probe_mode,
+            payload_size=self.payload_size,
+            udp_port=self.udp_port,
+            tcp_port=self.tcp_port,
+            dscp=self.dscp,
+            poisson=self.poisson
+        )
+        scheduler = FleetScheduler(targets, config, workers)
+        on_shard = (lambda done, total: progress_callback(int(done / total * 100))) if progress_callback else None
+        fleet = scheduler.run(on_shard, lambda: self._cancel_requested)
+        if self.metrics is not None:
+            for target, result in fleet.results.items():
+                for record in result.records:
+                    self.metrics.observe(target, record)
+            for target in fleet.errors:
+                self.metrics.record_error(target, "open")
+        return fleet
+    
+    def check_under_load(self, phases: Optional[Dict[str, "LoadProfile"]] = None, load_host: Optional[str] = None,
+                         load_port: int = 7070, warmup: float = 1.0,
+                         progress_callback: Optional[Callable[[int], None]] = None) -> "BufferbloatResult":
+        from utils.load_test import PHASES, BufferbloatResult, LoadGenerator
+        
+        phases = phases or PHASES
+        result = BufferbloatResult(self.target)
+        for index, (phase, profile) in enumerate(phases.items()):
+            def on_progress(percent, index=index):
+                if progress_callback:
+                    progress_callback(int((index * 100 + percent) / len(phases)))
+            
+            generator = None
+            if not profile.idle:
+                generator = LoadGenerator(load_host or self.target, load_port, profile)
+                generator.start()
+                time.sleep(warmup)
+            try:
+                result.phases[phase] = self.check_jitter(on_progress)
+            finally:
+                if generator is not None:
+                    generator.stop()
+                    result.throughput[phase] = generator.throughput()
+                    problem = generator.problem()
+                    if problem:
+                        result.invalid[phase] = problem
+            if result.phases[phase].cancelled:
+                break
+        
+        self.last_result = result.phases.get("idle", self.last_result)
+        return result
+    
+    def monitor(self, buffer: Optional["SampleRingBuffer"] = None, on_sample: Optional[Callable[[ProbeResult], None]] = None,
+                duration: Optional[float] = None) -> "SampleRingBuffer":
+        if buffer is None:
+            from utils.ring_buffer import SampleRingBuffer
+            buffer = SampleRingBuffer()
+        try:
+            return self._run_loop(self._async_monitor(buffer, on_sample, duration))
+        except Exception as e:
+            print(f"Error in monitor: {e}")
+            return buffer
     
     def cancel_check(self) -> None:
         self._cancel_requested = True
-        if self._process:
+        for process in list(self._processes):
             try:
-                self._process.terminate()
+                process.terminate()
             except:
                 pass
     
-    def get_detailed_network_stats(self) -> Dict:
-        jitter, ping_times, _ = self.check_jitter()
+    def get_live_stats(self) -> Dict[str, float]:
+        return self.stats.snapshot()
+    
+    def get_detailed_network_stats(self, result: Optional[CheckResult] = None) -> Dict:
+        result = result or self.last_result or self.check_jitter()
         
-        if not ping_times:
+        if not result.ping_times:
             return {
                 "jitter": 0.0,
                 "min_ping": 0,
                 "max_ping": 0,
                 "avg_ping": 0.0,
-                "packet_loss": 100.0
+                "packet_loss": 100.0 if not result.sent else round(result.loss_percent, 2)
             }
         
-        received_packets = len(ping_times)
-        packet_loss = 100 - (received_packets / self.ping_count * 100)
-        
         return {
-            "jitter": round(jitter, 2),
-            "min_ping": min(ping_times) if ping_times else 0,
-            "max_ping": max(ping_times) if ping_times else 0,
-            "avg_ping": round(sum(ping_times) / len(ping_times), 2) if ping_times else 0.0,
-            "packet_loss": round(packet_loss, 2)
+            "jitter": round(result.jitter, 2),
+            "min_ping": round(result.min_ping, 3),
+            "max_ping": round(result.max_ping, 3),
+            "avg_ping": round(result.avg_ping, 2),
+            "packet_loss": round(result.loss_percent, 2),
+            "rfc3550_jitter": round(result.rfc3550_jitter, 3),
+            "ipdv_mean": round(result.ipdv_mean, 3),
+            "p50": round(result.p50, 3),
+            "p95": round(result.p95, 3),
+            "p99": round(result.p99, 3),
+            "duplicates": result.duplicates,
+            "late_replies": result.late_replies,
+            "reordered": result.reordered,
+            "max_loss_burst": result.max_loss_burst
         }
@@ -1,12 +1,81 @@
 import subprocess
 import ctypes
 import os
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+
+from utils.fix_plan import CompiledPlan, PlanStep, compile_plan, execute_plan
+from utils.fix_state import (OFFLOAD_SETTING_QUERY, TCP_SETTING_QUERY, DnsSetting, FixAction, FixStateStore,
+                             NetshTcpSetting, RegistrySetting, SystemStateBackend, default_state_path)
+from utils.shell_session import ShellSessionPool
+from utils.tracing import tracer
+
+
+TCPIP_PARAMETERS = "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters"
+PSCHED_POLICY = "HKEY_LOCAL_MACHINE\\SOFTWARE\\Policies\\Microsoft\\Windows\\Psched"
+MULTIMEDIA_PROFILE = "HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Multimedia\\SystemProfile"
+
+ADAPTER_COMMAND = 'powershell -Command "& {Get-NetAdapter | ForEach-Object { Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*InterruptModeration\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*FlowControl\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*EEE\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*PriorityVLANTag\' -RegistryValue 1}}"'
+
+
+def _tcp_setting(name: str, value: str, prop: str, query: str = TCP_SETTING_QUERY,
+                 scope: str = "global") -> NetshTcpSetting:
+    return NetshTcpSetting(name, value, (prop,), scope=scope, query=query)
+
+
+def _legacy_tcp_global(name: str, value: str, *labels: str) -> NetshTcpSetting:
+    return NetshTcpSetting(name, value, labels, optional=True)
+
+
+FIX_PROFILES = {
+    "disable_nagle": [
+        RegistrySetting(TCPIP_PARAMETERS + "\\Interfaces", "TcpNoDelay", 1),
+        RegistrySetting(TCPIP_PARAMETERS, "TcpNoDelay", 1)
+    ],
+    "optimize_tcp": [
+        _tcp_setting("autotuninglevel", "normal", "AutoTuningLevelLocal"),
+        _tcp_setting("congestionprovider", "ctcp", "CongestionProvider"),
+        _tcp_setting("ecncapability", "enabled", "EcnCapability"),
+        _tcp_setting("rss", "enabled", "ReceiveSideScaling", OFFLOAD_SETTING_QUERY),
+        _tcp_setting("chimney", "disabled", "Chimney", OFFLOAD_SETTING_QUERY),
+        _legacy_tcp_global("dca", "enabled", "Direct Cache Access (DCA)"),
+        _legacy_tcp_global("netdma", "enabled", "NetDMA State"),
+        _tcp_setting("timestamps", "disabled", "Timestamps"),
+        _tcp_setting("initialRto", "2000", "InitialRto"),
+        _tcp_setting("rsc", "disabled", "ReceiveSegmentCoalescing", OFFLOAD_SETTING_QUERY),
+        _tcp_setting("heuristics", "disabled", "ScalingHeuristics", scope="heuristics"),
+        _legacy_tcp_global("fastopen", "enabled", "Fast Open"),
+        RegistrySetting(TCPIP_PARAMETERS, "DefaultTTL", 64),
+        RegistrySetting(TCPIP_PARAMETERS, "TcpMaxDupAcks", 2),
+        RegistrySetting(TCPIP_PARAMETERS, "SackOpts", 1),
+        RegistrySetting(TCPIP_PARAMETERS, "Tcp1323Opts", 3),
+        RegistrySetting(TCPIP_PARAMETERS, "TcpTimedWaitDelay", 30)
+    ],
+    "qos_priority": [
+        RegistrySetting(PSCHED_POLICY, "NonBestEffortLimit", 0),
+        RegistrySetting(PSCHED_POLICY, "TimerResolution", 1),
+        RegistrySetting(PSCHED_POLICY, "MaxOutstandingSends", 8)
+    ],
+    "dns_optimize": [
+        DnsSetting("Ethernet", ("1.1.1.1", "8.8.8.8")),
+        DnsSetting("Wi-Fi", ("1.1.1.1", "8.8.8.8")),
+        FixAction("ipconfig /flushdns", only_if_changed=True, stage=1)
+    ],
+    "reset_winsock": [FixAction("netsh winsock reset", stage=2)],
+    "reset_tcp_ip": [FixAction("netsh int ip reset", stage=3)],
+    "disable_auto_tuning": [_tcp_setting("autotuninglevel", "disabled", "AutoTuningLevelLocal")],
+    "network_throttling": [RegistrySetting(MULTIMEDIA_PROFILE, "NetworkThrottlingIndex", 0xFFFFFFFF)],
+    "network_adapter": [FixAction(ADAPTER_COMMAND)]
+}
 
 
 class JitterFixer:
-    def __init__(self):
-        self.fixes_applied = []
+    def __init__(self, shell_pool: Optional[ShellSessionPool] = None, backend=None,
+                 store: Optional[FixStateStore] = None, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.shell_pool = shell_pool or ShellSessionPool(size=max_workers)
+        self.backend = backend or SystemStateBackend(self.shell_pool.run, self.run_as_admin)
+        self.store = store if store is not None else FixStateStore(default_state_path())
+        self.fixes_applied = self.store.applied
         self.fixes_available = {
             "disable_nagle": "Disable Nagle's Algorithm (TCP_NODELAY)",
             "optimize_tcp": "Optimize TCP/IP parameters",
@@ -28,41 +97,19 @@ class JitterFixer:
     def check_admin_rights(self) -> bool:
         return self._is_admin()
     
-    def run_as_admin(self, command: str) -> subprocess.CompletedProcess:
+    def run_as_admin(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
         if not self._is_admin():
             return subprocess.CompletedProcess(args=command, returncode=1, stdout="Administrator rights required", stderr="")
         
         try:
-            process = subprocess.Popen(
-                command, 
-                shell=True, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE, 
-                text=False
-            )
-            stdout_bytes, stderr_bytes = process.communicate()
-            
-            stdout = ""
-            stderr = ""
-            
-            for encoding in ['cp866', 'cp1251', 'cp1252', 'utf-8']:
-                try:
-                    stdout = stdout_bytes.decode(encoding, errors='ignore')
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            for encoding in ['cp866', 'cp1251', 'cp1252', 'utf-8']:
-                try:
-                    stderr = stderr_bytes.decode(encoding, errors='ignore')
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            return subprocess.CompletedProcess(args=command, returncode=process.returncode, stdout=stdout, stderr=stderr)
+            with tracer.span("fixer.run_as_admin", "fixer", command=command):
+                return self.shell_pool.run(command, timeout)
         except Exception as e:
             return subprocess.CompletedProcess(args=command, returncode=1, stdout="", stderr=str(e))
     
+    def close(self) -> None:
+        self.shell_pool.close()
+    
     def get_available_fixes(self) -> Dict[str, str]:
         return self.fixes_available
     
@@ -70,148 +117,81 @@ class JitterFixer:
         return self.fixes_applied
     
     def disable_nagle_algorithm(self) -> bool:
-        cmd = 'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters\\Interfaces" /v TcpNoDelay /t REG_DWORD /d 1 /f'
-        cmd2 = 'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v TcpNoDelay /t REG_DWORD /d 1 /f'
-        
-        result1 = self.run_as_admin(cmd)
-        result2 = self.run_as_admin(cmd2)
-        
-        if result1.returncode == 0 and result2.returncode == 0:
-            self.fixes_applied.append("disable_nagle")
-            return True
-        return False
+        return self.apply_fix("disable_nagle")
     
     def optimize_tcp_settings(self) -> bool:
-        commands = [
-            'netsh int tcp set global autotuninglevel=normal',
-            'netsh int tcp set global congestionprovider=ctcp',
-            'netsh int tcp set global ecncapability=enabled',
-            'netsh int tcp set global rss=enabled',
-            'netsh int tcp set global chimney=disabled',
-            'netsh int tcp set global dca=enabled',
-            'netsh int tcp set global netdma=enabled',
-            'netsh int tcp set global timestamps=disabled',
-            'netsh int tcp set global initialRto=2000',
-            'netsh int tcp set global rsc=disabled',
-            'netsh int tcp set heuristics disabled',
-            'netsh int tcp set global fastopen=enabled',
-            'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v DefaultTTL /t REG_DWORD /d 64 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v TcpMaxDupAcks /t REG_DWORD /d 2 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v SackOpts /t REG_DWORD /d 1 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v Tcp1323Opts /t REG_DWORD /d 3 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SYSTEM\\CurrentControlSet\\Services\\Tcpip\\Parameters" /v TcpTimedWaitDelay /t REG_DWORD /d 30 /f'
-        ]
-        
-        success = True
-        for cmd in commands:
-            result = self.run_as_admin(cmd)
-            if result.returncode != 0:
-                success = False
-        
-        if success:
-            self.fixes_applied.append("optimize_tcp")
-        return success
+        return self.apply_fix("optimize_tcp")
     
     def set_qos_priority(self) -> bool:
-        commands = [
-            'reg add "HKEY_LOCAL_MACHINE\\SOFTWARE\\Policies\\Microsoft\\Windows\\Psched" /v NonBestEffortLimit /t REG_DWORD /d 0 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SOFTWARE\\Policies\\Microsoft\\Windows\\Psched" /v TimerResolution /t REG_DWORD /d 1 /f',
-            'reg add "HKEY_LOCAL_MACHINE\\SOFTWARE\\Policies\\Microsoft\\Windows\\Psched" /v MaxOutstandingSends /t REG_DWORD /d 8 /f'
-        ]
-        
-        success = True
-        for cmd in commands:
-            result = self.run_as_admin(cmd)
-            if result.returncode != 0:
-                success = False
-        
-        if success:
-            self.fixes_applied.append("qos_priority")
-        return success
+        return self.apply_fix("qos_priority")
     
     def optimize_dns(self) -> bool:
-        commands = [
-            'netsh interface ip set dns name="Ethernet" static 1.1.1.1 primary',
-            'netsh interface ip add dns name="Ethernet" 8.8.8.8 index=2',
-            'netsh interface ip set dns name="Wi-Fi" static 1.1.1.1 primary',
-            'netsh interface ip add dns name="Wi-Fi" 8.8.8.8 index=2',
-            'ipconfig /flushdns'
-        ]
-        
-        success = True
-        for cmd in commands:
-            result = self.run_as_admin(cmd)
-            if result.returncode != 0:
-                success = False
-        
-        if success:
-            self.fixes_applied.append("dns_optimize")
-        return success
+        return self.apply_fix("dns_optimize")
     
     def reset_winsock(self) -> bool:
-        cmd = 'netsh winsock reset'
-        result = self.run_as_admin(cmd)
-        
-        if result.returncode == 0:
-            self.fixes_applied.append("reset_winsock")
-            return True
-        return False
+        return self.apply_fix("reset_winsock")
     
     def reset_tcp_ip(self) -> bool:
-        cmd = 'netsh int ip reset'
-        result = self.run_as_admin(cmd)
-        
-        if result.returncode == 0:
-            self.fixes_applied.append("reset_tcp_ip")
-            return True
-        return False
+        return self.apply_fix("reset_tcp_ip")
     
     def disable_auto_tuning(self) -> bool:
-        cmd = 'netsh interface tcp set global autotuninglevel=disabled'
-        result = self.run_as_admin(cmd)
-        
-        if result.returncode == 0:
-            self.fixes_applied.append("disable_auto_tuning")
-            return True
-        return False
+        return self.apply_fix("disable_auto_tuning")
     
     def disable_network_throttling(self) -> bool:
-        cmd = 'reg add "HKEY_LOCAL_MACHINE\\SOFTWARE\\Microsoft\\Windows NT\\CurrentVersion\\Multimedia\\SystemProfile" /v NetworkThrottlingIndex /t REG_DWORD /d 0xffffffff /f'
-        result = self.run_as_admin(cmd)
-        
-        if result.returncode == 0:
-            self.fixes_applied.append("network_throttling")
-            return True
-        return False
+        return self.apply_fix("network_throttling")
     
     def optimize_network_adapter(self) -> bool:
-        cmd = 'powershell -Command "& {Get-NetAdapter | ForEach-Object { Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*InterruptModeration\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*FlowControl\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*EEE\' -RegistryValue 0; Set-NetAdapterAdvancedProperty -Name $_.Name -RegistryKeyword \'*PriorityVLANTag\' -RegistryValue 1}}"'
-        result = self.run_as_admin(cmd)
+        return self.apply_fix("network_adapter")
+    
+    def plan_fixes(self, fix_ids: List[str]) -> CompiledPlan:
+        settings = {}
+        for fix_id in fix_ids:
+            for item in FIX_PROFILES.get(fix_id, []):
+                if not isinstance(item, FixAction):
+                    settings.setdefault(item.ident, item)
         
-        if result.returncode == 0:
-            self.fixes_applied.append("network_adapter")
-            return True
-        return False
+        with tracer.span("fixer.read_state", "fixer", settings=len(settings)):
+            current = self.backend.read(settings.values()) if settings else {}
+        with tracer.span("fixer.compile_plan", "fixer"):
+            return compile_plan(fix_ids, FIX_PROFILES, current)
+    
+    def unreadable_settings(self, fix_ids: List[str]) -> List[str]:
+        return self.plan_fixes(fix_ids).skipped
+    
+    def execute_plan(self, plan: CompiledPlan, on_step: Optional[Callable[[PlanStep, bool, int, int], None]] = None) -> Dict[str, bool]:
+        with tracer.span("fixer.execute_plan", "fixer", steps=len(plan.steps)):
+            step_results = execute_plan(plan, self.backend, self.max_workers, on_step)
+        results = plan.fix_results(step_results)
+        for fix_id, success in results.items():
+            if success:
+                self.store.record(fix_id, plan.snapshot(fix_id))
+        return results
     
-    def apply_fix(self, fix_id: str) -> bool:
-        fix_functions = {
-            "disable_nagle": self.disable_nagle_algorithm,
-            "optimize_tcp": self.optimize_tcp_settings,
-            "qos_priority": self.set_qos_priority,
-            "dns_optimize": self.optimize_dns,
-            "reset_winsock": self.reset_winsock,
-            "reset_tcp_ip": self.reset_tcp_ip,
-            "disable_auto_tuning": self.disable_auto_tuning,
-            "network_throttling": self.disable_network_throttling,
-            "network_adapter": self.optimize_network_adapter
-        }
+    def apply_fixes(self, fix_ids: List[str], on_step: Optional[Callable[[PlanStep, bool, int, int], None]] = None) -> Dict[str, bool]:
+        results = self.execute_plan(self.plan_fixes(fix_ids), on_step)
+        return {fix_id: results.get(fix_id, False) for fix_id in fix_ids}
+    
+    def rollback_fix(self, fix_id: str) -> bool:
+        snapshot = self.store.snapshots.get(fix_id)
+        if fix_id not in self.store.applied or snapshot is None:
+            return False
+        
+        settings = {item.ident: item for item in FIX_PROFILES.get(fix_id, []) if not isinstance(item, FixAction)}
+        success = True
+        for ident, value in reversed(list(snapshot.items())):
+            setting = settings.get(ident)
+            if setting is not None and not self.backend.write(setting, value):
+                success = False
         
-        if fix_id in fix_functions:
-            return fix_functions[fix_id]()
-        return False
+        if success:
+            self.store.forget(fix_id)
+        return success
+    
+    def rollback_all(self) -> Dict[str, bool]:
+        return {fix_id: self.rollback_fix(fix_id) for fix_id in reversed(list(self.store.applied))}
+    
+    def apply_fix(self, fix_id: str) -> bool:
+        return self.apply_fixes([fix_id])[fix_id]
     
     def apply_all_fixes(self) -> Dict[str, bool]:
-        results = {}
-        for fix_id in self.fixes_available.keys():
-            results[fix_id] = self.apply_fix(fix_id)
-        return results
+        return self.apply_fixes(list(self.fixes_available.keys()))
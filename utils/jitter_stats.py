@@ -0,0 +1,166 @@
+import math
+from typing import Dict, List, Optional
+
+
+class P2Quantile:
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self._initial: List[float] = []
+        self._heights: List[float] = []
+        self._positions: List[int] = []
+        self._increments = (quantile / 2, quantile, (1 + quantile) / 2)
+
+    def add(self, value: float) -> None:
+        if len(self._initial) < 5:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                self._initial.sort()
+                self._heights = list(self._initial)
+                self._positions = [1, 2, 3, 4, 5]
+            return
+
+        heights = self._heights
+        positions = self._positions
+
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while k < 3 and value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        # The last marker sits at n, and the desired positions are 1 + (n - 1) * increment,
+        # so they are derived here instead of being accumulated on every sample.
+        observed = positions[4] - 1
+
+        for i in range(1, 4):
+            delta = 1 + observed * self._increments[i - 1] - positions[i]
+            if delta >= 1 and positions[i + 1] - positions[i] > 1:
+                step = 1
+            elif delta <= -1 and positions[i - 1] - positions[i] < -1:
+                step = -1
+            else:
+                continue
+            candidate = self._parabolic(i, step)
+            if heights[i - 1] < candidate < heights[i + 1]:
+                heights[i] = candidate
+            else:
+                heights[i] = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+            positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h = self._heights
+        n = self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> float:
+        if self._heights:
+            return self._heights[2]
+        if not self._initial:
+            return 0.0
+        ordered = sorted(self._initial)
+        index = min(len(ordered) - 1, int(round(self.quantile * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class JitterStats:
+    def __init__(self):
+        self.sent = 0
+        self.received = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.rfc3550_jitter = 0.0
+        self._ipdv_total = 0.0
+        self._ipdv_count = 0
+        self._last_rtt: Optional[float] = None
+        self._p50 = P2Quantile(0.50)
+        self._p95 = P2Quantile(0.95)
+        self._p99 = P2Quantile(0.99)
+
+    def add(self, rtt_ms: Optional[float]) -> None:
+        self.sent += 1
+        if rtt_ms is None:
+            return
+
+        self.received += 1
+        delta = rtt_ms - self.mean
+        self.mean += delta / self.received
+        self._m2 += delta * (rtt_ms - self.mean)
+
+        if rtt_ms < self.min:
+            self.min = rtt_ms
+        if rtt_ms > self.max:
+            self.max = rtt_ms
+
+        if self._last_rtt is not None:
+            ipdv = abs(rtt_ms - self._last_rtt)
+            self.rfc3550_jitter += (ipdv - self.rfc3550_jitter) / 16
+            self._ipdv_total += ipdv
+            self._ipdv_count += 1
+        self._last_rtt = rtt_ms
+
+        self._p50.add(rtt_ms)
+        self._p95.add(rtt_ms)
+        self._p99.add(rtt_ms)
+
+    @property
+    def lost(self) -> int:
+        return self.sent - self.received
+
+    @property
+    def loss_percent(self) -> float:
+        return self.lost / self.sent * 100 if self.sent else 0.0
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.received if self.received else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def ipdv_mean(self) -> float:
+        return self._ipdv_total / self._ipdv_count if self._ipdv_count else 0.0
+
+    @property
+    def p50(self) -> float:
+        return self._p50.value
+
+    @property
+    def p95(self) -> float:
+        return self._p95.value
+
+    @property
+    def p99(self) -> float:
+        return self._p99.value
+
+    def snapshot(self) -> Dict[str, float]:
+        has_data = self.received > 0
+        return {
+            "sent": self.sent,
+            "received": self.received,
+            "lost": self.lost,
+            "packet_loss": self.loss_percent,
+            "jitter": self.stdev,
+            "rfc3550_jitter": self.rfc3550_jitter,
+            "ipdv_mean": self.ipdv_mean,
+            "min_ping": self.min if has_data else 0.0,
+            "max_ping": self.max if has_data else 0.0,
+            "avg_ping": self.mean,
+            "p50": self.p50,
+            "p95": self.p95,
+            "p99": self.p99
+        }
@@ -0,0 +1,297 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.check_result import CheckResult
+
+
+CHUNK_SIZE = 64 * 1024
+UDP_LOAD_PACKET = 1200
+UPLOAD = b"U"
+DOWNLOAD = b"D"
+GRADES = ((5, "A+"), (30, "A"), (60, "B"), (200, "C"), (400, "D"))
+MIN_LOAD_MBPS = 0.1
+
+
+def bufferbloat_grade(added_ms: float) -> str:
+    for limit, grade in GRADES:
+        if added_ms < limit:
+            return grade
+    return "F"
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    upload_streams: int = 0
+    download_streams: int = 0
+    udp_mbps: float = 0.0
+
+    @property
+    def idle(self) -> bool:
+        return not (self.upload_streams or self.download_streams or self.udp_mbps)
+
+
+PHASE_NAMES = ("idle", "download", "upload", "bidirectional")
+
+
+def build_phases(names=PHASE_NAMES, streams: int = 4, udp_mbps: float = 0.0) -> Dict[str, LoadProfile]:
+    phases = {}
+    for name in names:
+        if name not in PHASE_NAMES:
+            raise ValueError(f"Unknown load phase: {name}")
+        upload = name in ("upload", "bidirectional")
+        download = name in ("download", "bidirectional")
+        phases[name] = LoadProfile(streams if upload else 0, streams if download else 0, udp_mbps if upload else 0.0)
+    return phases
+
+
+PHASES = build_phases()
+
+
+class LoadSink:
+    def __init__(self, host: str = "0.0.0.0", port: int = 7070):
+        self.host = host
+        self.port = port
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.connections = 0
+        self._server = None
+        self._transport = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        chunk = bytes(CHUNK_SIZE)
+        try:
+            command = await reader.readexactly(1)
+            if command == DOWNLOAD:
+                while not reader.at_eof():
+                    writer.write(chunk)
+                    await writer.drain()
+                    self.bytes_sent += len(chunk)
+            else:
+                while True:
+                    data = await reader.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    self.bytes_received += len(data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        sink = self
+
+        class Discard(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                sink.bytes_received += len(data)
+
+        self._transport, _ = await loop.create_datagram_endpoint(Discard, local_addr=(self.host, self.port))
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def serve(self, duration: Optional[float] = None) -> None:
+        await self.start()
+        try:
+            if duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            self.close()
+
+    async def __aenter__(self) -> "LoadSink":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
+class LoadGenerator:
+    def __init__(self, host: str, port: int = 7070, profile: LoadProfile = LoadProfile()):
+        self.host = host
+        self.port = port
+        self.profile = profile
+        self.bytes_up = 0
+        self.bytes_down = 0
+        self.errors = 0
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    async def _tcp_stream(self, command: bytes) -> None:
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            self.errors += 1
+            return
+        chunk = bytes(CHUNK_SIZE)
+        try:
+            writer.write(command)
+            while not self._stop.is_set():
+                if command == UPLOAD:
+                    writer.write(chunk)
+                    await writer.drain()
+                    self.bytes_up += len(chunk)
+                else:
+                    data = await reader.read(CHUNK_SIZE)
+                    if not data:
+                        break
+                    self.bytes_down += len(data)
+        except ConnectionError:
+            self.errors += 1
+        finally:
+            writer.close()
+
+    async def _udp_stream(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            transport, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol,
+                                                               remote_addr=(self.host, self.port))
+        except OSError:
+            self.errors += 1
+            return
+        packet = bytes(UDP_LOAD_PACKET)
+        bytes_per_second = self.profile.udp_mbps * 1_000_000 / 8
+        start = time.monotonic()
+        sent = 0
+        try:
+            while not self._stop.is_set():
+                due = int((time.monotonic() - start) * bytes_per_second) - sent
+                for _ in range(max(0, due) // UDP_LOAD_PACKET):
+                    transport.sendto(packet)
+                    sent += UDP_LOAD_PACKET
+                    self.bytes_up += UDP_LOAD_PACKET
+                await asyncio.sleep(0.002)
+        finally:
+            transport.close()
+
+    async def _run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        streams = [self._tcp_stream(UPLOAD) for _ in range(self.profile.upload_streams)]
+        streams += [self._tcp_stream(DOWNLOAD) for _ in range(self.profile.download_streams)]
+        if self.profile.udp_mbps > 0:
+            streams.append(self._udp_stream())
+        self.started = time.monotonic()
+        self._ready.set()
+        tasks = [asyncio.ensure_future(stream) for stream in streams]
+        await self._stop.wait()
+        await asyncio.wait(tasks, timeout=1.0)
+        for task in tasks:
+            task.cancel()
+        self.stopped = time.monotonic()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=asyncio.run, args=(self._run(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self._thread = None
+
+    def throughput(self) -> Dict[str, float]:
+        elapsed = ((self.stopped or time.monotonic()) - self.started) if self.started else 0.0
+        if elapsed <= 0:
+            return {"upload_mbps": 0.0, "download_mbps": 0.0}
+        return {
+            "upload_mbps": self.bytes_up * 8 / elapsed / 1_000_000,
+            "download_mbps": self.bytes_down * 8 / elapsed / 1_000_000
+        }
+
+    def problem(self) -> Optional[str]:
+        streams = self.profile.upload_streams + self.profile.download_streams + (1 if self.profile.udp_mbps > 0 else 0)
+        if self.errors:
+            return f"{self.errors} of {streams} load streams failed"
+        rates = self.throughput()
+        if (self.profile.upload_streams or self.profile.udp_mbps) and rates["upload_mbps"] < MIN_LOAD_MBPS:
+            return "no upload throughput"
+        if self.profile.download_streams and rates["download_mbps"] < MIN_LOAD_MBPS:
+            return "no download throughput"
+        return None
+
+    def __enter__(self) -> "LoadGenerator":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+@dataclass
+class BufferbloatResult:
+    target: str
+    phases: Dict[str, CheckResult] = field(default_factory=dict)
+    throughput: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    invalid: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def baseline_ms(self) -> Optional[float]:
+        idle = self.phases.get("idle")
+        return idle.p50 if idle is not None and idle.received else None
+
+    def added_ms(self, phase: str) -> Optional[float]:
+        baseline = self.baseline_ms
+        if baseline is None:
+            return None
+        result = self.phases[phase]
+        return max(0.0, result.p50 - baseline) if result.received else 0.0
+
+    @property
+    def loaded_phases(self) -> List[str]:
+        return [phase for phase in self.phases if phase != "idle" and phase not in self.invalid]
+
+    @property
+    def worst_added_ms(self) -> Optional[float]:
+        if self.baseline_ms is None:
+            return None
+        return max((self.added_ms(phase) for phase in self.loaded_phases), default=0.0)
+
+    @property
+    def grade(self) -> str:
+        if not self.loaded_phases or self.baseline_ms is None:
+            return "N/A"
+        return bufferbloat_grade(self.worst_added_ms)
+
+    def phase_grade(self, phase: str) -> str:
+        if phase == "idle":
+            return ""
+        if phase in self.invalid or self.baseline_ms is None:
+            return "N/A"
+        return bufferbloat_grade(self.added_ms(phase))
+
+    def rows(self) -> List[Dict]:
+        rows = []
+        for phase, result in self.phases.items():
+            row = {
+                "target": self.target,
+                "phase": phase,
+                "p50": result.p50,
+                "p95": result.p95,
+                "jitter": result.jitter,
+                "packet_loss": result.loss_percent,
+                "added_ms": self.added_ms(phase),
+                "grade": self.phase_grade(phase),
+                "error": self.invalid.get(phase, "")
+            }
+            row.update(self.throughput.get(phase, {"upload_mbps": 0.0, "download_mbps": 0.0}))
+            rows.append(row)
+        return rows
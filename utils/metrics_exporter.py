@@ -0,0 +1,186 @@
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.probe_engine import ProbeResult
+
+
+RTT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.015, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15,
+               0.2, 0.3, 0.5, 1.0, 2.0)
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Sequence[float] = RTT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        total = 0
+        points = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            points.append((bound, total))
+        return points
+
+
+class TargetMetrics:
+    def __init__(self, buckets: Sequence[float]):
+        self.rtt = LatencyHistogram(buckets)
+        self.sent = 0
+        self.lost = 0
+        self.errors: Dict[str, int] = {}
+        self.jitter = 0.0
+        self.last_rtt: Optional[float] = None
+
+    def observe(self, result: ProbeResult) -> None:
+        self.sent += 1
+        if result.rtt_ms is None:
+            self.lost += 1
+            return
+        rtt = result.rtt_ms / 1000
+        self.rtt.observe(rtt)
+        if self.last_rtt is not None:
+            self.jitter += (abs(rtt - self.last_rtt) - self.jitter) / 16
+        self.last_rtt = rtt
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Sequence[float] = RTT_BUCKETS, prefix: str = "netjitterfix"):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self.targets: Dict[str, TargetMetrics] = {}
+        self.scrapes = 0
+        self._lock = threading.Lock()
+
+    def _target(self, target: str) -> TargetMetrics:
+        metrics = self.targets.get(target)
+        if metrics is None:
+            metrics = self.targets[target] = TargetMetrics(self.buckets)
+        return metrics
+
+    def observe(self, target: str, result: ProbeResult) -> None:
+        with self._lock:
+            self._target(target).observe(result)
+
+    def record_error(self, target: str, kind: str) -> None:
+        with self._lock:
+            errors = self._target(target).errors
+            errors[kind] = errors.get(kind, 0) + 1
+
+    def wrap(self, target: str, on_probe: Callable[[ProbeResult], None]) -> Callable[[ProbeResult], None]:
+        def observed(result: ProbeResult) -> None:
+            self.observe(target, result)
+            on_probe(result)
+        return observed
+
+    def render(self, openmetrics: bool = True) -> str:
+        with self._lock:
+            self.scrapes += 1
+            snapshot = [(f'target="{_escape(target)}"', metrics.rtt.cumulative(), metrics.rtt.count, metrics.rtt.sum,
+                         metrics.jitter, metrics.sent, metrics.lost, sorted(metrics.errors.items()))
+                        for target, metrics in self.targets.items()]
+
+        prefix = self.prefix
+        lines = [f"# HELP {prefix}_rtt_seconds Probe round-trip time.", f"# TYPE {prefix}_rtt_seconds histogram"]
+        if openmetrics:
+            lines.append(f"# UNIT {prefix}_rtt_seconds seconds")
+        for label, points, count, total, *_ in snapshot:
+            for bound, cumulative in points:
+                lines.append(f'{prefix}_rtt_seconds_bucket{{{label},le="{_format(bound)}"}} {cumulative}')
+            lines.append(f"{prefix}_rtt_seconds_count{{{label}}} {count}")
+            lines.append(f"{prefix}_rtt_seconds_sum{{{label}}} {_format(total)}")
+
+        lines += [f"# HELP {prefix}_jitter_seconds RFC 3550 interarrival jitter estimate.",
+                  f"# TYPE {prefix}_jitter_seconds gauge"]
+        lines += [f"{prefix}_jitter_seconds{{{label}}} {_format(jitter)}" for label, _, _, _, jitter, *_ in snapshot]
+
+        suffix = "" if openmetrics else "_total"
+        lines += [f"# HELP {prefix}_probes_sent{suffix} Probes sent.", f"# TYPE {prefix}_probes_sent{suffix} counter"]
+        lines += [f"{prefix}_probes_sent_total{{{label}}} {sent}" for label, _, _, _, _, sent, *_ in snapshot]
+
+        lines += [f"# HELP {prefix}_probes_lost{suffix} Probes without a reply.",
+                  f"# TYPE {prefix}_probes_lost{suffix} counter"]
+        lines += [f"{prefix}_probes_lost_total{{{label}}} {lost}" for label, *_, lost, _ in snapshot]
+
+        lines += [f"# HELP {prefix}_probe_errors{suffix} Probe transport errors by kind.",
+                  f"# TYPE {prefix}_probe_errors{suffix} counter"]
+        lines += [f'{prefix}_probe_errors_total{{{label},kind="{_escape(kind)}"}} {count}'
+                  for label, *_, errors in snapshot for kind, count in errors]
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    def __init__(self, registry: Optional[MetricsRegistry] = None, host: str = "127.0.0.1", port: int = 9469):
+        self.registry = registry or MetricsRegistry()
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def start(self) -> "MetricsExporter":
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = registry.render(openmetrics).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MetricsExporter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
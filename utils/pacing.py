@@ -0,0 +1,45 @@
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+MIN_INTERVAL = 0.005
+SPIN_NS = 200_000
+PRECISE_SPIN_NS = 2_000_000
+
+
+class ProbeSchedule:
+    def __init__(self, interval: float, poisson: bool = False, seed: Optional[int] = None,
+                 start_ns: Optional[int] = None, spin_ns: int = SPIN_NS):
+        self.interval_ns = int(interval * 1e9)
+        self.poisson = poisson
+        self.spin_ns = spin_ns
+        self.start_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        self._random = random.Random(seed)
+        self._next_ns = self.start_ns
+        self._overshoot_ns = 0
+
+    def next_deadline(self) -> int:
+        deadline_ns = self._next_ns
+        if self.poisson:
+            self._next_ns += int(self._random.expovariate(1.0) * self.interval_ns)
+        else:
+            self._next_ns += self.interval_ns
+        return deadline_ns
+
+    async def wait(self) -> int:
+        deadline_ns = self.next_deadline()
+        wake_ns = deadline_ns - self._overshoot_ns - self.spin_ns // 2
+        delay_ns = wake_ns - time.perf_counter_ns()
+        if delay_ns > 0:
+            await asyncio.sleep(delay_ns / 1e9)
+            error_ns = time.perf_counter_ns() - wake_ns - self._overshoot_ns
+            self._overshoot_ns += error_ns // 8
+        remaining_ns = deadline_ns - time.perf_counter_ns()
+        if remaining_ns > self.spin_ns:
+            await asyncio.sleep(remaining_ns / 1e9)
+        else:
+            while time.perf_counter_ns() < deadline_ns:
+                await asyncio.sleep(0)
+        return deadline_ns
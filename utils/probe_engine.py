@@ -0,0 +1,406 @@
+import asyncio
+import os
+import socket
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+UDP_PROBE_MAGIC = b"NJF1"
+UDP_PROBE_HEADER = struct.Struct("!4sIQ")
+REFLECT_MAGIC = b"NJR1"
+REFLECT_STAMPS = struct.Struct("!QQ")
+ICMP_PAYLOAD_HEADER = struct.Struct("!Q")
+RECENT_REPLIES = 4096
+LINGER_RESET = struct.pack("HH" if os.name == "nt" else "ii", 1, 0)
+
+
+@dataclass
+class ProbeResult:
+    seq: int
+    sent_ns: int
+    recv_ns: Optional[int] = None
+    late_recv_ns: Optional[int] = None
+    duplicates: int = 0
+    server_recv_ns: Optional[int] = None
+    server_send_ns: Optional[int] = None
+    scheduled_ns: Optional[int] = None
+    refused: bool = False
+
+    @property
+    def lost(self) -> bool:
+        return self.recv_ns is None
+
+    @property
+    def send_lag_ms(self) -> Optional[float]:
+        if self.scheduled_ns is None:
+            return None
+        return (self.sent_ns - self.scheduled_ns) / 1_000_000
+
+    @property
+    def reflected(self) -> bool:
+        return self.recv_ns is not None and self.server_recv_ns is not None
+
+    @property
+    def forward_ms(self) -> Optional[float]:
+        if not self.reflected:
+            return None
+        return (self.server_recv_ns - self.sent_ns) / 1_000_000
+
+    @property
+    def reverse_ms(self) -> Optional[float]:
+        if not self.reflected:
+            return None
+        return (self.recv_ns - self.server_send_ns) / 1_000_000
+
+    @property
+    def server_ms(self) -> Optional[float]:
+        if not self.reflected:
+            return None
+        return (self.server_send_ns - self.server_recv_ns) / 1_000_000
+
+    @property
+    def rtt_ms(self) -> Optional[float]:
+        if self.recv_ns is None:
+            return None
+        return (self.recv_ns - self.sent_ns) / 1_000_000
+
+
+def icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack("!%dH" % (len(data) // 2), data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_icmp_echo(ident: int, wire_seq: int, sent_ns: int, payload_size: int) -> bytes:
+    payload = ICMP_PAYLOAD_HEADER.pack(sent_ns)
+    payload = payload.ljust(max(payload_size, len(payload)), b"\x00")
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, wire_seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, wire_seq) + payload
+
+
+def build_udp_probe(seq: int, sent_ns: int, payload_size: int) -> bytes:
+    packet = UDP_PROBE_HEADER.pack(UDP_PROBE_MAGIC, seq & 0xFFFFFFFF, sent_ns)
+    return packet.ljust(max(payload_size, len(packet)), b"\x00")
+
+
+def parse_reflection(data: bytes) -> Optional[Tuple[int, int]]:
+    if data[:4] != REFLECT_MAGIC or len(data) < UDP_PROBE_HEADER.size + REFLECT_STAMPS.size:
+        return None
+    return REFLECT_STAMPS.unpack_from(data, UDP_PROBE_HEADER.size)
+
+
+class SharedRawSocket:
+    _shared: Dict[Tuple[asyncio.AbstractEventLoop, int], "SharedRawSocket"] = {}
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, dscp: int, sock: socket.socket):
+        self.loop = loop
+        self.dscp = dscp
+        self.sock = sock
+        self.engines: Dict[int, "ProbeEngine"] = {}
+        loop.add_reader(sock.fileno(), self._on_readable)
+
+    @classmethod
+    def acquire(cls, engine: "ProbeEngine") -> "SharedRawSocket":
+        key = (engine._loop, engine.dscp)
+        shared = cls._shared.get(key)
+        if shared is None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            engine._mark(sock, socket.AF_INET)
+            sock.setblocking(False)
+            shared = cls._shared[key] = cls(engine._loop, engine.dscp, sock)
+        for _ in range(0x10000):
+            if engine._ident not in shared.engines:
+                break
+            engine._ident = (engine._ident + 1) & 0xFFFF
+        else:
+            raise OSError("No free ICMP identifiers on the shared raw socket")
+        shared.engines[engine._ident] = engine
+        return shared
+
+    def release(self, engine: "ProbeEngine") -> None:
+        if self.engines.get(engine._ident) is engine:
+            del self.engines[engine._ident]
+        if self.engines:
+            return
+        self._shared.pop((self.loop, self.dscp), None)
+        try:
+            self.loop.remove_reader(self.sock.fileno())
+        except (ValueError, OSError):
+            pass
+        self.sock.close()
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                data = self.sock.recv(65535)
+            except OSError:
+                return
+            recv_ns = time.perf_counter_ns()
+
+            if len(data) < 20:
+                continue
+            offset = (data[0] & 0x0F) * 4
+            if len(data) < offset + 8:
+                continue
+            engine = self.engines.get(struct.unpack_from("!H", data, offset + 4)[0])
+            if engine is not None:
+                engine._on_reply(data, recv_ns)
+
+
+class ProbeEngine:
+    MODES = ("auto", "icmp", "icmp_raw", "udp", "tcp")
+
+    def __init__(self, target: str, timeout: float = 1.0, payload_size: int = 56,
+                 mode: str = "auto", udp_port: int = 7, tcp_port: int = 443, dscp: int = 0):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown probe mode: {mode}")
+        if not 0 <= dscp <= 63:
+            raise ValueError(f"DSCP must be between 0 and 63: {dscp}")
+        self.target = target
+        self.timeout = timeout
+        self.payload_size = payload_size
+        self.requested_mode = mode
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self.dscp = dscp
+        self.mode = None
+        self.family = None
+        self.address = None
+        self._sock = None
+        self._shared: Optional[SharedRawSocket] = None
+        self._loop = None
+        self._ident = (os.getpid() ^ id(self)) & 0xFFFF
+        self._pending: Dict[int, Tuple[ProbeResult, asyncio.Future]] = {}
+        self._recent: "OrderedDict[int, ProbeResult]" = OrderedDict()
+        self._overhead_ns = 0
+        self._sent = 0
+        self._epoch_offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    async def open(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        modes = ("icmp", "icmp_raw", "udp") if self.requested_mode == "auto" else (self.requested_mode,)
+
+        last_error = None
+        for mode in modes:
+            try:
+                await self._open_mode(mode)
+                break
+            except (OSError, PermissionError) as e:
+                last_error = e
+                self._close_socket()
+        else:
+            raise OSError(f"No probe transport available for {self.target}: {last_error}")
+
+        if self._sock is not None and self._shared is None:
+            self._loop.add_reader(self._sock.fileno(), self._on_readable)
+
+    async def _open_mode(self, mode: str) -> None:
+        family = socket.AF_INET if mode.startswith("icmp") else socket.AF_UNSPEC
+        port = {"udp": self.udp_port, "tcp": self.tcp_port}.get(mode, 0)
+        sock_type = socket.SOCK_STREAM if mode == "tcp" else socket.SOCK_DGRAM
+        infos = await self._loop.getaddrinfo(self.target, port, family=family, type=sock_type)
+        if not infos:
+            raise OSError(f"Cannot resolve {self.target}")
+        family, _, _, _, address = infos[0]
+
+        if mode == "tcp":
+            sock = None
+        elif mode == "icmp":
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        elif mode == "icmp_raw":
+            self._shared = SharedRawSocket.acquire(self)
+            sock = self._shared.sock
+        else:
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            sock.connect(address)
+
+        if sock is not None and self._shared is None:
+            self._mark(sock, family)
+            sock.setblocking(False)
+        self._sock = sock
+        self.mode = mode
+        self.family = family
+        self.address = address
+
+    def _mark(self, sock: socket.socket, family: int) -> None:
+        if not self.dscp:
+            return
+        try:
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_TCLASS, self.dscp << 2)
+            else:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, self.dscp << 2)
+        except (AttributeError, OSError):
+            pass
+
+    def _close_socket(self) -> None:
+        if self._shared is not None:
+            self._shared.release(self)
+            self._shared = None
+        elif self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self.mode = None
+
+    def close(self) -> None:
+        if self._sock is not None and self._shared is None and self._loop is not None:
+            try:
+                self._loop.remove_reader(self._sock.fileno())
+            except (ValueError, OSError):
+                pass
+        for _, future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        self._recent.clear()
+        self._close_socket()
+
+    @property
+    def mean_overhead_us(self) -> float:
+        if not self._sent:
+            return 0.0
+        return self._overhead_ns / self._sent / 1000
+
+    def _wire_seq(self, seq: int) -> int:
+        if self.mode == "udp":
+            return seq & 0xFFFFFFFF
+        return seq & 0xFFFF
+
+    def _send(self, wire_seq: int, sent_ns: int) -> None:
+        if self.mode == "udp":
+            self._sock.send(build_udp_probe(wire_seq, sent_ns, self.payload_size))
+        else:
+            packet = build_icmp_echo(self._ident, wire_seq, sent_ns, self.payload_size)
+            self._sock.sendto(packet, (self.address[0], 0))
+
+    def _parse_reply(self, data: bytes) -> Optional[int]:
+        if self.mode == "udp":
+            if len(data) < UDP_PROBE_HEADER.size:
+                return None
+            magic, wire_seq, _ = UDP_PROBE_HEADER.unpack_from(data)
+            return wire_seq if magic in (UDP_PROBE_MAGIC, REFLECT_MAGIC) else None
+
+        if self.mode == "icmp_raw":
+            if len(data) < 20:
+                return None
+            data = data[(data[0] & 0x0F) * 4:]
+        if len(data) < 8:
+            return None
+        icmp_type, _, _, ident, wire_seq = struct.unpack_from("!BBHHH", data)
+        if icmp_type != ICMP_ECHO_REPLY:
+            return None
+        if self.mode == "icmp_raw" and ident != self._ident:
+            return None
+        return wire_seq
+
+    def _on_readable(self) -> None:
+        while self._sock is not None:
+            try:
+                data = self._sock.recv(65535)
+            except OSError:
+                return
+            self._on_reply(data, time.perf_counter_ns())
+
+    def _on_reply(self, data: bytes, recv_ns: int) -> None:
+        wire_seq = self._parse_reply(data)
+        if wire_seq is None:
+            return
+        entry = self._pending.get(wire_seq)
+        if entry is not None:
+            result, future = entry
+            if future.done():
+                result.duplicates += 1
+            else:
+                future.set_result(recv_ns)
+                if self.mode == "udp":
+                    self._stamp(result, data)
+            return
+
+        result = self._recent.get(wire_seq)
+        if result is None:
+            return
+        if result.recv_ns is None and result.late_recv_ns is None:
+            result.late_recv_ns = recv_ns
+        else:
+            result.duplicates += 1
+
+    def _stamp(self, result: ProbeResult, data: bytes) -> None:
+        stamps = parse_reflection(data)
+        if stamps is not None:
+            result.server_recv_ns = stamps[0] - self._epoch_offset_ns
+            result.server_send_ns = stamps[1] - self._epoch_offset_ns
+
+    def _remember(self, wire_seq: int, result: ProbeResult) -> None:
+        self._recent.pop(wire_seq, None)
+        self._recent[wire_seq] = result
+        while len(self._recent) > RECENT_REPLIES:
+            self._recent.popitem(last=False)
+
+    async def _probe_tcp(self, seq: int) -> ProbeResult:
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, LINGER_RESET)
+        self._mark(sock, self.family)
+
+        sent_ns = time.perf_counter_ns()
+        result = ProbeResult(seq, sent_ns)
+        try:
+            await asyncio.wait_for(self._loop.sock_connect(sock, self.address), self.timeout)
+            result.recv_ns = time.perf_counter_ns()
+        except ConnectionRefusedError:
+            result.recv_ns = time.perf_counter_ns()
+            result.refused = True
+        except (asyncio.TimeoutError, OSError):
+            pass
+        finally:
+            sock.close()
+        self._sent += 1
+        return result
+
+    async def probe(self, seq: int) -> ProbeResult:
+        if self.mode is None:
+            raise RuntimeError("Probe engine is not open")
+        if self.mode == "tcp":
+            return await self._probe_tcp(seq)
+
+        wire_seq = self._wire_seq(seq)
+        future = self._loop.create_future()
+        sent_ns = time.perf_counter_ns()
+        result = ProbeResult(seq, sent_ns)
+        self._pending[wire_seq] = (result, future)
+        try:
+            self._send(wire_seq, sent_ns)
+        except OSError:
+            self._pending.pop(wire_seq, None)
+            return result
+        self._overhead_ns += time.perf_counter_ns() - sent_ns
+        self._sent += 1
+
+        try:
+            result.recv_ns = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._pending.pop(wire_seq, None)
+            self._remember(wire_seq, result)
+
+        return result
+
+    async def __aenter__(self) -> "ProbeEngine":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,160 @@
+import asyncio
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from utils.probe_engine import REFLECT_MAGIC, REFLECT_STAMPS, UDP_PROBE_HEADER, UDP_PROBE_MAGIC
+
+
+STAMPED_SIZE = UDP_PROBE_HEADER.size + REFLECT_STAMPS.size
+
+
+@dataclass
+class ReflectorStats:
+    received: int = 0
+    reflected: int = 0
+    rate_limited: int = 0
+    invalid: int = 0
+    send_errors: int = 0
+    clients: int = 0
+    server_ns: int = 0
+
+    @property
+    def mean_server_us(self) -> float:
+        return self.server_ns / self.reflected / 1000 if self.reflected else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "received": self.received,
+            "reflected": self.reflected,
+            "rate_limited": self.rate_limited,
+            "invalid": self.invalid,
+            "send_errors": self.send_errors,
+            "clients": self.clients,
+            "mean_server_us": round(self.mean_server_us, 3)
+        }
+
+
+class ReflectorProtocol(asyncio.DatagramProtocol):
+    def __init__(self, rate: float = 1000.0, burst: int = 200, max_clients: int = 65536):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.stats = ReflectorStats()
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def _allow(self, client: str, now_ns: int) -> bool:
+        if self.rate <= 0:
+            return True
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            if len(self._buckets) >= self.max_clients:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[client] = [float(self.burst), now_ns]
+        else:
+            self._buckets.move_to_end(client)
+            bucket[0] = min(self.burst, bucket[0] + (now_ns - bucket[1]) * self.rate / 1e9)
+            bucket[1] = now_ns
+        self.stats.clients = len(self._buckets)
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def datagram_received(self, data: bytes, addr: Tuple) -> None:
+        recv_ns = time.time_ns()
+        self.stats.received += 1
+        if len(data) < UDP_PROBE_HEADER.size or data[:4] != UDP_PROBE_MAGIC:
+            self.stats.invalid += 1
+            return
+        if not self._allow(addr[0], recv_ns):
+            self.stats.rate_limited += 1
+            return
+
+        if len(data) >= STAMPED_SIZE:
+            reply = bytearray(data)
+            reply[:4] = REFLECT_MAGIC
+            send_ns = time.time_ns()
+            REFLECT_STAMPS.pack_into(reply, UDP_PROBE_HEADER.size, recv_ns, send_ns)
+        else:
+            reply = data
+            send_ns = recv_ns
+        self.transport.sendto(reply, addr)
+        self.stats.reflected += 1
+        self.stats.server_ns += send_ns - recv_ns
+
+    def error_received(self, exc: Exception) -> None:
+        self.stats.send_errors += 1
+
+
+class Reflector:
+    def __init__(self, host: str = "0.0.0.0", port: int = 7, rate: float = 1000.0, burst: int = 200,
+                 max_clients: int = 65536, buffer_size: int = 4 * 1024 * 1024):
+        self.host = host
+        self.port = port
+        self.buffer_size = buffer_size
+        self.protocol = ReflectorProtocol(rate, burst, max_clients)
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    @property
+    def stats(self) -> ReflectorStats:
+        return self.protocol.stats
+
+    @property
+    def address(self) -> Optional[Tuple]:
+        return self.transport.get_extra_info("sockname") if self.transport else None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(self.host, self.port, type=socket.SOCK_DGRAM, flags=socket.AI_PASSIVE)
+        if not infos:
+            raise OSError(f"Cannot resolve {self.host}")
+        family, _, _, _, address = infos[0]
+
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            for option in (socket.SO_RCVBUF, socket.SO_SNDBUF):
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, option, self.buffer_size)
+                except OSError:
+                    pass
+            sock.bind(address)
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: self.protocol, sock=sock)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    async def serve(self, duration: Optional[float] = None, report_every: Optional[float] = None,
+                    on_report=None) -> ReflectorStats:
+        await self.start()
+        deadline = time.monotonic() + duration if duration is not None else None
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                wait = report_every or 1.0
+                if deadline is not None:
+                    wait = min(wait, max(0.0, deadline - time.monotonic()))
+                await asyncio.sleep(wait)
+                if report_every and on_report:
+                    on_report(self.stats)
+        finally:
+            self.close()
+        return self.stats
+
+    async def __aenter__(self) -> "Reflector":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,101 @@
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+MONITOR_WINDOWS = {
+    "1m": 60,
+    "15m": 15 * 60,
+    "1h": 60 * 60
+}
+
+
+class SampleRingBuffer:
+    def __init__(self, capacity: int = 86400):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.rtts = np.full(capacity, np.nan, dtype=np.float64)
+        self.lost = np.zeros(capacity, dtype=bool)
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.rtts.nbytes + self.lost.nbytes
+
+    def append(self, timestamp: float, rtt_ms: Optional[float]) -> None:
+        index = self._head
+        self.timestamps[index] = timestamp
+        if rtt_ms is None:
+            self.rtts[index] = np.nan
+            self.lost[index] = True
+        else:
+            self.rtts[index] = rtt_ms
+            self.lost[index] = False
+
+        self._head = (index + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        self.total += 1
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self.total = 0
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._size < self.capacity:
+            end = self._size
+            return self.timestamps[:end], self.rtts[:end], self.lost[:end]
+
+        order = np.r_[self._head:self.capacity, 0:self._head]
+        return self.timestamps[order], self.rtts[order], self.lost[order]
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        now = time.time() if now is None else now
+        end = self._size
+        mask = self.timestamps[:end] >= now - seconds
+        return self.timestamps[:end][mask], self.rtts[:end][mask], self.lost[:end][mask]
+
+    def window_stats(self, seconds: float, now: Optional[float] = None) -> Dict[str, float]:
+        timestamps, rtts, lost = self.window(seconds, now)
+        sent = len(timestamps)
+        received_rtts = rtts[~lost]
+        received = len(received_rtts)
+
+        if not received:
+            return {
+                "sent": sent,
+                "received": 0,
+                "packet_loss": 100.0 if sent else 0.0,
+                "jitter": 0.0,
+                "ipdv_mean": 0.0,
+                "min_ping": 0.0,
+                "max_ping": 0.0,
+                "avg_ping": 0.0,
+                "p95": 0.0
+            }
+
+        received_rtts = received_rtts[np.argsort(timestamps[~lost], kind="stable")]
+
+        return {
+            "sent": sent,
+            "received": received,
+            "packet_loss": float((sent - received) / sent * 100),
+            "jitter": float(np.std(received_rtts)),
+            "ipdv_mean": float(np.mean(np.abs(np.diff(received_rtts)))) if received > 1 else 0.0,
+            "min_ping": float(received_rtts.min()),
+            "max_ping": float(received_rtts.max()),
+            "avg_ping": float(received_rtts.mean()),
+            "p95": float(np.percentile(received_rtts, 95))
+        }
+
+    def windowed_stats(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        now = time.time() if now is None else now
+        return {name: self.window_stats(seconds, now) for name, seconds in MONITOR_WINDOWS.items()}
@@ -0,0 +1,166 @@
+import mmap
+import os
+import struct
+import time
+import numpy as np
+from typing import Dict, List, Optional
+
+
+LOG_MAGIC = b"NJFLOG1\x00"
+LOG_VERSION = 1
+HEADER_SIZE = 4096
+HEADER_STRUCT = struct.Struct("<8sIIdI")
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("target_id", "<u2"),
+    ("flags", "<u2"),
+    ("rtt_us", "<u4")
+])
+
+FLAG_LOST = 0x0001
+RTT_LOST = 0xFFFFFFFF
+
+
+def _pack_header(created: float, targets: List[str]) -> bytes:
+    names = b"\x00".join(target.encode("utf-8") for target in targets)
+    header = HEADER_STRUCT.pack(LOG_MAGIC, LOG_VERSION, RECORD_DTYPE.itemsize, created, len(targets)) + names
+    if len(header) > HEADER_SIZE:
+        raise ValueError("Too many targets for sample log header")
+    return header.ljust(HEADER_SIZE, b"\x00")
+
+
+def _unpack_header(data: bytes):
+    magic, version, record_size, created, target_count = HEADER_STRUCT.unpack_from(data)
+    if magic != LOG_MAGIC:
+        raise ValueError("Not a NetJitterFix sample log")
+    if version != LOG_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Unsupported sample log version {version}")
+    names = data[HEADER_STRUCT.size:HEADER_SIZE].rstrip(b"\x00")
+    targets = [name.decode("utf-8") for name in names.split(b"\x00")] if target_count else []
+    return created, targets[:target_count]
+
+
+class SampleLogWriter:
+    def __init__(self, path: str, targets: Optional[List[str]] = None, buffer_size: int = 4096):
+        self.path = path
+        self.targets: List[str] = []
+        self._target_ids: Dict[str, int] = {}
+        self._buffer = np.zeros(buffer_size, dtype=RECORD_DTYPE)
+        self._buffered = 0
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self._file = open(path, "r+b")
+            self.created, existing = _unpack_header(self._file.read(HEADER_SIZE))
+            for target in existing:
+                self._target_ids[target] = len(self.targets)
+                self.targets.append(target)
+            # A crash mid-write can leave a partial record; appending after it would
+            # misalign every later record, so cut the file back to a record boundary.
+            size = os.fstat(self._file.fileno()).st_size
+            self._file.truncate(size - (size - HEADER_SIZE) % RECORD_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "w+b")
+            self.created = time.time()
+            self._file.write(_pack_header(self.created, []))
+
+        for target in targets or []:
+            self.target_id(target)
+
+    def target_id(self, target: str) -> int:
+        target_id = self._target_ids.get(target)
+        if target_id is not None:
+            return target_id
+
+        target_id = len(self.targets)
+        if target_id > 0xFFFF:
+            raise ValueError("Too many targets for sample log")
+        header = _pack_header(self.created, self.targets + [target])
+        self._target_ids[target] = target_id
+        self.targets.append(target)
+
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(header)
+        self._file.seek(position)
+        return target_id
+
+    def append(self, timestamp: float, target: str, rtt_ms: Optional[float], flags: int = 0) -> None:
+        record = self._buffer[self._buffered]
+        record["timestamp"] = timestamp
+        record["target_id"] = self.target_id(target)
+        if rtt_ms is None:
+            record["flags"] = flags | FLAG_LOST
+            record["rtt_us"] = RTT_LOST
+        else:
+            record["flags"] = flags
+            record["rtt_us"] = min(int(round(rtt_ms * 1000)), RTT_LOST - 1)
+
+        self._buffered += 1
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffered:
+            self._file.write(self._buffer[:self._buffered].tobytes())
+            self._buffered = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> "SampleLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SampleLog:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self.created, self.targets = _unpack_header(self._file.read(HEADER_SIZE))
+
+        size = os.fstat(self._file.fileno()).st_size
+        count = (size - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=HEADER_SIZE)
+        else:
+            self._mmap = None
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def for_target(self, target: str) -> np.ndarray:
+        return self.records[self.records["target_id"] == self.targets.index(target)]
+
+    def rtts_ms(self, target: Optional[str] = None) -> np.ndarray:
+        records = self.records if target is None else self.for_target(target)
+        rtts = records["rtt_us"].astype(np.float64) / 1000
+        rtts[(records["flags"] & FLAG_LOST) != 0] = np.nan
+        return rtts
+
+    def close(self) -> None:
+        self.records = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "SampleLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,189 @@
+import itertools
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from utils.console_encoding import decode_console
+
+
+def default_shell() -> List[str]:
+    if os.name == "nt":
+        return ["cmd.exe", "/Q", "/D", "/K"]
+    return ["/bin/sh"]
+
+
+class ShellSession:
+    _counter = itertools.count()
+
+    def __init__(self, shell: Optional[List[str]] = None, default_timeout: Optional[float] = 60.0):
+        self.shell = shell or default_shell()
+        self.default_timeout = default_timeout
+        self.is_cmd = os.path.basename(self.shell[0]).lower().startswith("cmd")
+        self.spawn_count = 0
+        self.commands_run = 0
+        self._process = None
+        self._stdout = None
+        self._stderr = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._process = subprocess.Popen(
+            self.shell,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        self.spawn_count += 1
+        self._stdout = queue.Queue()
+        self._stderr = queue.Queue()
+        for stream, lines in ((self._process.stdout, self._stdout), (self._process.stderr, self._stderr)):
+            threading.Thread(target=self._pump, args=(stream, lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(stream, lines: queue.Queue) -> None:
+        try:
+            for line in iter(stream.readline, b""):
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def close(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _frame(self, command: str, sentinel: str) -> bytes:
+        if self.is_cmd:
+            script = f"{command} <NUL\r\necho {sentinel} %errorlevel%\r\necho {sentinel} 1>&2\r\n"
+        else:
+            script = f"{{ {command}\n}} </dev/null\nprintf '%s %d\\n' '{sentinel}' $?\nprintf '%s\\n' '{sentinel}' >&2\n"
+        return script.encode('utf-8')
+
+    @staticmethod
+    def _collect(lines: queue.Queue, sentinel: bytes, deadline: Optional[float]):
+        output = []
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired("shell session", 0)
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired("shell session", 0)
+            if line is None:
+                raise EOFError("Shell session exited")
+
+            index = line.find(sentinel)
+            if index < 0:
+                output.append(line)
+                continue
+            output.append(line[:index])
+            return b"".join(output), line[index + len(sentinel):]
+
+    def run(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        timeout = self.default_timeout if timeout is None else timeout
+        with self._lock:
+            try:
+                self.start()
+                sentinel = f"__NJF_{uuid.uuid4().hex}_{next(self._counter)}__"
+                self._process.stdin.write(self._frame(command, sentinel))
+                self._process.stdin.flush()
+
+                deadline = None if timeout is None else time.monotonic() + timeout
+                stdout_bytes, status = self._collect(self._stdout, sentinel.encode(), deadline)
+                stderr_bytes, _ = self._collect(self._stderr, sentinel.encode(), deadline)
+                self.commands_run += 1
+
+                try:
+                    returncode = int(status.strip() or 0)
+                except ValueError:
+                    returncode = 1
+
+                return subprocess.CompletedProcess(
+                    args=command,
+                    returncode=returncode,
+                    stdout=decode_console(stdout_bytes),
+                    stderr=decode_console(stderr_bytes)
+                )
+            except subprocess.TimeoutExpired:
+                self._kill()
+                return subprocess.CompletedProcess(args=command, returncode=-1, stdout="", stderr=f"Command timed out after {timeout} s")
+            except (OSError, EOFError) as e:
+                self._kill()
+                return subprocess.CompletedProcess(args=command, returncode=-1, stdout="", stderr=str(e))
+
+    def _kill(self) -> None:
+        process = self._process
+        self._process = None
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+    def __enter__(self) -> "ShellSession":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class ShellSessionPool:
+    def __init__(self, size: int = 1, shell: Optional[List[str]] = None, default_timeout: Optional[float] = 60.0):
+        self.size = max(1, size)
+        self.shell = shell
+        self.default_timeout = default_timeout
+        self._sessions: List[ShellSession] = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def spawn_count(self) -> int:
+        return sum(session.spawn_count for session in self._sessions)
+
+    def _acquire(self) -> ShellSession:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._sessions) < self.size:
+                session = ShellSession(self.shell, self.default_timeout)
+                self._sessions.append(session)
+                return session
+        return self._idle.get()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        session = self._acquire()
+        try:
+            return session.run(command, timeout)
+        finally:
+            self._idle.put(session)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions:
+                session.close()
@@ -0,0 +1,143 @@
+import numpy as np
+from dataclasses import dataclass, field
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Optional, Sequence
+
+
+MAD_SCALE = 1.4826
+CDF_QUANTILES = (50, 75, 90, 95, 99, 99.9)
+ROLLING_CHUNK = 1 << 16
+
+
+@dataclass
+class Periodicity:
+    period_s: float
+    strength: float
+    spectral_peak_hz: float
+    power_share: float
+    repetitions: int
+
+    def is_periodic(self, min_strength: float = 0.3) -> bool:
+        return self.strength >= min_strength and self.repetitions >= 3
+
+
+@dataclass
+class TraceAnalysis:
+    samples: int
+    interval_s: float
+    baseline_ms: float
+    mad_ms: float
+    spike_threshold_ms: float
+    spike_indices: np.ndarray
+    periodicity: Optional[Periodicity]
+    histogram_counts: np.ndarray
+    histogram_edges: np.ndarray
+    cdf: Dict[float, float] = field(default_factory=dict)
+
+    @property
+    def spike_count(self) -> int:
+        return len(self.spike_indices)
+
+    @property
+    def periodic(self) -> bool:
+        return self.periodicity is not None and self.periodicity.is_periodic()
+
+    def summary(self) -> Dict:
+        summary = {
+            "samples": self.samples,
+            "baseline_ms": round(self.baseline_ms, 3),
+            "mad_ms": round(self.mad_ms, 3),
+            "spikes": self.spike_count,
+            "spike_threshold_ms": round(self.spike_threshold_ms, 3),
+            "periodic": self.periodic,
+            "cdf": {f"p{q:g}": round(value, 3) for q, value in self.cdf.items()}
+        }
+        if self.periodicity is not None:
+            summary.update({
+                "period_s": round(self.periodicity.period_s, 3),
+                "period_strength": round(self.periodicity.strength, 3),
+                "spectral_peak_hz": round(self.periodicity.spectral_peak_hz, 5),
+                "repetitions": self.periodicity.repetitions
+            })
+        return summary
+
+
+def rolling_median(values: np.ndarray, window: int) -> np.ndarray:
+    window = max(1, window | 1)
+    half = window // 2
+    if len(values) <= window:
+        return np.full(len(values), np.median(values) if len(values) else 0.0)
+
+    windows = sliding_window_view(np.pad(values, half, mode="edge"), window)
+    medians = np.empty(len(values), dtype=np.float64)
+    for start in range(0, len(values), ROLLING_CHUNK):
+        medians[start:start + ROLLING_CHUNK] = np.partition(windows[start:start + ROLLING_CHUNK], half, axis=1)[:, half]
+    return medians
+
+
+def detect_periodicity(series: np.ndarray, interval_s: float, min_lag: int = 2) -> Optional[Periodicity]:
+    n = len(series)
+    max_lag = n // 3
+    if max_lag <= min_lag:
+        return None
+
+    centered = series - series.mean()
+    if not centered.any():
+        return None
+
+    spectrum = np.abs(np.fft.rfft(centered)) ** 2
+    frequencies = np.fft.rfftfreq(n, interval_s)
+    usable = frequencies >= 1 / (max_lag * interval_s)
+    peak = int(np.argmax(np.where(usable, spectrum, 0)))
+    power_share = float(spectrum[peak] / spectrum[1:].sum()) if spectrum[1:].any() else 0.0
+
+    size = 1 << int(2 * n - 1).bit_length()
+    acf = np.fft.irfft(np.abs(np.fft.rfft(centered, size)) ** 2, size)[:max_lag]
+    acf /= acf[0]
+    candidates = acf[min_lag:max_lag]
+    best = candidates.max()
+    if best <= 0:
+        return Periodicity(0.0, 0.0, float(frequencies[peak]), power_share, 0)
+
+    is_peak = np.r_[True, candidates[1:] >= candidates[:-1]] & np.r_[candidates[:-1] >= candidates[1:], True]
+    lag = int(np.flatnonzero(is_peak & (candidates >= 0.8 * best))[0]) + min_lag
+    return Periodicity(lag * interval_s, float(acf[lag]), float(frequencies[peak]), power_share, n // lag)
+
+
+def analyze_trace(rtts: Sequence[Optional[float]], interval_s: Optional[float] = None,
+                  timestamps: Optional[Sequence[float]] = None, window: int = 31, threshold: float = 3.5,
+                  bins: int = 50) -> TraceAnalysis:
+    values = np.asarray([np.nan if rtt is None else rtt for rtt in rtts] if not isinstance(rtts, np.ndarray) else rtts,
+                        dtype=np.float64)
+    if interval_s is None:
+        interval_s = float(np.median(np.diff(timestamps))) if timestamps is not None and len(timestamps) > 1 else 1.0
+    interval_s = interval_s or 1.0
+
+    received = ~np.isnan(values)
+    if not received.any():
+        return TraceAnalysis(len(values), interval_s, 0.0, 0.0, 0.0, np.zeros(0, dtype=np.int64), None,
+                             np.zeros(0, dtype=np.int64), np.zeros(0))
+
+    baseline = float(np.median(values[received]))
+    filled = np.where(received, values, baseline)
+    trend = rolling_median(filled, window)
+    residual = filled - trend
+    mad = float(np.median(np.abs(residual[received]))) * MAD_SCALE
+    threshold_ms = threshold * mad if mad > 0 else float(np.std(residual[received]))
+    spikes = np.flatnonzero(received & (residual > threshold_ms)) if threshold_ms > 0 else np.zeros(0, dtype=np.int64)
+
+    counts, edges = np.histogram(values[received], bins=bins)
+    quantiles = np.percentile(values[received], CDF_QUANTILES)
+
+    return TraceAnalysis(
+        samples=len(values),
+        interval_s=interval_s,
+        baseline_ms=baseline,
+        mad_ms=mad,
+        spike_threshold_ms=threshold_ms,
+        spike_indices=spikes,
+        periodicity=detect_periodicity(np.clip(residual, 0, None), interval_s),
+        histogram_counts=counts,
+        histogram_edges=edges,
+        cdf=dict(zip(CDF_QUANTILES, quantiles.tolist()))
+    )
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.tracer.complete(self.name, self.start_ns, time.perf_counter_ns(), self.category, **self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity: int = 1_000_000):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def clear(self) -> None:
+        self.events.clear()
+
+    def span(self, name: str, category: str = "app", **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def complete(self, name: str, start_ns: int, end_ns: int, category: str = "app", **args) -> None:
+        if self.enabled:
+            self.events.append((name, category, start_ns, end_ns - start_ns, threading.get_ident(), args))
+
+    def traced(self, name: Optional[str] = None, category: str = "app") -> Callable:
+        def decorate(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name, category, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def chrome_trace(self) -> Dict:
+        pid = os.getpid()
+        threads = {}
+        events = []
+        for name, category, start_ns, duration_ns, thread, args in list(self.events):
+            tid = threads.setdefault(thread, len(threads) + 1)
+            event = {"name": name, "cat": category, "ph": "X", "ts": start_ns / 1000, "dur": duration_ns / 1000,
+                     "pid": pid, "tid": tid}
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self) -> List[Dict]:
+        durations: Dict[str, List[int]] = {}
+        for name, _, _, duration_ns, _, _ in list(self.events):
+            durations.setdefault(name, []).append(duration_ns)
+
+        rows = []
+        for name, values in durations.items():
+            values.sort()
+            total = sum(values)
+            rows.append({
+                "span": name,
+                "count": len(values),
+                "total_ms": total / 1e6,
+                "mean_us": total / len(values) / 1000,
+                "p50_us": values[len(values) // 2] / 1000,
+                "p95_us": values[min(len(values) - 1, int(len(values) * 0.95))] / 1000,
+                "max_us": values[-1] / 1000
+            })
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self) -> str:
+        rows = self.summary()
+        if not rows:
+            return "No spans recorded"
+        width = max(len("span"), max(len(row["span"]) for row in rows))
+        lines = [f"{'span':<{width}} {'count':>8} {'total ms':>10} {'mean us':>10} {'p50 us':>10} {'p95 us':>10} {'max us':>10}"]
+        for row in rows:
+            lines.append(f"{row['span']:<{width}} {row['count']:>8} {row['total_ms']:>10.2f} {row['mean_us']:>10.1f} "
+                         f"{row['p50_us']:>10.1f} {row['p95_us']:>10.1f} {row['max_us']:>10.1f}")
+        return "\n".join(lines)
+
+
+tracer = Tracer()